@@ -6,12 +6,15 @@ from datetime import datetime
 from backend.app.db.session import get_session as get_db
 from backend.app.models.user import User
 from backend.app.models.password_reset import PasswordResetToken
-from backend.app.services.email_service import email_service
+from backend.app.services.email_service import get_email_service
 from backend.app.core.security import hash_password
 from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
 
 
 router = APIRouter()
+# Diagnostic endpoints, not mounted in production (see main.py)
+test_router = APIRouter()
 
 
 class ForgotPasswordRequest(BaseModel):
@@ -47,7 +50,7 @@ async def forgot_password(
     
     # Send email in background
     background_tasks.add_task(
-        email_service.send_password_reset_email,
+        get_email_service().send_password_reset_email,
         user.email,
         user.username,
         reset_token.token
@@ -87,21 +90,21 @@ async def reset_password(
             detail="User not found"
         )
     
-    user.password = hash_password(request.new_password)
+    user.password = await run_in_threadpool(hash_password, request.new_password)
     reset_token.is_used = True
     db.commit()
     
     return {"message": "Password reset successful"}
 
 
-@router.post("/test-email")
+@test_router.post("/test-email")
 async def test_email(
     request: TestEmailRequest,
     background_tasks: BackgroundTasks
 ):
     """Test email configuration"""
     background_tasks.add_task(
-        email_service.send_password_reset_email,
+        get_email_service().send_password_reset_email,
         request.to_email,
         "Test User",
         "test-token-123"
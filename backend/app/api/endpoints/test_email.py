@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, EmailStr
 
-from backend.app.services.email_service import email_service
+from backend.app.services.email_service import get_email_service
 from backend.app.core.config import settings
 
 router = APIRouter(prefix="/test", tags=["Testing"])
@@ -32,12 +32,12 @@ async def send_test_email(request: TestEmailRequest):
     
     try:
         if request.test_type == "welcome":
-            success = await email_service.send_welcome_email(
+            success = await get_email_service().send_welcome_email(
                 to_email=request.to_email,
                 user_name="Test User"
             )
         elif request.test_type == "password_reset":
-            success = await email_service.send_password_reset_email(
+            success = await get_email_service().send_password_reset_email(
                 to_email=request.to_email,
                 reset_token="test-token-12345",
                 user_name="Test User"
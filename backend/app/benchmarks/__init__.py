@@ -0,0 +1,3 @@
+"""
+Performance benchmarks. Not collected by pytest; run modules directly.
+"""
@@ -0,0 +1,201 @@
+"""
+Microbenchmarks for hot-path functions, with a stored baseline.
+
+Each case times one call of a pure function (no database, no event loop)
+and reports the best per-call cost over several runs. Results are compared
+against `baselines/hot_paths.json`; the exit code is 1 if any case is more
+than `--max-regression` slower. Baselines are machine-specific, so refresh
+them with `--save-baseline` when changing the reference machine.
+
+Usage:
+    python -m backend.app.benchmarks.bench_hot_paths
+    python -m backend.app.benchmarks.bench_hot_paths -k token pagination
+    python -m backend.app.benchmarks.bench_hot_paths --save-baseline
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "hot_paths.json"
+PASSWORD = "BenchPass123!"
+
+
+def _cases() -> Dict[str, Callable[[], object]]:
+    """Build the benchmark cases; each value is a zero-argument callable."""
+    from sqlalchemy import func
+    from sqlmodel import select
+    from starlette.requests import Request
+
+    from backend.app.core.deps import _extract_token_from_request
+    from backend.app.core.exception_handlers import create_error_response
+    from backend.app.core.logging.config import ColoredFormatter, JSONFormatter
+    from backend.app.core.pagination import PaginatedResponse
+    from backend.app.core.security import (
+        create_access_token, decode_access_token, hash_password, verify_password
+    )
+    from backend.app.db.queries import USER_BY_ID, user_count
+    from backend.app.middleware.request_id import generate_request_id
+    from backend.app.models.user import User
+    from backend.app.schemas.user import UserRead
+
+    hashed = hash_password(PASSWORD)
+    claims = {"id": 123456, "role": "user"}
+    token = create_access_token(claims)
+    request = Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/users/me",
+        "query_string": b"",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    })
+
+    json_formatter = JSONFormatter()
+    colored_formatter = ColoredFormatter(
+        fmt="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    def record() -> logging.LogRecord:
+        # Fresh record per call: ColoredFormatter rewrites levelname in place
+        log_record = logging.LogRecord(
+            "backend.app.routers.users", logging.INFO, __file__, 1,
+            "✅ User 'bench' logged in successfully", None, None,
+        )
+        log_record.request_id = "0f8fad5b-d9cb-469f-a165-70867728950e"
+        return log_record
+
+    now = datetime.now(timezone.utc)
+    users = [
+        User(
+            id=i, username=f"user{i}", email=f"user{i}@example.com", full_name=f"User {i}",
+            hashed_password=hashed, created_at=now, updated_at=now,
+        )
+        for i in range(20)
+    ]
+    page_type = PaginatedResponse[UserRead]
+
+    # What execute() does in Python before its compiled-cache lookup: build
+    # the statement (ad hoc only) and compute its cache key
+    def user_by_id_adhoc():
+        return select(User).where(User.id == 123456)._generate_cache_key()
+
+    def user_count_adhoc():
+        return select(func.count()).select_from(User).where(User.is_active == True)._generate_cache_key()  # noqa: E712
+
+    cases = {
+        "hash_password": lambda: hash_password(PASSWORD),
+        "verify_password": lambda: verify_password(PASSWORD, hashed),
+        "create_access_token": lambda: create_access_token(claims),
+        "decode_access_token": lambda: decode_access_token(token),
+        "extract_token_from_request": lambda: _extract_token_from_request(request),
+        "generate_request_id": generate_request_id,
+        "json_formatter": lambda: json_formatter.format(record()),
+        "colored_formatter": lambda: colored_formatter.format(record()),
+        "paginated_response_create": lambda: page_type.create(items=users, total=1000, page=3, page_size=20),
+        "create_error_response": lambda: create_error_response(
+            request, "AuthenticationError", "Invalid username or password", 401
+        ),
+        "query_user_by_id_adhoc": user_by_id_adhoc,
+        "query_user_by_id_prebuilt": USER_BY_ID._generate_cache_key,
+        "query_user_count_adhoc": user_count_adhoc,
+        "query_user_count_prebuilt": user_count(True)._generate_cache_key,
+    }
+
+    try:
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    except ImportError:
+        return cases
+
+    from backend.app.core import tracing
+
+    def unsampled_request() -> None:
+        # Tracing on, trace dropped by the head sampler: the cost every request pays
+        with tracing.server_span("GET /api/users/me", {"host": "bench"}, {"http.request.method": "GET"}):
+            for _ in range(5):
+                with tracing.span("db.query"):
+                    pass
+
+    tracing.configure_tracing(exporter=InMemorySpanExporter(), sample_ratio=0.0)
+    cases["tracing_unsampled_request"] = unsampled_request
+    return cases
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """Best per-call time in nanoseconds over `repeat` runs of ~0.2s each."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run(selected: Optional[List[str]] = None, repeat: int = 5) -> Dict[str, float]:
+    cases = _cases()
+    if selected:
+        cases = {name: func for name, func in cases.items() if any(key in name for key in selected)}
+    return {name: measure(func, repeat) for name, func in cases.items()}
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, float]:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)["results_ns"]
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks")
+    parser.add_argument("-k", nargs="+", metavar="NAME", help="Only run cases whose name contains NAME")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per case (best is kept)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed slowdown vs baseline (fraction)")
+    args = parser.parse_args()
+
+    # Keep log output from the code under test out of the results table
+    os.environ.setdefault("ENABLE_CONSOLE_LOGS", "false")
+    logging.disable(logging.CRITICAL)
+
+    results = run(args.k, args.repeat)
+    baseline = load_baseline(args.baseline)
+
+    regressions = []
+    print(f"{'case':<30}{'per call':>12}{'baseline':>12}{'change':>10}")
+    for name, ns in results.items():
+        base = baseline.get(name)
+        change = f"{(ns / base - 1) * 100:+.1f}%" if base else "-"
+        print(f"{name:<30}{_format_ns(ns):>12}{_format_ns(base) if base else '-':>12}{change:>10}")
+        if base and ns > base * (1 + args.max_regression):
+            regressions.append(name)
+
+    if args.save_baseline:
+        merged = {**baseline, **results}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "saved_at": datetime.now(timezone.utc).isoformat(),
+                "python": sys.version.split()[0],
+                "results_ns": {name: round(ns, 1) for name, ns in sorted(merged.items())},
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        print(f"Slower than baseline by more than {args.max_regression:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Token codec microbenchmark.
+
+Measures encode and decode throughput for the claim set issued at login
+({"id", "role", "exp"}) across the available JWT backends.
+
+Usage:
+    python -m backend.app.benchmarks.bench_token_codec [--number 20000]
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Tuple
+
+from backend.app.core.jwt_codec import HMACCodec, PyJWTCodec
+
+SECRET = b"benchmark-secret-key-with-32-bytes!!"
+ALGORITHM = "HS256"
+
+
+def _claims() -> dict:
+    return {
+        "id": 123456,
+        "role": "superuser",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=15),
+    }
+
+
+def _backends() -> Dict[str, Tuple[Callable[[], str], Callable[[str], dict]]]:
+    backends = {}
+    for name, codec in (("hmac", HMACCodec()), ("pyjwt", PyJWTCodec())):
+        backends[name] = (
+            lambda c=codec: c.encode(_claims(), SECRET, ALGORITHM),
+            lambda token, c=codec: c.decode(token, SECRET, (ALGORITHM,)),
+        )
+
+    try:
+        from jose import jwt as jose_jwt
+    except ImportError:
+        pass
+    else:
+        backends["python-jose"] = (
+            lambda: jose_jwt.encode(_claims(), SECRET, algorithm=ALGORITHM),
+            lambda token: jose_jwt.decode(token, SECRET, algorithms=[ALGORITHM]),
+        )
+    return backends
+
+
+def run(number: int) -> Dict[str, Dict[str, float]]:
+    """Return ops/sec for encode and decode per backend."""
+    results = {}
+    for name, (encode, decode) in _backends().items():
+        token = encode()
+        encode_time = min(timeit.repeat(encode, number=number, repeat=3))
+        decode_time = min(timeit.repeat(lambda: decode(token), number=number, repeat=3))
+        results[name] = {
+            "encode_ops": number / encode_time,
+            "decode_ops": number / decode_time,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JWT codec microbenchmark")
+    parser.add_argument("--number", type=int, default=20000, help="Calls per timing run")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    print(f"{'backend':<14}{'encode/s':>14}{'decode/s':>14}")
+    for name, stats in results.items():
+        print(f"{name:<14}{stats['encode_ops']:>14,.0f}{stats['decode_ops']:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
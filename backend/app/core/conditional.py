@@ -0,0 +1,76 @@
+"""
+Conditional GET (ETag / If-None-Match) for polled endpoints.
+
+Endpoints compute a cheap weak ETag - from `id` and `updated_at` for one
+record, from count and max(updated_at) for a list - and ask
+`ConditionalGet.not_modified` before loading or serializing anything else.
+On a match they return its bare 304 response straight away.
+
+ETags are weak (`W/"..."`): they promise the same data, not byte-identical
+bodies, so proxies that re-encode (gzip in nginx) keep them valid.
+"""
+import hashlib
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Responses depend on the caller's token, so only the browser may store
+# them, and must revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the values that identify one version of a resource.
+
+    Datetimes are normalized to ISO 8601, so the tag does not depend on
+    how the driver returns them.
+    """
+    raw = "|".join(part.isoformat() if isinstance(part, datetime) else str(part) for part in parts)
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+
+def record_etag(record: Any) -> str:
+    """Weak ETag for one model instance with `id` and `updated_at`."""
+    return weak_etag(type(record).__name__, record.id, record.updated_at)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 9110 13.1.2) of an If-None-Match header with `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class ConditionalGet:
+    """
+    Dependency for endpoints that support If-None-Match.
+
+    Usage:
+        conditional: ConditionalGet = Depends()
+        ...
+        if (not_modified := conditional.not_modified(record_etag(user))):
+            return not_modified
+    """
+
+    def __init__(self, request: Request, response: Response):
+        self.if_none_match = request.headers.get("If-None-Match")
+        self.response = response
+
+    def not_modified(self, etag: str) -> Optional[Response]:
+        """
+        Set the ETag on the response and check it against If-None-Match.
+
+        Returns:
+            A 304 response to return as-is if the client's copy is current,
+            else None (the endpoint builds its normal body)
+        """
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(self.if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        self.response.headers.update(headers)
+        return None
@@ -1,11 +1,11 @@
-from typing import Optional
+from typing import Dict, Iterable, Optional, Type, Union
 from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
-from jose import JWTError
+from backend.app.core.jwt_codec import JWTError
 
 from backend.app.core.security import decode_access_token
-from backend.app.db.session import get_session
+from backend.app.db.queries import ADMIN_BY_ID, USER_BY_ID, principals_by_ids
+from backend.app.db.session import get_read_session, get_session
 from backend.app.models.user import User
 from backend.app.models.admin import Admin
 from backend.app.core.logging.config import get_logger
@@ -109,7 +109,7 @@ async def get_current_user(
     
     # Fetch user from database
     try:
-        result = await session.execute(select(User).where(User.id == user_id))
+        result = await session.execute(USER_BY_ID, {"id": user_id})
         user = result.scalar_one_or_none()
         
         if user is None:
@@ -187,7 +187,7 @@ async def get_current_admin(
     
     # Fetch admin from database
     try:
-        result = await session.execute(select(Admin).where(Admin.id == admin_id))
+        result = await session.execute(ADMIN_BY_ID, {"id": admin_id})
         admin = result.scalar_one_or_none()
         
         if admin is None:
@@ -210,6 +210,67 @@ async def get_current_admin(
         raise
 
 
+async def get_current_user_read(
+    request: Request,
+    session: AsyncSession = Depends(get_read_session)
+) -> User:
+    """
+    get_current_user for read-only handlers.
+
+    The user is looked up through get_read_session (the read replica when
+    one is configured and caught up). The returned user belongs to that
+    session: do not modify it.
+    """
+    return await get_current_user(request, session)
+
+
+async def get_current_admin_read(
+    request: Request,
+    session: AsyncSession = Depends(get_read_session)
+) -> Admin:
+    """
+    get_current_admin for read-only handlers (see get_current_user_read).
+    """
+    return await get_current_admin(request, session)
+
+
+# Token role -> model holding that principal
+PRINCIPAL_MODELS: Dict[str, Type[Union[User, Admin]]] = {
+    "user": User,
+    "superuser": User,
+    "admin": Admin,
+    "superadmin": Admin,
+}
+
+
+async def load_active_principals(
+    session: AsyncSession,
+    model: Type[Union[User, Admin]],
+    principal_ids: Iterable[int],
+) -> Dict[int, Union[User, Admin]]:
+    """
+    Load many users or admins in one query, keeping only active accounts.
+
+    The same existence and `is_active` checks as get_current_user and
+    get_current_admin, for callers that vouch for tokens in bulk
+    (token introspection).
+
+    Args:
+        session: Database session
+        model: User or Admin
+        principal_ids: IDs taken from token claims
+
+    Returns:
+        Dict mapping ID to principal; missing or inactive IDs are absent
+    """
+    principal_ids = set(principal_ids)
+    if not principal_ids:
+        return {}
+    query = principals_by_ids(model, session.bind.dialect.name)
+    result = await session.execute(query, {"ids": list(principal_ids)})
+    return {principal.id: principal for principal in result.scalars().all() if principal.is_active}
+
+
 async def get_current_superuser(
     current_user: User = Depends(get_current_user)
 ) -> User:
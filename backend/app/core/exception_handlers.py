@@ -2,7 +2,7 @@ from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from jose import JWTError
+from backend.app.core.jwt_codec import JWTError
 from datetime import datetime, timezone  # ✅ Added timezone
 from typing import Union
 from fastapi import Request, status, HTTPException
@@ -304,12 +304,15 @@ async def rate_limit_exception_handler(
     """
     logger.warning(f"Rate limit exceeded - Path: {request.url.path}")
     
-    return create_error_response(
+    response = create_error_response(
         request=request,
         error_type="RateLimitError",
         message=exc.message,
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
     )
+    if getattr(exc, "retry_after", None):
+        response.headers["Retry-After"] = str(exc.retry_after)
+    return response
 
 # ============================================================================
 # Email Service Exception Handler
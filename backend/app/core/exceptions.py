@@ -125,6 +125,13 @@ class DatabaseConnectionException(DatabaseException):
         super().__init__(message=message)
 
 
+class QueryTimeoutException(DatabaseException):
+    """Raised when a query is cancelled by its statement timeout"""
+    def __init__(self, message: str = "The query took too long to run"):
+        super().__init__(message=message)
+        self.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+
 # ============================================================================
 # Validation Exceptions
 # ============================================================================
@@ -196,11 +203,39 @@ class UsernameAlreadyExistsException(DuplicateRecordException):
 
 class RateLimitException(AppException):
     """Raised when rate limit is exceeded"""
-    def __init__(self, message: str = "Rate limit exceeded. Please try again later."):
+    def __init__(
+        self,
+        message: str = "Rate limit exceeded. Please try again later.",
+        retry_after: Optional[int] = None,
+    ):
         super().__init__(
             message=message,
             status_code=status.HTTP_429_TOO_MANY_REQUESTS
         )
+        self.retry_after = retry_after
+
+
+class LoginThrottledException(RateLimitException):
+    """Raised when a login is rejected because of too many recent failures"""
+    def __init__(
+        self,
+        message: str = "Too many failed login attempts. Please try again later.",
+        retry_after: Optional[int] = None,
+    ):
+        super().__init__(message=message, retry_after=retry_after)
+
+
+# ============================================================================
+# Diagnostics Exceptions
+# ============================================================================
+
+class ProfilerBusyException(AppException):
+    """Raised when a profile is requested while another one is running"""
+    def __init__(self, message: str = "A profile is already running on this worker"):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_409_CONFLICT
+        )
 
 
 # ============================================================================
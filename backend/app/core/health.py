@@ -0,0 +1,136 @@
+"""
+Cached dependency health for the /health endpoint.
+
+Probes from Docker, nginx and Prometheus hit /health every few seconds from
+every replica. Instead of running `SELECT 1` per probe, one background task
+per worker refreshes a snapshot every `health_cache_seconds` (with jitter so
+workers do not line up), and probes are served from that snapshot.
+
+If the snapshot goes stale (e.g. the background task is not running, as in
+tests), the next probe refreshes it on demand. Concurrent probes share that
+single refresh instead of each issuing their own query. The refresh opens
+its own session: it outlives the request that started it when that request
+is cancelled, and serves the requests that joined it.
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.core.config import settings
+from backend.app.core.logging.config import get_logger
+from backend.app.db.session import async_session_maker, replica_router
+
+logger = get_logger(__name__)
+
+
+class HealthMonitor:
+    """
+    Holds the latest health snapshot and refreshes it at most once per interval.
+    """
+
+    def __init__(self, interval: float = 10.0, jitter: float = 0.1, session_maker=async_session_maker):
+        self.interval = interval
+        self.jitter = jitter
+        self.session_maker = session_maker
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._refreshed_at = 0.0
+        self._inflight: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self._refreshed_at
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot so the next probe refreshes it."""
+        self._snapshot = None
+        self._refreshed_at = 0.0
+
+    async def _probe_database(self, session: AsyncSession) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(session.execute(text("SELECT 1")), timeout=settings.startup_check_timeout_seconds)
+            return {
+                "connected": True,
+                "error": None,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+        except Exception as e:
+            return {
+                "connected": False,
+                "error": str(e) or type(e).__name__,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Probe every dependency and store the new snapshot."""
+        async with self.session_maker() as session:
+            database = await self._probe_database(session)
+
+        snapshot = {
+            "status": "healthy" if database["connected"] else "degraded",
+            "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+            "version": "1.0.2",
+            "environment": settings.environment,
+            "project": "ADL Production",
+            "database": database,
+            "read_replica": replica_router.status(),
+            "email_configured": bool(settings.smtp_server and settings.smtp_port),
+        }
+
+        previous = self._snapshot["status"] if self._snapshot else None
+        if previous != snapshot["status"]:
+            if database["connected"]:
+                logger.info(f"✅ Health status: {snapshot['status']}")
+            else:
+                logger.error(f"❌ Health status: degraded - database: {database['error']}")
+
+        self._snapshot = snapshot
+        self._refreshed_at = time.monotonic()
+        return snapshot
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Return the cached snapshot, refreshing it if stale.
+
+        Only one refresh runs at a time; concurrent callers await the same one.
+        """
+        if self._snapshot is not None and self.age < self.interval:
+            return self._snapshot
+
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self.refresh())
+            self._inflight.add_done_callback(lambda _: setattr(self, "_inflight", None))
+        return await asyncio.shield(self._inflight)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Health refresh failed: {str(e)}")
+            # Refresh slightly before the cache expires; jitter staggers workers
+            delay = self.interval * (0.8 + random.uniform(-self.jitter, self.jitter))
+            await asyncio.sleep(max(delay, 0.1))
+
+    def start(self) -> None:
+        """Start the background refresher (call from lifespan startup)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background refresher (call from lifespan shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+health_monitor = HealthMonitor(interval=settings.health_cache_seconds)
@@ -0,0 +1,186 @@
+"""
+Token introspection (RFC 7662) for internal services.
+
+Services that receive a user's access token ask /api/auth/introspect whether
+it is still good instead of validating JWTs themselves. A token is active
+when its signature and expiry check out AND the user or admin it names
+still exists and is active - the same checks `get_current_user` and
+`get_current_admin` make.
+
+Active results are cached in process memory, keyed by a SHA-256 of the
+token, until the earlier of the token's expiry and
+`introspection_cache_seconds`. Writes that change a principal (profile
+update, password change) drop that principal's entries. The cache is per
+worker and invalidation is local, which is why its TTL is capped: another
+worker may vouch for a deactivated account for at most that long.
+Inactive results are never cached, so a token never stays inactive longer
+than it has to and garbage tokens cannot fill the cache.
+"""
+import hashlib
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.core.config import settings
+from backend.app.core.deps import PRINCIPAL_MODELS, load_active_principals
+from backend.app.core.exceptions import InvalidTokenException
+from backend.app.core.logging.config import get_logger
+from backend.app.core.security import decode_access_token
+from backend.app.models.admin import Admin
+
+logger = get_logger(__name__)
+
+INACTIVE: Dict[str, Any] = {"active": False}
+
+# (principal type, id): "user" or "admin", matching the token's model
+PrincipalKey = Tuple[str, int]
+
+
+def _principal_type(role: str) -> str:
+    return "admin" if PRINCIPAL_MODELS[role] is Admin else "user"
+
+
+class IntrospectionCache:
+    """
+    LRU of active introspection results with per-entry expiry.
+
+    Entries are indexed by principal so `invalidate_principal` can drop
+    every cached token of one user or admin.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        # token digest -> (expires at, principal, result)
+        self._entries: "OrderedDict[bytes, Tuple[float, PrincipalKey, Dict[str, Any]]]" = OrderedDict()
+        self._by_principal: Dict[PrincipalKey, Set[bytes]] = defaultdict(set)
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (result, seconds left) for a live entry, else None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, principal, result = entry
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            self._remove(key, principal)
+            return None
+        self._entries.move_to_end(key)
+        return result, remaining
+
+    def put(self, key: bytes, principal: PrincipalKey, result: Dict[str, Any], ttl: float) -> None:
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        if key in self._entries:
+            self._remove(key, self._entries[key][1])
+        self._entries[key] = (time.monotonic() + ttl, principal, result)
+        self._by_principal[principal].add(key)
+        while len(self._entries) > self.max_size:
+            oldest, (_, oldest_principal, _) = next(iter(self._entries.items()))
+            self._remove(oldest, oldest_principal)
+
+    def invalidate_principal(self, principal_type: str, principal_id: int) -> None:
+        """Drop every cached token of one user or admin (call after changing it)."""
+        for key in self._by_principal.pop((principal_type, principal_id), ()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_principal.clear()
+
+    def _remove(self, key: bytes, principal: PrincipalKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_principal.get(principal)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_principal[principal]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+introspection_cache = IntrospectionCache(settings.introspection_cache_size)
+
+
+def invalidate_principal(principal_type: str, principal_id: int) -> None:
+    introspection_cache.invalidate_principal(principal_type, principal_id)
+
+
+async def introspect_tokens(
+    session: AsyncSession,
+    tokens: Sequence[str],
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Introspect access tokens, answering from the cache where possible.
+
+    Uncached tokens are decoded, then their principals are loaded with one
+    query per model (users, admins), however many tokens there are.
+
+    Args:
+        session: Database session
+        tokens: Access tokens, in the caller's order
+
+    Returns:
+        Tuple of (one RFC 7662 response per token, in order; seconds the
+        whole answer may be cached by the caller, 0 if it must not be)
+    """
+    now = time.time()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(tokens)
+    max_age = float(settings.introspection_cache_seconds)
+    # index -> (cache key, role, principal id, exp) for tokens we must look up
+    pending: Dict[int, Tuple[bytes, str, int, int]] = {}
+    ids_by_model: Dict[Any, Set[int]] = defaultdict(set)
+
+    for index, token in enumerate(tokens):
+        key = IntrospectionCache.key(token)
+        cached = introspection_cache.get(key)
+        if cached is not None:
+            results[index], remaining = cached
+            max_age = min(max_age, remaining)
+            continue
+        try:
+            payload = decode_access_token(token)
+            role, principal_id, exp = payload["role"], int(payload["id"]), int(payload["exp"])
+        except (InvalidTokenException, KeyError, TypeError, ValueError):
+            results[index] = INACTIVE
+            continue
+        if role not in PRINCIPAL_MODELS:
+            results[index] = INACTIVE
+            continue
+        pending[index] = (key, role, principal_id, exp)
+        ids_by_model[PRINCIPAL_MODELS[role]].add(principal_id)
+
+    principals = {
+        model: await load_active_principals(session, model, ids)
+        for model, ids in ids_by_model.items()
+    }
+
+    for index, (key, role, principal_id, exp) in pending.items():
+        principal = principals[PRINCIPAL_MODELS[role]].get(principal_id)
+        if principal is None:
+            results[index] = INACTIVE
+            continue
+        principal_type = _principal_type(role)
+        result = {
+            "active": True,
+            "sub": str(principal_id),
+            "username": principal.username,
+            "role": role,
+            "principal_type": principal_type,
+            "token_type": "access_token",
+            "exp": exp,
+        }
+        results[index] = result
+        ttl = min(exp - now, settings.introspection_cache_seconds)
+        introspection_cache.put(key, (principal_type, principal_id), result, ttl)
+        max_age = min(max_age, ttl)
+
+    if any(not result["active"] for result in results) or not results:
+        max_age = 0
+    return results, max(0, int(max_age))
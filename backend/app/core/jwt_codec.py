@@ -0,0 +1,247 @@
+"""
+JWT encode/decode backends.
+
+`TokenCodec` is the small interface core/security.py signs and verifies
+tokens through. Two implementations are provided:
+
+- `HMACCodec`: a hand-rolled HS256/HS384/HS512 codec over `hmac`/`hashlib`.
+  It caches the encoded header per (algorithm, headers) and does no key
+  parsing, which makes it the fastest option for the default HS256 setup.
+- `PyJWTCodec`: PyJWT, used for asymmetric algorithms (RS*, ES*, EdDSA).
+  Keys are passed in as pre-parsed `cryptography` objects.
+
+Both raise `JWTError` (or `ExpiredSignatureError`) on any failure so callers
+and the exception handlers in main.py only need to know about one type.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class JWTError(Exception):
+    """Raised when a token cannot be encoded, decoded or verified."""
+
+
+class ExpiredSignatureError(JWTError):
+    """Raised when a token's `exp` claim is in the past."""
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def base64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def base64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _json_dumps(obj: Dict[str, Any]) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _numeric_date(value: Any) -> Any:
+    """Convert datetimes to NumericDate (seconds since epoch), as RFC 7519 requires."""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return value
+
+
+def _split(token: str) -> Tuple[bytes, bytes, bytes]:
+    if isinstance(token, str):
+        token = token.encode("utf-8")
+    try:
+        signing_input, signature = token.rsplit(b".", 1)
+        header_segment, payload_segment = signing_input.split(b".", 1)
+    except ValueError:
+        raise JWTError("Not enough segments")
+    return header_segment, payload_segment, signature
+
+
+def _load_segment(segment: bytes) -> Dict[str, Any]:
+    try:
+        value = json.loads(base64url_decode(segment))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise JWTError("Invalid token segment")
+    if not isinstance(value, dict):
+        raise JWTError("Invalid token segment")
+    return value
+
+
+def get_unverified_header(token: str) -> Dict[str, Any]:
+    """Return the JOSE header without checking the signature."""
+    return _load_segment(_split(token)[0])
+
+
+def get_unverified_claims(token: str) -> Dict[str, Any]:
+    """
+    Return the payload without checking the signature or expiry.
+
+    Only for decisions that are safe to make on forged claims (such as
+    routing a read to the primary); never for authentication.
+    """
+    return _load_segment(_split(token)[1])
+
+
+# ============================================================================
+# Interface
+# ============================================================================
+
+class TokenCodec(ABC):
+    """Encode and decode signed JWTs."""
+
+    #: Algorithms this codec can sign and verify
+    algorithms: frozenset = frozenset()
+
+    @abstractmethod
+    def encode(
+        self,
+        claims: Dict[str, Any],
+        key: Any,
+        algorithm: str,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Sign `claims` and return the compact token."""
+
+    @abstractmethod
+    def decode(self, token: str, key: Any, algorithms: Iterable[str]) -> Dict[str, Any]:
+        """Verify `token` and return its claims. Checks `exp` and `nbf`."""
+
+    def get_unverified_header(self, token: str) -> Dict[str, Any]:
+        return get_unverified_header(token)
+
+
+# ============================================================================
+# Implementations
+# ============================================================================
+
+class HMACCodec(TokenCodec):
+    """Minimal HS256/HS384/HS512 codec built on the standard library."""
+
+    _DIGESTS = {
+        "HS256": hashlib.sha256,
+        "HS384": hashlib.sha384,
+        "HS512": hashlib.sha512,
+    }
+    algorithms = frozenset(_DIGESTS)
+
+    def __init__(self, leeway: int = 0):
+        self.leeway = leeway
+        self._header_cache: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], bytes] = {}
+
+    def _encoded_header(self, algorithm: str, headers: Optional[Dict[str, Any]]) -> bytes:
+        cache_key = (algorithm, tuple(sorted(headers.items())) if headers else ())
+        encoded = self._header_cache.get(cache_key)
+        if encoded is None:
+            header = {"alg": algorithm, "typ": "JWT"}
+            if headers:
+                header.update(headers)
+            encoded = base64url_encode(_json_dumps(header))
+            self._header_cache[cache_key] = encoded
+        return encoded
+
+    def encode(self, claims, key, algorithm, headers=None) -> str:
+        digest = self._DIGESTS.get(algorithm)
+        if digest is None:
+            raise JWTError(f"Unsupported algorithm: {algorithm}")
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+
+        payload = {name: _numeric_date(value) for name, value in claims.items()}
+        signing_input = self._encoded_header(algorithm, headers) + b"." + base64url_encode(_json_dumps(payload))
+        signature = hmac.new(key, signing_input, digest).digest()
+        return (signing_input + b"." + base64url_encode(signature)).decode("ascii")
+
+    def decode(self, token, key, algorithms) -> Dict[str, Any]:
+        header_segment, payload_segment, signature = _split(token)
+        header = _load_segment(header_segment)
+
+        algorithm = header.get("alg")
+        if algorithm not in algorithms or algorithm not in self._DIGESTS:
+            raise JWTError("The specified alg value is not allowed")
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+
+        expected = hmac.new(key, header_segment + b"." + payload_segment, self._DIGESTS[algorithm]).digest()
+        try:
+            provided = base64url_decode(signature)
+        except binascii.Error:
+            raise JWTError("Invalid signature encoding")
+        if not hmac.compare_digest(expected, provided):
+            raise JWTError("Signature verification failed")
+
+        claims = _load_segment(payload_segment)
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise JWTError("Expiration Time claim (exp) must be a number")
+            if exp <= now - self.leeway:
+                raise ExpiredSignatureError("Signature has expired")
+        nbf = claims.get("nbf")
+        if nbf is not None:
+            if not isinstance(nbf, (int, float)):
+                raise JWTError("Not Before claim (nbf) must be a number")
+            if nbf > now + self.leeway:
+                raise JWTError("The token is not yet valid (nbf)")
+        return claims
+
+
+class PyJWTCodec(TokenCodec):
+    """PyJWT-backed codec for asymmetric (and HMAC) algorithms."""
+
+    algorithms = frozenset({
+        "HS256", "HS384", "HS512",
+        "RS256", "RS384", "RS512",
+        "ES256", "ES384", "ES512",
+        "EdDSA",
+    })
+
+    def __init__(self, leeway: int = 0):
+        import jwt
+
+        self._jwt = jwt
+        self.leeway = leeway
+
+    def encode(self, claims, key, algorithm, headers=None) -> str:
+        try:
+            return self._jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+        except self._jwt.PyJWTError as e:
+            raise JWTError(str(e))
+
+    def decode(self, token, key, algorithms) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(
+                token,
+                key,
+                algorithms=list(algorithms),
+                leeway=self.leeway,
+                # Subjects in older tokens may not be strings
+                options={"verify_sub": False},
+            )
+        except self._jwt.ExpiredSignatureError as e:
+            raise ExpiredSignatureError(str(e))
+        except self._jwt.PyJWTError as e:
+            raise JWTError(str(e))
+
+
+_hmac_codec = HMACCodec()
+_pyjwt_codec: Optional[PyJWTCodec] = None
+
+
+def get_codec(algorithm: str) -> TokenCodec:
+    """Return the fastest available codec for `algorithm`."""
+    global _pyjwt_codec
+    if algorithm in HMACCodec.algorithms:
+        return _hmac_codec
+    if _pyjwt_codec is None:
+        _pyjwt_codec = PyJWTCodec()
+    return _pyjwt_codec
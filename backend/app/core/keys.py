@@ -0,0 +1,223 @@
+"""
+JWT signing key management.
+
+Supports the legacy shared-secret mode (HS256 with SECRET_KEY) and asymmetric
+signing (RS*/ES*/EdDSA) with several keys held at once, each identified by a `kid`.
+
+Asymmetric keys are PEM-encoded private keys stored as `<kid>.pem` files in
+`settings.jwt_keys_dir`. The active signing key is `settings.jwt_active_kid`
+or, when unset, the most recently modified key file. Every loaded key stays
+valid for verification until its file is removed, so rotating is:
+
+    1. drop a new `<kid>.pem` into the directory (it becomes the signer)
+    2. wait for the longest token lifetime
+    3. delete the old file
+
+The directory is re-scanned at most every `jwt_keys_reload_seconds`, so no
+restart is needed. Keys are parsed once per reload and cached.
+"""
+import json
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from jwt.algorithms import get_default_algorithms
+
+from backend.app.core.config import settings
+from backend.app.core.exceptions import InvalidTokenException
+from backend.app.core.logging.config import get_logger
+
+logger = get_logger(__name__)
+
+SYMMETRIC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512", "EdDSA"}
+
+
+@dataclass(frozen=True)
+class JWTKey:
+    """
+    A parsed signing key and its public counterpart.
+    HMAC keys are raw bytes; asymmetric keys are `cryptography` key objects.
+    """
+    kid: Optional[str]
+    algorithm: str
+    signing_key: Any
+    verifying_key: Any
+    public_jwk: Optional[Dict[str, Any]] = field(default=None)
+
+
+class KeyRing:
+    """
+    Holds the active signing key plus every key still accepted for verification.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: str,
+        keys_dir: Optional[str] = None,
+        active_kid: Optional[str] = None,
+        reload_seconds: int = 30,
+    ):
+        self.algorithm = "EdDSA" if algorithm.upper() == "EDDSA" else algorithm.upper()
+        self.secret_key = secret_key
+        self.keys_dir = Path(keys_dir) if keys_dir else None
+        self.active_kid = active_kid
+        self.reload_seconds = reload_seconds
+
+        self._lock = threading.Lock()
+        self._keys: Dict[Optional[str], JWTKey] = {}
+        self._active: Optional[JWTKey] = None
+        self._snapshot: Tuple[Tuple[str, float], ...] = ()
+        self._checked_at = 0.0
+        self._jwks_body = b'{"keys":[]}'
+        self._jwks_etag = ""
+
+        if self.algorithm not in SYMMETRIC_ALGORITHMS | ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+
+        if self.is_symmetric:
+            hmac_key = secret_key.encode("utf-8")
+            self._active = JWTKey(None, self.algorithm, hmac_key, hmac_key)
+            self._keys = {None: self._active}
+            self._update_jwks()
+        else:
+            if self.keys_dir is None:
+                raise ValueError(f"JWT_KEYS_DIR must be set when ALGORITHM is {self.algorithm}")
+            self.reload(force=True)
+
+    @property
+    def is_symmetric(self) -> bool:
+        return self.algorithm in SYMMETRIC_ALGORITHMS
+
+    # ----------------------------------------------------------------------
+    # Loading
+    # ----------------------------------------------------------------------
+
+    def _scan(self) -> Tuple[Tuple[str, float], ...]:
+        """Return (path, mtime) for every key file, sorted by mtime."""
+        entries = [(str(p), p.stat().st_mtime) for p in self.keys_dir.glob("*.pem")]
+        return tuple(sorted(entries, key=lambda item: (item[1], item[0])))
+
+    def _parse(self, path: Path) -> JWTKey:
+        private_key = load_pem_private_key(path.read_bytes(), password=None)
+        public_key = private_key.public_key()
+        public_jwk = get_default_algorithms()[self.algorithm].to_jwk(public_key, as_dict=True)
+        public_jwk.update({"kid": path.stem, "use": "sig", "alg": self.algorithm})
+        return JWTKey(path.stem, self.algorithm, private_key, public_key, public_jwk)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-read the key directory if it changed since the last scan.
+
+        Returns:
+            bool: True if the key set was reloaded
+        """
+        if self.is_symmetric:
+            return False
+
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked_at < self.reload_seconds:
+                return False
+            self._checked_at = now
+
+            snapshot = self._scan()
+            if not force and snapshot == self._snapshot:
+                return False
+
+            previous = dict(self._snapshot)
+            keys: Dict[Optional[str], JWTKey] = {}
+            for path_str, mtime in snapshot:
+                path = Path(path_str)
+                cached = self._keys.get(path.stem)
+                # Reuse the parsed key if the file has not been touched
+                if cached is not None and previous.get(path_str) == mtime:
+                    keys[path.stem] = cached
+                    continue
+                try:
+                    keys[path.stem] = self._parse(path)
+                except Exception as e:
+                    logger.error(f"Failed to load JWT key '{path.name}': {str(e)}")
+
+            if not keys:
+                if self._keys:
+                    logger.error("No usable JWT keys found on reload - keeping previous key set")
+                    return False
+                raise RuntimeError(f"No usable JWT signing keys found in {self.keys_dir}")
+
+            if self.active_kid and self.active_kid in keys:
+                active = keys[self.active_kid]
+            else:
+                if self.active_kid:
+                    logger.warning(f"JWT_ACTIVE_KID '{self.active_kid}' not found - using newest key")
+                newest = Path(snapshot[-1][0]).stem
+                active = keys.get(newest) or next(reversed(keys.values()))
+
+            self._keys = keys
+            self._active = active
+            self._snapshot = snapshot
+            self._update_jwks()
+
+        logger.info(f"🔑 Loaded {len(keys)} JWT key(s), signing with kid '{active.kid}'")
+        return True
+
+    def _update_jwks(self) -> None:
+        public = [k.public_jwk for k in self._keys.values() if k.public_jwk]
+        self._jwks_body = json.dumps({"keys": public}, separators=(",", ":"), sort_keys=True).encode()
+        self._jwks_etag = f'"{hashlib.sha256(self._jwks_body).hexdigest()[:32]}"'
+
+    # ----------------------------------------------------------------------
+    # Lookups
+    # ----------------------------------------------------------------------
+
+    def signing_key(self) -> JWTKey:
+        """Return the key new tokens should be signed with."""
+        self.reload()
+        return self._active
+
+    def verification_key(self, kid: Optional[str]) -> JWTKey:
+        """
+        Return the key matching a token's `kid` header.
+
+        Tokens without a `kid` (issued before rotation was enabled) are checked
+        against the active key. An unknown `kid` forces one directory re-scan
+        in case the key was added since the last check (at most once per second,
+        so forged `kid` values cannot turn into a directory scan per request).
+
+        Raises:
+            InvalidTokenException: If no key matches
+        """
+        self.reload()
+        if kid is None or self.is_symmetric:
+            return self._active
+
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._checked_at >= 1.0 and self.reload(force=True):
+            key = self._keys.get(kid)
+        if key is None:
+            raise InvalidTokenException("Token signed with an unknown key")
+        return key
+
+    def jwks(self) -> Tuple[bytes, str]:
+        """Return the serialized public JWK Set and its ETag."""
+        self.reload()
+        return self._jwks_body, self._jwks_etag
+
+    @property
+    def kids(self) -> List[Optional[str]]:
+        return list(self._keys)
+
+
+# Shared key ring used by core/security.py and the JWKS endpoint
+key_ring = KeyRing(
+    algorithm=settings.algorithm,
+    secret_key=settings.secret_key.get_secret_value(),
+    keys_dir=settings.jwt_keys_dir,
+    active_kid=settings.jwt_active_kid,
+    reload_seconds=settings.jwt_keys_reload_seconds,
+)
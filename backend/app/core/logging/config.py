@@ -79,7 +79,8 @@ class ColoredFormatter(logging.Formatter):
         # Add request_id to the message if present
         original_msg = record.getMessage()
         if hasattr(record, 'request_id') and record.request_id:
-            record.msg = f"[{record.request_id[:8]}] {original_msg}"
+            # Tail, not head: generated IDs start with a shared timestamp
+            record.msg = f"[{record.request_id[-8:]}] {original_msg}"
         
         formatted = super().format(record)
         
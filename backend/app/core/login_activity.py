@@ -0,0 +1,234 @@
+"""
+Write-behind buffer for `last_login_at` and `login_count`.
+
+Updating the principal's row inside the login request would add a write
+round-trip and a row lock to every login, and a user logging in from
+several tabs would queue on that lock. Instead `record_login` only notes
+the login in process memory; one task per worker coalesces the logins per
+principal and writes them every `login_activity_flush_seconds` with a
+single statement per table:
+
+    UPDATE users SET last_login_at = ..., login_count = login_count + v.logins
+    FROM (VALUES (:id, :at, :logins), ...) AS v (id, at, logins)
+    WHERE users.id = v.id
+
+Rows are written in id order, so workers flushing at the same time lock
+them in the same order. `updated_at` is left alone: it tracks profile
+changes, and the profile ETags (core/conditional.py) are built from it.
+
+Logins recorded since the last flush are lost if the worker is killed
+outright; lifespan shutdown flushes whatever is pending.
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Integer, bindparam, case, column, update, values
+
+from backend.app.core.config import settings
+from backend.app.core.logging.config import get_logger
+from backend.app.db.session import async_session_maker
+from backend.app.models.admin import Admin
+from backend.app.models.user import User
+from backend.app.core.metrics import login_activity_buffer_size, login_activity_flush_seconds
+
+logger = get_logger(__name__)
+
+MODELS = {"user": User, "admin": Admin}
+_ROWS_PER_STATEMENT = 5_000
+
+
+@dataclass
+class LoginActivity:
+    """Logins of one principal since the last flush."""
+
+    last_login_at: datetime
+    logins: int = 1
+
+    def merge(self, other: "LoginActivity") -> None:
+        self.last_login_at = max(self.last_login_at, other.last_login_at)
+        self.logins += other.logins
+
+
+def _later(current, new):
+    """`new` unless the row already holds a later login (another worker flushed it)."""
+    return case((current.is_(None) | (current < new), new), else_=current)
+
+
+def build_update(model, rows: List[Tuple[int, LoginActivity]]):
+    """
+    One UPDATE ... FROM (VALUES ...) applying `rows` to `model`'s table.
+
+    Args:
+        model: User or Admin
+        rows: (id, activity) pairs, in id order
+    """
+    activity = values(
+        column("id", Integer),
+        column("last_login_at", DateTime(timezone=True)),
+        column("logins", Integer),
+        name="activity",
+    ).data([(principal_id, entry.last_login_at, entry.logins) for principal_id, entry in rows])
+    return (
+        update(model)
+        .where(model.id == activity.c.id)
+        .values(
+            last_login_at=_later(model.last_login_at, activity.c.last_login_at),
+            login_count=model.login_count + activity.c.logins,
+            # Keep the onupdate hook from touching updated_at
+            updated_at=model.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def build_update_many(model):
+    """
+    Per-row UPDATE for executemany, for databases without UPDATE ... FROM
+    (VALUES ...) column aliases (SQLite in development and tests).
+    """
+    table = model.__table__
+    return (
+        update(table)
+        .where(table.c.id == bindparam("principal_id"))
+        .values(
+            last_login_at=_later(table.c.last_login_at, bindparam("at", type_=DateTime(timezone=True))),
+            login_count=table.c.login_count + bindparam("logins"),
+            updated_at=table.c.updated_at,
+        )
+    )
+
+
+class LoginActivityBuffer:
+    """
+    Coalesces logins per principal in memory and flushes them in batches.
+    """
+
+    def __init__(self, interval: float = 5.0, max_pending: int = 10_000, session_maker=async_session_maker):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.session_maker = session_maker
+        self._pending: Dict[Tuple[str, int], LoginActivity] = {}
+        self._full = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def record(self, principal: str, principal_id: int, at: Optional[datetime] = None) -> None:
+        """
+        Note a successful login by `principal` ("user" or "admin"). No I/O.
+        """
+        entry = LoginActivity(at or datetime.now(timezone.utc))
+        key = (principal, principal_id)
+        if key in self._pending:
+            self._pending[key].merge(entry)
+            return
+        self._pending[key] = entry
+        login_activity_buffer_size.set(len(self._pending))
+        if len(self._pending) >= self.max_pending:
+            # Flush early rather than grow without bound
+            self._full.set()
+
+    async def flush(self) -> int:
+        """
+        Write every pending login.
+
+        Logins recorded during the write wait for the next flush. If the
+        write fails, the batch is merged back and retried on the next one.
+
+        Returns:
+            int: Principals written
+        """
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            self._full.clear()
+            login_activity_buffer_size.set(0)
+
+            started = time.perf_counter()
+            try:
+                await self._write(batch)
+            except BaseException:
+                # Also on cancellation, so the shutdown flush still has the batch
+                login_activity_flush_seconds.labels(result="error").observe(time.perf_counter() - started)
+                for key, entry in batch.items():
+                    if key in self._pending:
+                        entry.merge(self._pending[key])
+                    self._pending[key] = entry
+                login_activity_buffer_size.set(len(self._pending))
+                raise
+            login_activity_flush_seconds.labels(result="ok").observe(time.perf_counter() - started)
+            return len(batch)
+
+    async def _write(self, batch: Dict[Tuple[str, int], LoginActivity]) -> None:
+        async with self.session_maker() as session:
+            for principal, model in MODELS.items():
+                rows = sorted(
+                    (principal_id, entry) for (kind, principal_id), entry in batch.items() if kind == principal
+                )
+                if not rows:
+                    continue
+                if session.bind.dialect.name == "postgresql":
+                    # Three bind parameters a row; asyncpg allows 32767 per statement
+                    for start in range(0, len(rows), _ROWS_PER_STATEMENT):
+                        await session.execute(build_update(model, rows[start:start + _ROWS_PER_STATEMENT]))
+                else:
+                    await session.execute(
+                        build_update_many(model),
+                        [
+                            {"principal_id": principal_id, "at": entry.last_login_at, "logins": entry.logins}
+                            for principal_id, entry in rows
+                        ],
+                    )
+            await session.commit()
+
+    async def _run(self) -> None:
+        while True:
+            delay = self.interval * (1 + random.uniform(-0.1, 0.1))
+            try:
+                await asyncio.wait_for(self._full.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Login activity flush failed, {self.pending} principals kept for retry: {str(e)}")
+
+    def start(self) -> None:
+        """Start the periodic flush (call from lifespan startup)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write what is pending (call from lifespan shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            flushed = await self.flush()
+        except Exception as e:
+            logger.error(f"⚠️  Login activity of {self.pending} principals lost at shutdown: {str(e)}")
+            return
+        if flushed:
+            logger.info(f"✅ Flushed login activity of {flushed} principals")
+
+
+login_activity = LoginActivityBuffer(
+    interval=settings.login_activity_flush_seconds,
+    max_pending=settings.login_activity_max_pending,
+)
+
+
+def record_login(principal: str, principal_id: int) -> None:
+    """Call after a successful login."""
+    login_activity.record(principal, principal_id)
@@ -0,0 +1,204 @@
+"""
+Failed-login tracking with progressive back-off and temporary lockout.
+
+Failures are counted per username and per client IP in a `limits` storage
+backend (the same library slowapi uses), so the state lives in process memory
+by default or in a shared store such as Redis when
+`LOGIN_THROTTLE_STORAGE_URI` points at one.
+
+Rules, checked before any password hash is verified:
+
+- After `login_max_failures` failures for a username within
+  `login_lockout_seconds`, further attempts are rejected until the window ends.
+- After `login_backoff_free_attempts` failures, each new failure forces a wait
+  of `login_backoff_base_seconds * 2**n` (capped) before the next attempt.
+- After `login_max_failures_per_ip` failures from one IP, that IP is locked out.
+
+Failures are counted for unknown usernames as well, so lockout behaviour
+does not reveal which accounts exist.
+"""
+import math
+import time
+from typing import Optional
+
+from limits.storage import storage_from_string
+from starlette.requests import Request
+
+from backend.app.core.config import settings
+from backend.app.core.exceptions import LoginThrottledException
+from backend.app.core.logging.config import get_logger
+from backend.app.core.metrics import login_attempts_rejected_total, login_lockouts_total
+
+logger = get_logger(__name__)
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """
+    Client IP to key throttling on.
+
+    Headers are not read here: any peer that reaches uvicorn could set them.
+    Uvicorn's proxy-headers handling already rewrites `request.client` from
+    X-Forwarded-For, but only for peers in FORWARDED_ALLOW_IPS (nginx), and
+    then takes the hop nginx appended rather than the client-chosen first one.
+    """
+    return request.client.host if request.client else None
+
+
+class LoginThrottle:
+    """
+    Tracks failed logins and rejects attempts from locked usernames or IPs.
+    """
+
+    def __init__(
+        self,
+        storage_uri: str = "memory://",
+        max_failures: int = 5,
+        max_failures_per_ip: int = 20,
+        lockout_seconds: int = 900,
+        backoff_free_attempts: int = 2,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 30.0,
+        enabled: bool = True,
+    ):
+        self.storage_uri = storage_uri if storage_uri.startswith("async+") else f"async+{storage_uri}"
+        self.max_failures = max_failures
+        self.max_failures_per_ip = max_failures_per_ip
+        self.lockout_seconds = lockout_seconds
+        self.backoff_free_attempts = backoff_free_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.enabled = enabled
+        self._storage = None
+
+    @property
+    def storage(self):
+        """Create the storage backend on first use."""
+        if self._storage is None:
+            options = {}
+            if self.storage_uri.startswith("async+redis"):
+                # limits defaults to coredis; redis-py is what requirements.txt installs
+                options["implementation"] = "redispy"
+            self._storage = storage_from_string(self.storage_uri, **options)
+        return self._storage
+
+    # ----------------------------------------------------------------------
+    # Keys and policy
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def _user_key(principal: str, username: str) -> str:
+        return f"login:fail:{principal}:user:{username.strip().lower()}"
+
+    @staticmethod
+    def _ip_key(principal: str, ip: str) -> str:
+        return f"login:fail:{principal}:ip:{ip}"
+
+    @staticmethod
+    def _backoff_key(user_key: str, failures: int) -> str:
+        return f"{user_key}:backoff:{failures}"
+
+    def backoff_delay(self, failures: int) -> float:
+        """Seconds a client must wait after `failures` consecutive failures."""
+        excess = failures - self.backoff_free_attempts
+        if excess <= 0:
+            return 0.0
+        return min(self.backoff_base_seconds * (2 ** (excess - 1)), self.backoff_max_seconds)
+
+    async def _retry_after(self, key: str) -> int:
+        return max(1, int(await self.storage.get_expiry(key) - time.time()) + 1)
+
+    # ----------------------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------------------
+
+    async def check(self, principal: str, username: str, ip: Optional[str]) -> None:
+        """
+        Reject the attempt if the username or IP is locked or backing off.
+
+        Args:
+            principal: "user" or "admin"
+            username: Username or email the client is logging in with
+            ip: Client IP address
+
+        Raises:
+            LoginThrottledException: With Retry-After seconds
+        """
+        if not self.enabled:
+            return
+
+        user_key = self._user_key(principal, username)
+        try:
+            failures = await self.storage.get(user_key)
+            if failures >= self.max_failures:
+                reason, retry_after = "locked", await self._retry_after(user_key)
+            elif failures and await self.storage.get(self._backoff_key(user_key, failures)):
+                reason = "backoff"
+                retry_after = await self._retry_after(self._backoff_key(user_key, failures))
+            elif ip and await self.storage.get(self._ip_key(principal, ip)) >= self.max_failures_per_ip:
+                reason, retry_after = "ip_locked", await self._retry_after(self._ip_key(principal, ip))
+            else:
+                return
+        except Exception as e:
+            # Never lock everyone out because the shared store is unavailable
+            logger.error(f"Login throttle check failed, allowing attempt: {str(e)}")
+            return
+
+        login_attempts_rejected_total.labels(principal=principal, reason=reason).inc()
+        logger.warning(f"Login throttled ({reason}) for {principal} '{username}' from {ip}, retry in {retry_after}s")
+        raise LoginThrottledException(retry_after=retry_after)
+
+    async def record_failure(self, principal: str, username: str, ip: Optional[str]) -> None:
+        """Count a failed attempt and start back-off or lockout if a limit is reached."""
+        if not self.enabled:
+            return
+
+        user_key = self._user_key(principal, username)
+        # Each write stands alone, so a failed one does not skip the others
+        failures = await self._incr(user_key, self.lockout_seconds)
+        if failures:
+            delay = self.backoff_delay(failures)
+            if delay:
+                # Whole seconds: Redis EXPIRE rejects fractional expiries
+                await self._incr(self._backoff_key(user_key, failures), math.ceil(delay))
+            if failures == self.max_failures:
+                login_lockouts_total.labels(principal=principal, scope="username").inc()
+                logger.warning(f"Locked out {principal} '{username}' after {failures} failed logins")
+
+        if ip:
+            ip_failures = await self._incr(self._ip_key(principal, ip), self.lockout_seconds)
+            if ip_failures == self.max_failures_per_ip:
+                login_lockouts_total.labels(principal=principal, scope="ip").inc()
+                logger.warning(f"Locked out IP {ip} after {ip_failures} failed {principal} logins")
+
+    async def _incr(self, key: str, expiry: int) -> Optional[int]:
+        """Increment a failure counter; None if the store could not be written."""
+        try:
+            return await self.storage.incr(key, expiry)
+        except Exception as e:
+            logger.error(f"Failed to record login failure ({key}): {str(e)}")
+            return None
+
+    async def record_success(self, principal: str, username: str) -> None:
+        """Reset the username's failure count after a successful login."""
+        if not self.enabled:
+            return
+        user_key = self._user_key(principal, username)
+        try:
+            failures = await self.storage.get(user_key)
+            if failures:
+                await self.storage.clear(self._backoff_key(user_key, failures))
+                await self.storage.clear(user_key)
+        except Exception as e:
+            logger.error(f"Failed to reset login failures: {str(e)}")
+
+
+login_throttle = LoginThrottle(
+    storage_uri=settings.login_throttle_storage_uri,
+    max_failures=settings.login_max_failures,
+    max_failures_per_ip=settings.login_max_failures_per_ip,
+    lockout_seconds=settings.login_lockout_seconds,
+    backoff_free_attempts=settings.login_backoff_free_attempts,
+    backoff_base_seconds=settings.login_backoff_base_seconds,
+    backoff_max_seconds=settings.login_backoff_max_seconds,
+    enabled=settings.login_throttle_enabled,
+)
@@ -0,0 +1,162 @@
+"""
+Event-loop lag monitor and blocking-call detector.
+
+A synchronous call inside a coroutine (bcrypt, smtplib, a sync DB driver)
+stalls every request on the worker, but only shows up as a vague p99 spike.
+This monitor makes it visible:
+
+- A heartbeat task sleeps for `interval` and measures how late it wakes up.
+  That lag goes into the `event_loop_lag_seconds` histogram.
+- A watchdog thread checks the heartbeat. If it is overdue by more than
+  `threshold`, the loop is blocked right now. The watchdog grabs the loop thread's stack,
+  which is the code doing the blocking, and the request ID of the task
+  running it, and logs both.
+
+Tests can use `raise_for_blocking()` (see the `no_loop_blocking` fixture)
+to fail when a handler blocks for longer than the threshold.
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import List, Optional
+
+from backend.app.core.config import settings
+from backend.app.core.logging.config import get_logger, request_id_var
+from backend.app.core.metrics import event_loop_blocked_total, event_loop_lag_seconds
+
+logger = get_logger(__name__)
+
+
+class EventLoopBlockedError(AssertionError):
+    """Raised in test mode when the event loop was blocked past the threshold."""
+
+
+@dataclass
+class BlockingEvent:
+    """One detected stall of the event loop."""
+    blocked_for: float  # Seconds blocked when the stack was captured (a lower bound)
+    stack: str
+    request_id: Optional[str]
+
+
+def _request_id(loop: asyncio.AbstractEventLoop, frame) -> Optional[str]:
+    """Best-effort request ID of the task that is blocking the loop."""
+    task = asyncio.current_task(loop)
+    get_context = getattr(task, "get_context", None)  # Python 3.12+
+    if get_context is not None:
+        return get_context().get(request_id_var)
+
+    # Older Pythons: find the Starlette Request further up the blocked stack
+    try:
+        while frame is not None:
+            request = frame.f_locals.get("request")
+            request_id = getattr(getattr(request, "state", None), "request_id", None)
+            if request_id:
+                return request_id
+            frame = frame.f_back
+    except Exception:
+        pass
+    return None
+
+
+class EventLoopMonitor:
+    """
+    Measures event-loop lag and reports stacks that block the loop.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1, keep_events: int = 100):
+        self.interval = interval
+        self.threshold = threshold
+        self.keep_events = keep_events
+        self.events: List[BlockingEvent] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._due = 0.0
+        self._reported_due = 0.0
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # When the heartbeat should wake up; the watchdog measures against this
+            self._due = time.monotonic() + self.interval
+            scheduled = loop.time()
+            await asyncio.sleep(self.interval)
+            event_loop_lag_seconds.observe(max(loop.time() - scheduled - self.interval, 0.0))
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 4):
+            due = self._due
+            blocked_for = time.monotonic() - due
+            if not due or blocked_for < self.threshold or due == self._reported_due:
+                continue
+            # One report per stall
+            self._reported_due = due
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            event = BlockingEvent(
+                blocked_for=blocked_for,
+                stack="".join(traceback.format_stack(frame)),
+                request_id=_request_id(self._loop, frame),
+            )
+            del frame
+
+            event_loop_blocked_total.inc()
+            self.events.append(event)
+            del self.events[:-self.keep_events]
+            logger.warning(
+                f"⚠️  Event loop blocked for over {blocked_for * 1000:.0f}ms "
+                f"(request {event.request_id or '-'}). Blocking stack:\n{event.stack}",
+                extra={"request_id": event.request_id},
+            )
+
+    def start(self) -> None:
+        """Start monitoring the running loop (call from lifespan startup)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._due = 0.0
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and watchdog thread (call from lifespan shutdown)."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    def raise_for_blocking(self) -> None:
+        """
+        Test mode: raise if any stall longer than the threshold was seen.
+
+        Raises:
+            EventLoopBlockedError: With the stack of the first blocking call
+        """
+        if self.events:
+            first = self.events[0]
+            raise EventLoopBlockedError(
+                f"Event loop blocked {len(self.events)} time(s) for over "
+                f"{self.threshold * 1000:.0f}ms. First blocking stack "
+                f"(request {first.request_id or '-'}):\n{first.stack}"
+            )
+
+
+loop_monitor = EventLoopMonitor(
+    interval=settings.loop_monitor_interval_ms / 1000,
+    threshold=settings.loop_block_threshold_ms / 1000,
+)
@@ -0,0 +1,152 @@
+"""
+Prometheus metrics.
+
+Defined in core rather than next to the /metrics endpoint
+(routers/metrics.py), so core and db modules can record metrics without
+importing the routers package.
+"""
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram, Info
+
+from backend.app.core.config import settings
+
+# ============= PROMETHEUS METRICS =============
+
+# Application Info
+app_info = Info('adl_application', 'Application information', registry=REGISTRY)
+app_info.info({
+    'version': settings.version,
+    'environment': settings.environment,
+    'name': settings.project_name
+})
+
+# HTTP Metrics
+http_requests_total = Counter(
+    'http_requests_total',
+    'Total HTTP requests',
+    ['method', 'endpoint', 'status'],
+    registry=REGISTRY
+)
+
+http_request_duration_seconds = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency in seconds',
+    ['method', 'endpoint'],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+    registry=REGISTRY
+)
+
+http_requests_in_progress = Gauge(
+    'http_requests_in_progress',
+    'Number of HTTP requests in progress',
+    ['method', 'endpoint'],
+    multiprocess_mode='livesum',
+    registry=REGISTRY
+)
+
+# Event Loop Metrics
+event_loop_lag_seconds = Histogram(
+    'event_loop_lag_seconds',
+    'How late the event loop ran a scheduled heartbeat',
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+    registry=REGISTRY
+)
+
+event_loop_blocked_total = Counter(
+    'event_loop_blocked_total',
+    'Times the event loop was blocked past the detection threshold',
+    registry=REGISTRY
+)
+
+# Application Metrics
+active_users_gauge = Gauge(
+    'active_users_total',
+    'Total number of active users',
+    multiprocess_mode='livemax',
+    registry=REGISTRY
+)
+
+registered_users_gauge = Gauge(
+    'registered_users_total',
+    'Total number of registered users',
+    multiprocess_mode='livemax',
+    registry=REGISTRY
+)
+
+# Authentication Metrics
+logins_total = Counter(
+    'logins_total',
+    'Login attempts that reached password verification',
+    ['principal', 'result'],
+    registry=REGISTRY
+)
+
+password_hash_duration_seconds = Histogram(
+    'password_hash_duration_seconds',
+    'Time spent hashing or verifying a password',
+    ['operation', 'scheme'],
+    buckets=[0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0],
+    registry=REGISTRY
+)
+
+# Login Throttling Metrics
+login_lockouts_total = Counter(
+    'login_lockouts_total',
+    'Usernames or IPs locked out after repeated failed logins',
+    ['principal', 'scope'],
+    registry=REGISTRY
+)
+
+login_attempts_rejected_total = Counter(
+    'login_attempts_rejected_total',
+    'Login attempts rejected by throttling before password verification',
+    ['principal', 'reason'],
+    registry=REGISTRY
+)
+
+# Login Activity Metrics (core/login_activity.py)
+login_activity_buffer_size = Gauge(
+    'login_activity_buffer_size',
+    'Principals with logins waiting to be written',
+    multiprocess_mode='livesum',
+    registry=REGISTRY
+)
+
+login_activity_flush_seconds = Histogram(
+    'login_activity_flush_seconds',
+    'Time spent writing one batch of buffered login activity',
+    ['result'],
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+    registry=REGISTRY
+)
+
+# Database Connection Metrics
+db_connection_hold_seconds = Histogram(
+    'db_connection_hold_seconds',
+    'How long a session held a pooled connection (one transaction), by route',
+    ['route'],
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+    registry=REGISTRY
+)
+
+# Read Replica Metrics
+db_read_sessions_total = Counter(
+    'db_read_sessions_total',
+    'Read-only sessions by the database they were routed to',
+    ['target', 'reason'],
+    registry=REGISTRY
+)
+
+db_replica_lag_seconds = Gauge(
+    'db_replica_lag_seconds',
+    'Replication lag of the read replica at the last check',
+    multiprocess_mode='livemax',
+    registry=REGISTRY
+)
+
+# Error Metrics
+http_errors_total = Counter(
+    'http_errors_total',
+    'Total HTTP errors',
+    ['method', 'endpoint', 'error_type'],
+    registry=REGISTRY
+)
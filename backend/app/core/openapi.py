@@ -0,0 +1,105 @@
+"""
+Pre-serialized OpenAPI document.
+
+FastAPI builds the schema on the first request to /openapi.json in every
+worker and re-serializes the dict on every hit after that. With our exception
+handlers and generic `PaginatedResponse[T]` models the first build is slow
+enough to show up as a latency spike right after a deploy.
+
+`OpenAPIDocument` builds the schema once at startup (from lifespan), encodes
+it to JSON bytes, and keeps a gzip variant next to it, each with its own
+strong ETag (the bytes differ, so they must not share one). The route in
+routers/docs.py only picks a variant.
+"""
+import gzip
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import FastAPI
+
+from backend.app.core.logging.config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class SerializedDocument:
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    gzip_etag: str
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip (RFC 9110 12.5.3).
+
+    gzip (or x-gzip) must be listed, or covered by `*`, with a q-value above
+    0; `gzip;q=0` is a refusal. A q-value that does not parse counts as 0.
+    """
+    if not accept_encoding:
+        return False
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+class OpenAPIDocument:
+    """
+    Holds the serialized OpenAPI document for one app.
+    """
+
+    def __init__(self):
+        self._document: Optional[SerializedDocument] = None
+        self._lock = threading.Lock()
+
+    def build(self, app: FastAPI) -> SerializedDocument:
+        """Generate, serialize and compress the schema for `app`."""
+        started = time.perf_counter()
+        if app.root_path and app.root_path_in_servers and not app.servers:
+            # FastAPI adds this per request; root_path is fixed config here
+            app.servers = [{"url": app.root_path}]
+        app.openapi_schema = None
+
+        body = json.dumps(app.openapi(), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        document = SerializedDocument(
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+            etag=f'"{digest}"',
+            gzip_etag=f'"{digest}-gz"',
+        )
+        self._document = document
+        logger.info(
+            f"✅ OpenAPI schema built in {(time.perf_counter() - started) * 1000:.0f}ms "
+            f"({len(body) // 1024} KiB, {len(document.gzip_body) // 1024} KiB gzipped)"
+        )
+        return document
+
+    def get(self, app: FastAPI) -> SerializedDocument:
+        """Return the serialized schema, building it if startup has not already."""
+        document = self._document
+        if document is None:
+            with self._lock:
+                document = self._document or self.build(app)
+        return document
+
+
+openapi_document = OpenAPIDocument()
@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar, List
+from typing import Generic, TypeVar, List, Optional
 from pydantic import BaseModel, Field
 
 T = TypeVar("T")
@@ -45,3 +45,17 @@ class PaginatedResponse(BaseModel, Generic[T]):
             page_size=page_size,
             total_pages=total_pages
         )
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Keyset-paginated response.
+
+    Pass `next_cursor` back as `cursor` to get the following page. There is
+    no total: counting every match is what keyset pagination avoids.
+    """
+    items: List[T] = Field(description="List of items for current page")
+    limit: int = Field(description="Maximum number of items per page")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Opaque cursor for the next page (null on the last page)"
+    )
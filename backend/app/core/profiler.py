@@ -0,0 +1,157 @@
+"""
+Low-overhead sampling profiler for diagnosing a hot worker in place.
+
+A daemon thread wakes every `interval` seconds, snapshots the stack of every
+other thread with `sys._current_frames()` and counts identical stacks. No
+tracing hooks are installed, so the code being profiled runs at full speed;
+the cost is one stack walk per thread per sample.
+
+Results can be rendered as collapsed stacks (`thread;outer;...;inner count`,
+the input format of flamegraph.pl and speedscope) or as speedscope's JSON
+file format. Only one profile runs per process at a time.
+"""
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from backend.app.core.exceptions import ProfilerBusyException
+from backend.app.core.logging.config import get_logger
+
+logger = get_logger(__name__)
+
+Frame = Tuple[str, str, int]  # (function, filename, first line)
+Stack = Tuple[Frame, ...]
+
+MAX_STACK_DEPTH = 128
+
+
+class Profile:
+    """Aggregated samples from one profiling run."""
+
+    def __init__(self, samples: Counter, interval: float, duration: float):
+        self.samples = samples  # {(thread_name, stack): count}
+        self.interval = interval
+        self.duration = duration
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, heaviest stacks first."""
+        lines = []
+        for (thread, stack), count in self.samples.most_common():
+            frames = ";".join(f"{name} ({filename}:{line})" for name, filename, line in stack)
+            lines.append(f"{thread};{frames} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "profile") -> Dict[str, Any]:
+        """Speedscope file format: one sampled profile per thread."""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict[str, Any]] = []
+        by_thread: Dict[str, List[Tuple[List[int], int]]] = {}
+
+        for (thread, stack), count in self.samples.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            by_thread.setdefault(thread, []).append((indices, count))
+
+        profiles = []
+        for thread, stacks in by_thread.items():
+            total = sum(count for _, count in stacks) * self.interval
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": total,
+                "samples": [indices for indices, _ in stacks],
+                "weights": [count * self.interval for _, count in stacks],
+            })
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "adl-backend sampling profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+class SamplingProfiler:
+    """
+    Runs one stack-sampling session at a time for this process.
+    """
+
+    def __init__(self):
+        self._running = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._running.locked()
+
+    @staticmethod
+    def _walk(frame) -> Stack:
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def _sample(self, stop: threading.Event, interval: float, samples: Counter) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not stop.wait(interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident not in names:
+                    # Threads started mid-profile (e.g. the threadpool)
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                samples[(names.get(ident, str(ident)), self._walk(frame))] += 1
+
+    async def run(self, duration: float, interval: float) -> Profile:
+        """
+        Profile every thread of this worker for `duration` seconds.
+
+        The event loop keeps serving requests while the profile runs, so
+        their stacks show up in the result.
+
+        Raises:
+            ProfilerBusyException: If another profile is already running
+        """
+        if not self._running.acquire(blocking=False):
+            raise ProfilerBusyException()
+        try:
+            samples: Counter = Counter()
+            stop = threading.Event()
+            sampler = threading.Thread(
+                target=self._sample, args=(stop, interval, samples), name="sampling-profiler", daemon=True
+            )
+            logger.info(f"Sampling profiler started for {duration:.1f}s at {1 / interval:.0f} Hz")
+            started = time.perf_counter()
+            sampler.start()
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                stop.set()
+                # The sampler exits within one interval
+                await asyncio.to_thread(sampler.join)
+            profile = Profile(samples, interval, time.perf_counter() - started)
+            logger.info(f"Sampling profiler finished: {profile.sample_count} stack samples")
+            return profile
+        finally:
+            self._running.release()
+
+
+sampling_profiler = SamplingProfiler()
@@ -1,29 +1,217 @@
 import bcrypt
+import secrets
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
-from jose import jwt, JWTError
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException, status
+from backend.app.core import tracing
 from backend.app.core.config import settings
 from backend.app.core.exceptions import InvalidTokenException
+from backend.app.core.jwt_codec import JWTError, get_codec
+from backend.app.core.keys import key_ring
+from backend.app.core.metrics import password_hash_duration_seconds
+
+
+# === Password Hashing Policy ===
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+ARGON2ID_PREFIX = "$argon2id$"
+
+
+class PasswordHashPolicy:
+    """
+    Current password hashing scheme and cost.
+
+    Hashes created under an older or cheaper policy keep verifying;
+    `needs_rehash` tells the caller to upgrade them after a successful login.
+    """
+
+    def __init__(
+        self,
+        scheme: str = "bcrypt",
+        bcrypt_rounds: int = 12,
+        argon2_time_cost: int = 3,
+        argon2_memory_cost: int = 65536,
+        argon2_parallelism: int = 4,
+    ):
+        scheme = scheme.lower()
+        if scheme not in ("bcrypt", "argon2id"):
+            raise ValueError(f"Unsupported password hash scheme: {scheme}")
+        if not 4 <= bcrypt_rounds <= 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31")
+        self.scheme = scheme
+        self.bcrypt_rounds = bcrypt_rounds
+        self.argon2_time_cost = argon2_time_cost
+        self.argon2_memory_cost = argon2_memory_cost
+        self.argon2_parallelism = argon2_parallelism
+        self._argon2 = None
+
+    @property
+    def argon2(self):
+        """Lazily build the argon2 hasher (argon2-cffi is an optional dependency)."""
+        if self._argon2 is None:
+            try:
+                from argon2 import PasswordHasher, Type
+            except ImportError:
+                raise RuntimeError("argon2-cffi is required for argon2id password hashes")
+            self._argon2 = PasswordHasher(
+                time_cost=self.argon2_time_cost,
+                memory_cost=self.argon2_memory_cost,
+                parallelism=self.argon2_parallelism,
+                type=Type.ID,
+            )
+        return self._argon2
+
+    def hash(self, password: str) -> str:
+        with tracing.span("password.hash", {"password.scheme": self.scheme}), \
+                password_hash_duration_seconds.labels(operation="hash", scheme=self.scheme).time():
+            if self.scheme == "argon2id":
+                return self.argon2.hash(password)
+            hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.bcrypt_rounds))
+            return hashed.decode('utf-8')
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        if hashed_password.startswith(ARGON2ID_PREFIX):
+            from argon2.exceptions import VerificationError, InvalidHashError
+            with tracing.span("password.verify", {"password.scheme": "argon2id"}), \
+                    password_hash_duration_seconds.labels(operation="verify", scheme="argon2id").time():
+                try:
+                    return self.argon2.verify(hashed_password, password)
+                except (VerificationError, InvalidHashError):
+                    return False
+        with tracing.span("password.verify", {"password.scheme": "bcrypt"}), \
+                password_hash_duration_seconds.labels(operation="verify", scheme="bcrypt").time():
+            return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True if the hash uses another scheme or a lower cost than the current policy."""
+        if self.scheme == "argon2id":
+            if not hashed_password.startswith(ARGON2ID_PREFIX):
+                return True
+            return self.argon2.check_needs_rehash(hashed_password)
+
+        if not hashed_password.startswith(BCRYPT_PREFIXES):
+            return True
+        try:
+            rounds = int(hashed_password[4:6])
+        except ValueError:
+            return True
+        return rounds < self.bcrypt_rounds
+
+
+password_policy = PasswordHashPolicy(
+    scheme=settings.password_hash_scheme,
+    bcrypt_rounds=settings.bcrypt_rounds,
+    argon2_time_cost=settings.argon2_time_cost,
+    argon2_memory_cost=settings.argon2_memory_cost,
+    argon2_parallelism=settings.argon2_parallelism,
+)
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a plaintext password using bcrypt directly.
+    Hash a plaintext password using the configured policy (bcrypt by default).
     """
-    pwd_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(pwd_bytes, salt)
-    return hashed.decode('utf-8')
+    return password_policy.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plaintext password against its hashed version.
+    Accepts both bcrypt and argon2id hashes.
+    """
+    return password_policy.verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
     """
-    pwd_bytes = plain_password.encode('utf-8')
-    hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(pwd_bytes, hashed_bytes)
+    Check whether a stored hash is below the current hashing policy.
+    """
+    return password_policy.needs_rehash(hashed_password)
+
+
+_dummy_hash: Optional[str] = None
+
+
+def dummy_verify_password(plain_password: str) -> None:
+    """
+    Run a full verify against a throwaway hash and discard the result.
+
+    Used when the account does not exist or is inactive, so those logins
+    take as long as a wrong password and usernames cannot be probed by timing.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(secrets.token_urlsafe(16))
+    verify_password(plain_password, _dummy_hash)
+
+
+def verify_password_and_policy(plain_password: str, hashed_password: str) -> Tuple[bool, bool]:
+    """
+    Verify a password and report whether its hash should be upgraded.
+
+    Returns:
+        (valid, needs_rehash) - needs_rehash is only meaningful when valid
+    """
+    if not verify_password(plain_password, hashed_password):
+        return False, False
+    return True, needs_rehash(hashed_password)
+
+
+def _measure_verify_ms(policy: PasswordHashPolicy, samples: int = 3) -> float:
+    hashed = policy.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        policy.verify("calibration-password", hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> Tuple[int, float]:
+    """
+    Find the highest bcrypt cost whose verify time stays within `target_ms`
+    on this machine. Each extra round doubles the cost, so the search stops
+    as soon as the next step would clearly overshoot.
+
+    Returns:
+        (rounds, measured_verify_ms)
+    """
+    best = (min_rounds, _measure_verify_ms(PasswordHashPolicy(bcrypt_rounds=min_rounds)))
+    for rounds in range(min_rounds + 1, max_rounds + 1):
+        if best[1] * 2 > target_ms * 1.5:
+            break
+        elapsed = _measure_verify_ms(PasswordHashPolicy(bcrypt_rounds=rounds))
+        if elapsed > target_ms:
+            break
+        best = (rounds, elapsed)
+    return best
+
+
+def calibrate_argon2_time_cost(
+    target_ms: float,
+    memory_cost: int,
+    parallelism: int,
+    max_time_cost: int = 10,
+) -> Tuple[int, float]:
+    """
+    Find the highest argon2id time cost within `target_ms` for a fixed memory cost.
+
+    Returns:
+        (time_cost, measured_verify_ms)
+    """
+    best = None
+    for time_cost in range(1, max_time_cost + 1):
+        policy = PasswordHashPolicy(
+            scheme="argon2id",
+            argon2_time_cost=time_cost,
+            argon2_memory_cost=memory_cost,
+            argon2_parallelism=parallelism,
+        )
+        elapsed = _measure_verify_ms(policy)
+        if best is not None and elapsed > target_ms:
+            break
+        best = (time_cost, elapsed)
+    return best
 
 
 # === JWT Configuration ===
@@ -35,11 +223,26 @@ ACCESS_TOKEN_EXPIRE_MINUTES: int = settings.access_token_expire_minutes
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT token containing `data` (e.g., user id, role).
+    Signed with the active key from the key ring; asymmetric keys add a `kid` header.
     """
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    key = key_ring.signing_key()
+    headers = {"kid": key.kid} if key.kid else None
+    return get_codec(key.algorithm).encode(to_encode, key.signing_key, key.algorithm, headers)
+
+
+def _decode_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a JWT against the key named by its `kid` header.
+    Raises JWTError or InvalidTokenException on failure.
+    """
+    if key_ring.is_symmetric:
+        key = key_ring.verification_key(None)
+    else:
+        key = key_ring.verification_key(get_codec(key_ring.algorithm).get_unverified_header(token).get("kid"))
+    return get_codec(key.algorithm).decode(token, key.verifying_key, (key.algorithm,))
 
 
 def decode_access_token(token: str) -> Dict[str, Any]:
@@ -47,9 +250,9 @@ def decode_access_token(token: str) -> Dict[str, Any]:
     Decode a JWT token and return the payload.
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         return payload
-    except JWTError:
+    except (JWTError, InvalidTokenException):
         raise InvalidTokenException("Could not validate credentials or token has expired")
 
 
@@ -58,7 +261,7 @@ def validate_refresh_token(token: str) -> Optional[Dict[str, Any]]:
     Validate and decode a refresh token.
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         return payload
-    except JWTError:
+    except (JWTError, InvalidTokenException):
         return None
\ No newline at end of file
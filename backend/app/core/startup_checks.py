@@ -1,45 +1,48 @@
 """
 Startup validation checks to ensure the application is properly configured
+
+Checks are async and run concurrently, each with its own timeout:
+
+- Required checks (database) run during lifespan startup. Their outcome
+  drives the readiness state served at `/ready`; if any fail, they keep
+  being retried in the background until they pass.
+- Optional checks (env vars, security config, SMTP) run in the background
+  once the app is serving and only log a warning, so a slow mail server
+  never delays startup and a config issue never leaves /ready at 503.
 """
+import asyncio
 import os
 import logging
-import smtplib
-from typing import Dict, Tuple
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
 
 from sqlalchemy import text
 
 from backend.app.core.config import settings
+from backend.app.core.keys import ASYMMETRIC_ALGORITHMS
 from backend.app.db.session import engine
 
 logger = logging.getLogger(__name__)
 
+CheckResult = Tuple[bool, str]
 
-def check_database_connection() -> Tuple[bool, str]:
+
+async def check_database_connection() -> CheckResult:
     """
     Check if database connection is working.
+    Uses the application's async engine, so it also warms its pool.
     Returns: (success: bool, message: str)
     """
     try:
-        # Use sync connection for startup check
-        from sqlalchemy import create_engine
-        
-        # Create sync engine from async URL
-        sync_url = settings.database_url.replace('+asyncpg', '')
-        sync_engine = create_engine(sync_url)
-        
-        with sync_engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
-            result.fetchone()
-        
-        sync_engine.dispose()
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return True, "Database connection successful"
     except Exception as e:
         return False, f"Database connection failed: {str(e)}"
 
 
-def check_required_env_vars() -> Tuple[bool, str]:
+async def check_required_env_vars() -> CheckResult:
     """
     Check if all required environment variables are set.
     Returns: (success: bool, message: str)
@@ -48,53 +51,53 @@ def check_required_env_vars() -> Tuple[bool, str]:
         "DATABASE_URL": settings.database_url,
         "SECRET_KEY": settings.secret_key,
     }
-    
+
     missing_vars = [k for k, v in required_vars.items() if not v]
-    
+
     if missing_vars:
         return False, f"Missing required environment variables: {', '.join(missing_vars)}"
-    
+
     return True, "All required environment variables are set"
 
 
-def check_security_configuration() -> Tuple[bool, str]:
+async def check_security_configuration() -> CheckResult:
     """
     Check if security settings are properly configured.
     Returns: (success: bool, message: str)
     """
     issues = []
-    
-    # Check secret key length
-    if len(settings.secret_key) < 32:
+
+    # Check secret key length (only HS* signs with it; RS*/ES* use JWT_KEYS_DIR)
+    if settings.algorithm not in ASYMMETRIC_ALGORITHMS and len(settings.secret_key) < 32:
         issues.append("SECRET_KEY should be at least 32 characters long")
-    
+
     # Check token expiry
     if settings.access_token_expire_minutes < 1:
         issues.append("ACCESS_TOKEN_EXPIRE_MINUTES must be positive")
-    
+
     if settings.refresh_token_expire_days < 1:
         issues.append("REFRESH_TOKEN_EXPIRE_DAYS must be positive")
-    
+
     if issues:
         return False, "; ".join(issues)
-    
+
     return True, "Security configuration is valid"
 
 
-def check_email_configuration() -> Tuple[bool, str]:
+async def check_email_configuration() -> CheckResult:
     """
     Check if email configuration is valid.
-    Tests SMTP connection without sending emails.
+    Tests SMTP connection (async, via aiosmtplib) without sending emails.
     Skips actual SMTP connection in test environment.
     """
     # Skip SMTP connection test in test environment
     if os.getenv("ENVIRONMENT") == "test":
         logger.info("Skipping SMTP connection test in test environment")
         return True, "Email check skipped in test environment"
-    
+
     if not settings.smtp_host:
         return True, "Email configuration not set (optional)"
-    
+
     required_email_vars = {
         "SMTP_HOST": settings.smtp_host,
         "SMTP_PORT": settings.smtp_port,
@@ -102,78 +105,157 @@ def check_email_configuration() -> Tuple[bool, str]:
         "SMTP_PASSWORD": settings.smtp_password,
         "SMTP_FROM_EMAIL": settings.smtp_from_email,
     }
-    
+
     missing_vars = [k for k, v in required_email_vars.items() if not v]
     if missing_vars:
         return False, f"Incomplete email configuration. Missing: {', '.join(missing_vars)}"
-    
+
     # Test SMTP connection
+    import aiosmtplib
+
     try:
-        smtp_password = (
-            settings.smtp_password.get_secret_value() 
-            if hasattr(settings.smtp_password, 'get_secret_value') 
-            else settings.smtp_password
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            use_tls=settings.smtp_use_ssl,
+            start_tls=settings.smtp_use_tls and not settings.smtp_use_ssl,
+            timeout=settings.startup_check_timeout_seconds,
         )
-        
-        if settings.smtp_use_tls:
-            server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=5)
-            server.starttls()
-        else:
-            server = smtplib.SMTP_SSL(settings.smtp_host, settings.smtp_port, timeout=5)
-        
-        server.login(settings.smtp_user, smtp_password)
-        server.quit()
-        
-    except smtplib.SMTPAuthenticationError:
+        await smtp.connect()
+        await smtp.login(settings.smtp_user, settings.get_smtp_password())
+        await smtp.quit()
+
+    except aiosmtplib.SMTPAuthenticationError:
         return False, "SMTP authentication failed. Check SMTP_USER and SMTP_PASSWORD"
     except Exception as e:
         # Don't fail startup on email issues - log warning instead
         logger.warning(f"Email configuration test failed: {str(e)}")
         return True, f"Email configured but connection test failed: {str(e)}"
-    
+
     return True, "Email configuration is valid and SMTP connection successful"
 
 
-async def perform_startup_checks(fail_fast: bool = False) -> Dict[str, Tuple[bool, str]]:
+# ============================================================================
+# Check registry and readiness state
+# ============================================================================
+
+@dataclass(frozen=True)
+class StartupCheck:
+    """A named check and whether the app may serve traffic without it."""
+    name: str
+    func: Callable[[], Awaitable[CheckResult]]
+    required: bool = True
+
+
+STARTUP_CHECKS = [
+    # Config only: a retry cannot change the result, so they warn once
+    # instead of holding /ready (and the container healthcheck) at 503
+    StartupCheck("Environment Variables", check_required_env_vars, required=False),
+    StartupCheck("Security Configuration", check_security_configuration, required=False),
+    StartupCheck("Database Connection", check_database_connection),
+    StartupCheck("Email Configuration", check_email_configuration, required=False),
+]
+
+
+@dataclass
+class ReadinessState:
+    """Latest result of every check; the app is ready once all required checks pass."""
+    results: Dict[str, CheckResult] = field(default_factory=dict)
+    required: Set[str] = field(default_factory=set)
+    ready: bool = False
+    checked_at: Optional[float] = None
+
+    def record(self, check: StartupCheck, result: CheckResult) -> None:
+        self.results[check.name] = result
+        if check.required:
+            self.required.add(check.name)
+        self.ready = all(self.results.get(name, (False, ""))[0] for name in self.required)
+        self.checked_at = time.time()
+
+
+readiness = ReadinessState()
+_background_tasks: Set[asyncio.Task] = set()
+
+
+async def run_check(check: StartupCheck, timeout: Optional[float] = None) -> CheckResult:
+    """Run one check with a timeout; exceptions and timeouts become failures."""
+    timeout = timeout or settings.startup_check_timeout_seconds
+    try:
+        result = await asyncio.wait_for(check.func(), timeout=timeout)
+    except asyncio.TimeoutError:
+        result = (False, f"Timed out after {timeout:.1f}s")
+    except Exception as e:
+        result = (False, f"Check raised {type(e).__name__}: {str(e)}")
+
+    readiness.record(check, result)
+    status_icon = "✅" if result[0] else ("❌" if check.required else "⚠️ ")
+    logger.info(f"{status_icon} {check.name}: {result[1]}")
+    return result
+
+
+def _spawn(coro: Awaitable) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _retry_until_ready(checks: list) -> None:
+    """Re-run failed required checks until they all pass."""
+    pending = list(checks)
+    while pending:
+        await asyncio.sleep(settings.startup_check_retry_seconds)
+        results = await asyncio.gather(*(run_check(check) for check in pending))
+        pending = [check for check, (success, _) in zip(pending, results) if not success]
+    logger.info("✅ All required startup checks now pass - application is ready")
+
+
+async def perform_startup_checks(fail_fast: bool = False) -> Dict[str, CheckResult]:
     """
-    Perform all startup checks.
-    
+    Perform all required startup checks concurrently and schedule the optional ones.
+
     Args:
-        fail_fast: If True, raise exception on first failure. 
-                  If False, continue and log all issues.
-    
+        fail_fast: If True, raise exception if any required check fails.
+                  If False, log issues and keep retrying them in the background
+                  (the app reports not-ready on /ready until they pass).
+
     Returns:
-        Dict of check results: {check_name: (success, message)}
+        Dict of required check results: {check_name: (success, message)}
     """
     logger.info("=" * 80)
     logger.info("🚀 PERFORMING STARTUP CHECKS")
     logger.info("=" * 80)
-    
-    checks = {
-        "Environment Variables": check_required_env_vars(),
-        "Security Configuration": check_security_configuration(),
-        "Database Connection": check_database_connection(),
-        "Email Configuration": check_email_configuration(),
-    }
-    
-    all_passed = True
-    
-    for check_name, (success, message) in checks.items():
-        status_icon = "✅" if success else "❌"
-        logger.info(f"{status_icon} {check_name}: {message}")
-        
-        if not success:
-            all_passed = False
-            if fail_fast:
-                raise RuntimeError(f"Startup check failed: {check_name} - {message}")
-    
+
+    required = [check for check in STARTUP_CHECKS if check.required]
+    optional = [check for check in STARTUP_CHECKS if not check.required]
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_check(check) for check in required))
+    checks = {check.name: result for check, result in zip(required, results)}
+    failed = [check for check, (success, _) in zip(required, results) if not success]
+
+    if failed and fail_fast:
+        first = failed[0]
+        raise RuntimeError(f"Startup check failed: {first.name} - {checks[first.name][1]}")
+
+    for check in optional:
+        _spawn(run_check(check))
+
     logger.info("=" * 80)
-    
-    if all_passed:
-        logger.info("✅ ALL STARTUP CHECKS PASSED - Application ready!")
+
+    if not failed:
+        logger.info(f"✅ ALL STARTUP CHECKS PASSED in {time.perf_counter() - started:.2f}s - Application ready!")
     else:
-        logger.warning("⚠️  SOME STARTUP CHECKS FAILED - Application may not work correctly")
-    
+        logger.warning("⚠️  SOME STARTUP CHECKS FAILED - /ready reports not ready until they pass")
+        _spawn(_retry_until_ready(failed))
+
     logger.info("=" * 80)
-    
+
     return checks
+
+
+async def stop_background_checks() -> None:
+    """Cancel optional checks and retries still running at shutdown."""
+    for task in list(_background_tasks):
+        task.cancel()
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
@@ -0,0 +1,203 @@
+"""
+Request tracing with OpenTelemetry.
+
+Spans cover the whole middleware chain (one SERVER span per request, from
+middleware/tracing.py), `get_session`, every SQL statement, password hashing
+and SMTP sends. Each server span carries the request ID as `request.id`, so
+a trace can be found from a log line and vice versa.
+
+Sampling is decided once per trace at the server span (head-based):
+`ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATIO))`, so an inbound
+`traceparent` from a sampled caller is always honoured. Child spans are only
+started inside a sampled request; for unsampled requests they cost one
+ContextVar lookup. Sampled spans are batched and exported over OTLP/HTTP to
+`OTEL_EXPORTER_OTLP_ENDPOINT` (a local collector listens on :4318).
+
+opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http are optional
+dependencies; without them tracing stays off and every helper is a no-op.
+"""
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from backend.app.core.config import settings
+from backend.app.core.logging.config import get_logger
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.propagate import extract
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover - optional dependency
+    trace = None
+
+logger = get_logger(__name__)
+
+_NOOP = nullcontext()
+# Set inside a sampled server span; far cheaper to check than the current span
+_in_sampled_trace: ContextVar[bool] = ContextVar("in_sampled_trace", default=False)
+_tracer = None
+_provider = None
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def configure_tracing(exporter=None, sample_ratio: Optional[float] = None) -> bool:
+    """
+    Set up the tracer provider, sampler and batch exporter.
+
+    Args:
+        exporter: Span exporter to use instead of OTLP/HTTP (tests use an in-memory one)
+        sample_ratio: Overrides `settings.tracing_sample_ratio`
+
+    Returns:
+        bool: True if tracing is active
+    """
+    global _tracer, _provider
+    if _provider is not None:
+        return True
+    if trace is None:
+        logger.warning("⚠️  Tracing requested but opentelemetry-sdk is not installed; tracing disabled")
+        return False
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    if sample_ratio is None:
+        sample_ratio = settings.tracing_sample_ratio
+    if exporter is None:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("⚠️  opentelemetry-exporter-otlp-proto-http is not installed; tracing disabled")
+            return False
+        exporter = OTLPSpanExporter(endpoint=f"{settings.otel_exporter_otlp_endpoint.rstrip('/')}/v1/traces")
+
+    _provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": settings.otel_service_name,
+            "service.version": settings.version,
+            "deployment.environment": settings.environment,
+        }),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = _provider.get_tracer(__name__, settings.version)
+
+    # The replica too: read-only handlers run most of their SQL there
+    from backend.app.db.session import engine, read_engine
+    for target in (engine, read_engine):
+        if target is not None:
+            instrument_engine(target.sync_engine)
+
+    logger.info(
+        f"🔭 Tracing enabled: sampling {sample_ratio:.1%} of traces, "
+        f"exporting to {settings.otel_exporter_otlp_endpoint}"
+    )
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush buffered spans and stop the exporter (call from lifespan shutdown)."""
+    global _tracer, _provider
+    if _provider is None:
+        return
+    _tracer = None
+    _provider.shutdown()
+    _provider = None
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """
+    Context manager for a child span of the current request.
+
+    A no-op unless the current span is sampled, so it can wrap hot code.
+    """
+    if _tracer is None or not _in_sampled_trace.get():
+        return _NOOP
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, client: bool = False):
+    """
+    Start a child span without making it current; the caller must `end()` it.
+
+    Returns None unless the current span is sampled. Used where the span
+    outlives the current call frame (a session, a cursor execution).
+    """
+    if _tracer is None or not _in_sampled_trace.get():
+        return None
+    kind = SpanKind.CLIENT if client else SpanKind.INTERNAL
+    return _tracer.start_span(name, attributes=attributes, kind=kind)
+
+
+def end_span(span_, error: Optional[BaseException] = None) -> None:
+    """End a span from `start_span`, recording `error` if given."""
+    if span_ is None:
+        return
+    if error is not None:
+        span_.record_exception(error)
+        span_.set_status(Status(StatusCode.ERROR, type(error).__name__))
+    span_.end()
+
+
+@contextmanager
+def server_span(name: str, headers: Dict[str, str], attributes: Dict[str, Any]) -> Iterator[Any]:
+    """
+    Root span for one inbound request, continuing an inbound `traceparent`.
+
+    Yields None when tracing is off; otherwise the span (which may be
+    non-recording if the sampler dropped the trace).
+    """
+    if _tracer is None:
+        yield None
+        return
+    # Most requests carry no trace context; skip the propagators for them
+    parent = extract(headers) if "traceparent" in headers else None
+    current = _tracer.start_span(name, context=parent, kind=SpanKind.SERVER, attributes=attributes)
+    if not current.is_recording():
+        # Dropped by the sampler: nothing below this request will be traced
+        yield current
+        return
+
+    token = _in_sampled_trace.set(True)
+    try:
+        with trace.use_span(current, end_on_exit=True, record_exception=True):
+            yield current
+    finally:
+        _in_sampled_trace.reset(token)
+
+
+# === SQLAlchemy instrumentation ===
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    context._trace_span = start_span(
+        "db.query",
+        {"db.system": conn.dialect.name, "db.statement": statement},
+        client=True,
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    end_span(getattr(context, "_trace_span", None))
+
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    end_span(getattr(context, "_trace_span", None), exception_context.original_exception)
+
+
+def instrument_engine(sync_engine) -> None:
+    """Trace every statement run on `sync_engine` (idempotent)."""
+    from sqlalchemy import event
+
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
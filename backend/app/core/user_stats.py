@@ -0,0 +1,132 @@
+"""
+Background collector for the registered/active user gauges.
+
+Counting users on every Prometheus scrape would put a `COUNT(*)` on the
+database every 15s from every worker. Instead one task per worker recomputes
+the totals every `user_stats_refresh_seconds`, and registration nudges the
+gauges between refreshes (`user_registered`), so they stay close to real
+time without extra queries.
+
+On PostgreSQL, once the table is larger than `user_stats_exact_count_max`
+rows, the totals come from planner statistics (`pg_class.reltuples` and the
+`pg_stats` frequency of `is_active`) instead of a full count.
+"""
+import asyncio
+import random
+from typing import Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.core.config import settings
+from backend.app.core.logging.config import get_logger
+from backend.app.db.session import async_session_maker
+from backend.app.models.user import User
+from backend.app.core.metrics import active_users_gauge, registered_users_gauge
+
+logger = get_logger(__name__)
+
+
+async def _estimate_counts(session: AsyncSession) -> Optional[Tuple[int, int]]:
+    """
+    Planner estimates of (registered, active) users, or None when unavailable.
+    """
+    registered = (await session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": User.__tablename__},
+    )).scalar_one_or_none()
+    if registered is None or registered < 0:
+        # Never analyzed
+        return None
+
+    row = (await session.execute(
+        text(
+            "SELECT most_common_vals::text::text[], most_common_freqs FROM pg_stats "
+            "WHERE tablename = :table AND attname = 'is_active'"
+        ),
+        {"table": User.__tablename__},
+    )).first()
+    if row is None or row[0] is None:
+        return None
+
+    frequencies = dict(zip(row[0], row[1]))
+    active = round(registered * frequencies.get("true", frequencies.get("t", 0.0)))
+    return int(registered), int(active)
+
+
+async def count_users(session: AsyncSession) -> Tuple[int, int, bool]:
+    """
+    Count registered and active users.
+
+    Returns:
+        (registered, active, estimated)
+    """
+    if session.bind.dialect.name == "postgresql":
+        estimate = await _estimate_counts(session)
+        if estimate is not None and estimate[0] > settings.user_stats_exact_count_max:
+            return estimate[0], estimate[1], True
+
+    registered, active = (await session.execute(
+        select(func.count(), func.count().filter(User.is_active.is_(True))).select_from(User)
+    )).one()
+    return registered, active, False
+
+
+class UserStatsCollector:
+    """
+    Periodically refreshes the user gauges from the database.
+    """
+
+    def __init__(self, interval: float = 60.0, jitter: float = 0.1):
+        self.interval = interval
+        self.jitter = jitter
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self, session: AsyncSession) -> Tuple[int, int, bool]:
+        """Recompute the totals and set the gauges."""
+        registered, active, estimated = await count_users(session)
+        registered_users_gauge.set(registered)
+        active_users_gauge.set(active)
+        logger.debug(
+            f"User gauges refreshed - registered: {registered}, active: {active}"
+            f"{' (estimated)' if estimated else ''}"
+        )
+        return registered, active, estimated
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with async_session_maker() as session:
+                    await self.refresh(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"User stats refresh failed: {str(e)}")
+            delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+            await asyncio.sleep(max(delay, 1.0))
+
+    def start(self) -> None:
+        """Start the background collector (call from lifespan startup)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background collector (call from lifespan shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+user_stats_collector = UserStatsCollector(interval=settings.user_stats_refresh_seconds)
+
+
+# ============================================================================
+# Incremental updates between refreshes
+# ============================================================================
+
+def user_registered(is_active: bool = True) -> None:
+    """Call after a user row is committed."""
+    registered_users_gauge.inc()
+    if is_active:
+        active_users_gauge.inc()
@@ -0,0 +1,109 @@
+"""
+Hot-path statements, built once at import.
+
+Building `select(User).where(User.id == user_id)` costs tens of
+microseconds per call, on every request, before execute() even computes
+the cache key that finds its compiled SQL. Statements built once with named
+bind parameters skip the construction; only the cache key lookup is left:
+
+    result = await session.execute(USER_BY_ID, {"id": user_id})
+
+On PostgreSQL the asyncpg driver also keeps each connection's prepared
+form of these statements (DB_PREPARED_STATEMENT_CACHE_SIZE), so they are
+parsed and planned server-side once per connection.
+
+benchmarks/bench_hot_paths.py compares them with ad-hoc construction.
+"""
+from typing import Optional, Type, Union
+
+from sqlalchemy import Integer, Select, String, any_, bindparam, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import select
+
+from backend.app.models.admin import Admin
+from backend.app.models.user import User
+
+# === Principals by ID (core/deps.py, every authenticated request) ===
+USER_BY_ID = select(User).where(User.id == bindparam("id"))
+ADMIN_BY_ID = select(Admin).where(Admin.id == bindparam("id"))
+# PostgreSQL: one array parameter per list, so the SQL (and asyncpg's
+# prepared statement) is the same whatever the number of keys
+_IDS = any_(bindparam("ids", type_=ARRAY(Integer)))
+_USERNAMES = any_(bindparam("usernames", type_=ARRAY(String)))
+USERS_BY_IDS = select(User).where(User.id == _IDS)
+ADMINS_BY_IDS = select(Admin).where(Admin.id == _IDS)
+USERS_BY_IDS_OR_USERNAMES = select(User).where((User.id == _IDS) | (User.username == _USERNAMES))
+# Other databases (SQLite in development and tests) have no arrays
+_USERS_BY_IDS_EXPANDING = select(User).where(User.id.in_(bindparam("ids", expanding=True)))
+_ADMINS_BY_IDS_EXPANDING = select(Admin).where(Admin.id.in_(bindparam("ids", expanding=True)))
+_USERS_BY_IDS_OR_USERNAMES_EXPANDING = select(User).where(
+    User.id.in_(bindparam("ids", expanding=True)) | User.username.in_(bindparam("usernames", expanding=True))
+)
+
+# === Logins, registration and profile updates ===
+USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+USER_BY_USERNAME_OR_EMAIL = select(User).where(
+    (User.username == bindparam("username")) | (User.email == bindparam("email"))
+)
+ADMIN_BY_USERNAME = select(Admin).where(Admin.username == bindparam("username"))
+ADMIN_BY_EMAIL = select(Admin).where(Admin.email == bindparam("email"))
+ADMIN_BY_USERNAME_OR_EMAIL = select(Admin).where(
+    (Admin.username == bindparam("username")) | (Admin.email == bindparam("email"))
+)
+
+# === User list totals ===
+_USER_COUNT = select(func.count()).select_from(User)
+_USER_COUNT_BY_STATUS = _USER_COUNT.where(User.is_active == bindparam("is_active"))
+# Count plus latest change, for the admin list's ETag
+_USER_LIST_STATS = select(func.count(), func.max(User.updated_at)).select_from(User)
+_USER_LIST_STATS_BY_STATUS = _USER_LIST_STATS.where(User.is_active == bindparam("is_active"))
+
+
+def user_count(is_active: Optional[bool] = None, with_last_update: bool = False) -> Select:
+    """
+    Prebuilt count of users, filtered on `is_active` when it is not None.
+
+    Execute with `{"is_active": is_active}`. With `with_last_update`, the
+    row also carries max(updated_at).
+    """
+    if with_last_update:
+        return _USER_LIST_STATS if is_active is None else _USER_LIST_STATS_BY_STATUS
+    return _USER_COUNT if is_active is None else _USER_COUNT_BY_STATUS
+
+
+def principals_by_ids(model: Type[Union[User, Admin]], dialect: str) -> Select:
+    """
+    Prebuilt select of users or admins by ID, for `dialect`
+    (`session.bind.dialect.name`).
+
+    Execute with `{"ids": [...]}`.
+    """
+    if dialect == "postgresql":
+        return ADMINS_BY_IDS if model is Admin else USERS_BY_IDS
+    return _ADMINS_BY_IDS_EXPANDING if model is Admin else _USERS_BY_IDS_EXPANDING
+
+
+def users_by_ids_or_usernames(dialect: str) -> Select:
+    """
+    Prebuilt select of users matching any of a list of IDs or usernames, for
+    `dialect` (`session.bind.dialect.name`).
+
+    Execute with `{"ids": [...], "usernames": [...]}`; either list may be empty.
+    """
+    if dialect == "postgresql":
+        return USERS_BY_IDS_OR_USERNAMES
+    return _USERS_BY_IDS_OR_USERNAMES_EXPANDING
+
+
+# Run once on every pooled connection at startup (db/session.py)
+PRIMING_STATEMENTS = [
+    (USER_BY_ID, {"id": 0}),
+    (ADMIN_BY_ID, {"id": 0}),
+    (USER_BY_USERNAME, {"username": ""}),
+    (USER_BY_USERNAME_OR_EMAIL, {"username": "", "email": ""}),
+    (ADMIN_BY_EMAIL, {"email": ""}),
+    (ADMIN_BY_USERNAME, {"username": ""}),
+    (user_count(), {}),
+    (user_count(True, with_last_update=True), {"is_active": True}),
+]
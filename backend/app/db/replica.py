@@ -0,0 +1,188 @@
+"""
+Read-replica routing.
+
+Read-only handlers take `get_read_session` (db/session.py), which asks the
+`ReplicaRouter` where to read from. A read goes to the replica unless:
+
+- No replica is configured (`DATABASE_READ_URL` unset).
+- The caller wrote through the primary within the last
+  `read_your_writes_seconds` (read-your-writes). Writes pin the principal
+  named in the request's bearer token.
+- The replica's lag is over `replica_max_lag_seconds`, or it could not be
+  measured. Lag is measured at most every `replica_lag_check_seconds` per
+  worker, so routing a read costs no extra query.
+
+Pins live in process memory, like the other per-worker caches. A principal
+whose next request lands on another worker can read from the replica
+within the pin window, but only while that replica is within
+`replica_max_lag_seconds` of the primary.
+"""
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import text
+from starlette.requests import Request
+
+from backend.app.core.jwt_codec import JWTError, get_unverified_claims
+from backend.app.core.logging.config import get_logger
+from backend.app.core.metrics import db_read_sessions_total, db_replica_lag_seconds
+
+logger = get_logger(__name__)
+
+# Seconds since the last replayed transaction, or 0 when the replica has
+# replayed everything it received (an idle primary is not lag)
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+# How many pins to keep before sweeping out the expired ones
+_PIN_SWEEP_SIZE = 10_000
+
+
+def request_principal(request: Optional[Request]) -> Optional[Tuple[Any, Any]]:
+    """
+    (role, id) from the request's bearer token, without verifying it.
+
+    Used only to pick a database: a forged token at worst sends its own
+    reads to the primary, and is rejected by authentication regardless.
+    """
+    if request is None:
+        return None
+    authorization = request.headers.get("Authorization", "")
+    if not authorization.startswith("Bearer "):
+        return None
+    try:
+        claims = get_unverified_claims(authorization[7:].strip())
+    except JWTError:
+        return None
+    role, principal_id = claims.get("role"), claims.get("id")
+    # Unverified claims can be anything; a list would not even be hashable
+    if not isinstance(role, str) or not isinstance(principal_id, (int, str)):
+        return None
+    return role, principal_id
+
+
+class ReplicaRouter:
+    """
+    Picks the primary or replica session factory for each read-only session.
+    """
+
+    def __init__(
+        self,
+        primary_session_maker,
+        replica_session_maker=None,
+        max_lag_seconds: float = 5.0,
+        lag_check_seconds: float = 2.0,
+        pin_seconds: float = 5.0,
+    ):
+        self.primary = primary_session_maker
+        self.replica = replica_session_maker
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        # A pin shorter than the tolerated lag would let a reader miss its own write
+        self.pin_seconds = max(pin_seconds, max_lag_seconds)
+        self._pins: Dict[Hashable, float] = {}
+        self._lag: Optional[float] = None
+        self._lag_checked_at = float("-inf")
+        self._checking = False
+
+    @property
+    def configured(self) -> bool:
+        return self.replica is not None
+
+    # ----------------------------------------------------------------------
+    # Read-your-writes
+    # ----------------------------------------------------------------------
+
+    def pin(self, principal: Optional[Hashable]) -> None:
+        """Send `principal`'s reads to the primary for the next `pin_seconds`."""
+        if principal is None or not self.configured:
+            return
+        now = time.monotonic()
+        if len(self._pins) >= _PIN_SWEEP_SIZE:
+            self._pins = {key: until for key, until in self._pins.items() if until > now}
+        self._pins[principal] = now + self.pin_seconds
+
+    def is_pinned(self, principal: Optional[Hashable]) -> bool:
+        if principal is None:
+            return False
+        until = self._pins.get(principal)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self._pins[principal]
+            return False
+        return True
+
+    # ----------------------------------------------------------------------
+    # Lag
+    # ----------------------------------------------------------------------
+
+    async def measure_lag(self) -> float:
+        """Query the replica for its lag in seconds."""
+        async with self.replica() as session:
+            if session.bind.dialect.name != "postgresql":
+                # SQLite pairs in tests, or a non-replicated copy
+                await session.execute(text("SELECT 1"))
+                return 0.0
+            return float((await session.execute(POSTGRES_LAG_QUERY)).scalar_one())
+
+    async def replica_lag(self) -> Optional[float]:
+        """
+        Replica lag from the last check, re-measured once it is stale.
+
+        Returns None if the replica could not be reached. While one request
+        re-measures, concurrent ones use the previous value.
+        """
+        if self._checking or time.monotonic() - self._lag_checked_at < self.lag_check_seconds:
+            return self._lag
+        self._checking = True
+        previous = self._lag
+        try:
+            self._lag = await self.measure_lag()
+            db_replica_lag_seconds.set(self._lag)
+        except Exception as e:
+            self._lag = None
+            if previous is not None:
+                logger.warning(f"⚠️  Read replica unreachable, reading from the primary: {e}")
+        finally:
+            self._lag_checked_at = time.monotonic()
+            self._checking = False
+
+        if previous is not None and self._lag is not None:
+            if previous <= self.max_lag_seconds < self._lag:
+                logger.warning(f"⚠️  Read replica lagging {self._lag:.1f}s, reading from the primary")
+            elif self._lag <= self.max_lag_seconds < previous:
+                logger.info(f"✅ Read replica caught up ({self._lag:.1f}s behind)")
+        return self._lag
+
+    # ----------------------------------------------------------------------
+    # Routing
+    # ----------------------------------------------------------------------
+
+    async def session_maker_for(self, principal: Optional[Hashable] = None):
+        """Session factory for one read-only session on behalf of `principal`."""
+        if not self.configured:
+            return self.primary
+        if self.is_pinned(principal):
+            db_read_sessions_total.labels(target="primary", reason="read_your_writes").inc()
+            return self.primary
+        lag = await self.replica_lag()
+        if lag is None or lag > self.max_lag_seconds:
+            reason = "replica_down" if lag is None else "replica_lag"
+            db_read_sessions_total.labels(target="primary", reason=reason).inc()
+            return self.primary
+        db_read_sessions_total.labels(target="replica", reason="ok").inc()
+        return self.replica
+
+    def status(self) -> Dict[str, Any]:
+        """Routing state for /health (no I/O)."""
+        return {
+            "configured": self.configured,
+            "lag_seconds": None if self._lag is None else round(self._lag, 3),
+            "serving_reads": self.configured and self._lag is not None and self._lag <= self.max_lag_seconds,
+        }
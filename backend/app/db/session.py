@@ -1,16 +1,38 @@
-from typing import AsyncGenerator
+import asyncio
+import time
+from typing import AsyncGenerator, List
 
+from fastapi import Request
 from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from backend.app.core.config import settings
+from backend.app.core import tracing
+from backend.app.db.replica import ReplicaRouter, request_principal
+from backend.app.core.logging.config import get_logger
+from backend.app.core.metrics import db_connection_hold_seconds
+
+logger = get_logger(__name__)
+
+
+def _engine_options(url: str) -> dict:
+    """Pool sizing and asyncpg's per-connection prepared statement cache."""
+    if not url.startswith("postgresql"):
+        return {}
+    options = {"pool_size": settings.db_pool_size, "max_overflow": settings.db_max_overflow}
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"prepared_statement_cache_size": settings.db_prepared_statement_cache_size}
+    return options
+
 
 # --- Async Engine ---
 engine = create_async_engine(
     settings.database_url,
     echo=True,   # 🔹 Set False in production
     future=True,
+    **_engine_options(settings.database_url),
 )
 
 # --- Async Session Maker ---
@@ -20,14 +42,189 @@ async_session_maker = sessionmaker(
     expire_on_commit=False,
 )
 
-# --- Dependency for FastAPI routes ---
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+# --- Read replica (optional) ---
+read_engine = (
+    create_async_engine(
+        settings.database_read_url, echo=False, future=True, **_engine_options(settings.database_read_url)
+    )
+    if settings.database_read_url
+    else None
+)
+
+read_session_maker = (
+    sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+
+replica_router = ReplicaRouter(
+    async_session_maker,
+    read_session_maker,
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    lag_check_seconds=settings.replica_lag_check_seconds,
+    pin_seconds=settings.read_your_writes_seconds,
+)
+
+
+# Mark sessions that wrote, so get_session can pin the writer to the primary
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session, flush_context) -> None:
+    session.info["wrote"] = session.info["transaction_wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        info = orm_execute_state.session.info
+        info["wrote"] = info["transaction_wrote"] = True
+
+
+# Time each transaction, i.e. how long the session held a pooled connection:
+# it checks one out on its first statement and returns it when the
+# transaction ends (commit, rollback or close)
+@event.listens_for(Session, "after_begin")
+def _connection_checked_out(session, transaction, connection) -> None:
+    session.info["connection_held_since"] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _connection_released(session, transaction) -> None:
+    if transaction.parent is not None:
+        return
+    session.info.pop("transaction_wrote", None)
+    held_since = session.info.pop("connection_held_since", None)
+    if held_since is not None:
+        db_connection_hold_seconds.labels(route=session.info.get("route", "background")).observe(
+            time.perf_counter() - held_since
+        )
+
+
+def _route_of(request: Request) -> str:
+    route = request.scope.get("route")
+    return route.path if route is not None else request.scope.get("path", "unknown")
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    Return the session's connection to the pool before slow non-database work
+    (password hashing, outbound calls).
+
+    Ends the current transaction if it has only read. Loaded objects stay
+    usable (expire_on_commit=False) and the next statement checks out a
+    connection again. A transaction that has written is left open.
+    """
+    if session.in_transaction() and not session.info.get("transaction_wrote") and not (
+        session.new or session.dirty or session.deleted
+    ):
+        await session.commit()
+
+
+# --- Dependencies for FastAPI routes ---
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
-    Async generator for database sessions.
+    Async generator for database sessions on the primary.
     Use in FastAPI with: Depends(get_session)
+
+    The session is lazy: it checks out a connection on its first statement,
+    not here, and returns it when the transaction commits or the request
+    ends. Call `release_connection` before slow work between queries.
+    Connection hold time is recorded per route.
+
+    If the request wrote anything, its principal reads from the primary
+    for the next READ_YOUR_WRITES_SECONDS (see get_read_session).
+    """
+    session_span = tracing.start_span("db.session")
+    try:
+        async with async_session_maker(info={"route": _route_of(request)}) as session:
+            yield session
+            if session.info.get("wrote"):
+                replica_router.pin(request_principal(request))
+    finally:
+        tracing.end_span(session_span)
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
-    async with async_session_maker() as session:
-        yield session
+    Async generator for sessions that only read.
+    Use in FastAPI with: Depends(get_read_session)
+
+    Served by the read replica when DATABASE_READ_URL is set and the
+    replica is caught up, otherwise by the primary (see db/replica.py).
+    Never write through this session.
+    """
+    session_maker = await replica_router.session_maker_for(request_principal(request))
+    session_span = tracing.start_span("db.session", {"db.replica": session_maker is not async_session_maker})
+    try:
+        async with session_maker(info={"route": _route_of(request)}) as session:
+            yield session
+    finally:
+        tracing.end_span(session_span)
+
+# --- Pool lifecycle (lifespan) ---
+async def _open_primed_connection(target: AsyncEngine) -> AsyncConnection:
+    from backend.app.db.queries import PRIMING_STATEMENTS
+
+    connection = await target.connect()
+    try:
+        # Runs the driver's type introspection, and on asyncpg leaves each
+        # hot statement prepared on this connection
+        for statement, params in PRIMING_STATEMENTS:
+            await connection.execute(statement, params)
+        await connection.rollback()
+    except BaseException:
+        await connection.close()
+        raise
+    return connection
+
+
+async def prewarm_engine(target: AsyncEngine) -> int:
+    """
+    Open the engine's `pool_size` connections in parallel and prime them.
+
+    All connections are held until every one is open, so the pool ends up
+    with `pool_size` distinct idle connections rather than one reused.
+
+    Returns:
+        int: Connections opened
+    """
+    if not hasattr(target.pool, "size"):
+        return 0  # NullPool / StaticPool: nothing to keep warm
+    size = target.pool.size()
+    results = await asyncio.gather(
+        *(_open_primed_connection(target) for _ in range(size)), return_exceptions=True
+    )
+    connections: List[AsyncConnection] = [r for r in results if isinstance(r, AsyncConnection)]
+    for connection in connections:
+        await connection.close()  # back to the pool, still open
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        logger.warning(f"⚠️  Opened {len(connections)}/{size} pooled connections: {errors[0]}")
+    return len(connections)
+
+
+async def prewarm_pools() -> None:
+    """Prewarm the primary pool and, if configured, the replica's."""
+    for name, target in (("primary", engine), ("replica", read_engine)):
+        if target is None:
+            continue
+        started = time.perf_counter()
+        try:
+            opened = await prewarm_engine(target)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not prewarm the {name} connection pool: {e}")
+            continue
+        logger.info(
+            f"✅ Prewarmed {opened} {name} database connections "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection (after in-flight requests have drained)."""
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
 
 # --- Initialize DB ---
 async def init_db() -> None:
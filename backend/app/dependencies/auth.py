@@ -2,7 +2,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from jose import JWTError
+from backend.app.core.jwt_codec import JWTError
 
 from backend.app.core.config import settings
 from backend.app.db.session import get_session
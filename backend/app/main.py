@@ -4,24 +4,32 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from slowapi.errors import RateLimitExceeded
 
+import logging
 import time
 
 from backend.app.core.config import settings
-from backend.app.routers import users, admins, health, metrics
-from backend.app.routers.metrics import (
+from backend.app.routers import users, admins, auth, health, metrics, jwks, docs, profiler
+from backend.app.core.metrics import (
     http_requests_total,
     http_request_duration_seconds,
     http_requests_in_progress,
     http_errors_total
 )
-from backend.app.core.startup_checks import perform_startup_checks
-from backend.app.api.endpoints import test_email, password_reset
+from backend.app.core.startup_checks import perform_startup_checks, stop_background_checks
+from backend.app.core.health import health_monitor
+from backend.app.core.user_stats import user_stats_collector
+from backend.app.core.login_activity import login_activity
+from backend.app.core.openapi import openapi_document
+from backend.app.core.loop_monitor import loop_monitor
+from backend.app.core.tracing import configure_tracing, shutdown_tracing
+from backend.app.db.session import dispose_engines, prewarm_pools
+from backend.app.api.endpoints import password_reset
 from backend.app.middleware.rate_limit import limiter, rate_limit_exceeded_handler
 from backend.app.middleware.security_headers import SecurityHeadersMiddleware
 from backend.app.core.logging.config import setup_logging, get_logger
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from jose import JWTError
+from backend.app.core.jwt_codec import JWTError
 
 from backend.app.core.exceptions import (
     AppException,
@@ -73,8 +81,20 @@ async def lifespan(app: FastAPI):
     Replaces deprecated @app.on_event("startup") and @app.on_event("shutdown").
     """
     # ============= STARTUP =============
-    # Run startup checks first
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+    if settings.tracing_enabled:
+        configure_tracing()
+    # Run required startup checks concurrently; optional ones continue in the background
     await perform_startup_checks(fail_fast=False)  # Set to True in production
+    if settings.db_pool_prewarm:
+        # Connect, authenticate and prepare hot statements before traffic arrives
+        await prewarm_pools()
+    health_monitor.start()
+    user_stats_collector.start()
+    login_activity.start()
+    # Routes are all registered by now; build the schema before the first request
+    openapi_document.build(app)
     
     logger.info("=" * 60)
     logger.info(f"🚀 Starting {settings.project_name} v{settings.version}")
@@ -97,7 +117,8 @@ async def lifespan(app: FastAPI):
     logger.info("📊 Prometheus metrics: ENABLED at /metrics")
     logger.info("=" * 60)
     logger.info("✅ Application started successfully!")
-    logger.info(f"📚 API Documentation: http://localhost:{settings.backend_port}/docs")
+    if settings.docs_available:
+        logger.info(f"📚 API Documentation: http://localhost:{settings.backend_port}/docs")
     logger.info(f"📈 Metrics Endpoint: http://localhost:{settings.backend_port}/metrics")
     logger.info("=" * 60)
     
@@ -107,6 +128,21 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 60)
     logger.info(f"🛑 Shutting down {settings.project_name}")
     logger.info("=" * 60)
+    # The server has stopped listening and finished (or, after
+    # SHUTDOWN_DRAIN_SECONDS, cancelled) the open requests before this runs
+    await stop_background_checks()
+    await health_monitor.stop()
+    await user_stats_collector.stop()
+    # Requests are done, so logins from the last ones are written too
+    await login_activity.stop()
+    await loop_monitor.stop()
+    # Flush spans still waiting in the batch processor
+    shutdown_tracing()
+    # Nothing can use the database any more: close pooled connections cleanly
+    await dispose_engines()
+    logger.info("✅ Shutdown complete")
+    for handler in logging.getLogger().handlers:
+        handler.flush()
 
 
 # Initialize FastAPI app with lifespan
@@ -124,9 +160,10 @@ app = FastAPI(
         "url": settings.license_url,
     },
     root_path=settings.root_path,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
+    # Served by routers/docs.py from a schema pre-serialized at startup
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
     lifespan=lifespan,
 )
 
@@ -143,7 +180,7 @@ app.add_exception_handler(AuthorizationException, authorization_exception_handle
 app.add_exception_handler(DuplicateRecordException, duplicate_record_handler)
 app.add_exception_handler(RecordNotFoundException, record_not_found_handler)
 app.add_exception_handler(ValidationException, validation_exception_handler)
-app.add_exception_handler(RateLimitException, rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitException, rate_limit_exception_handler)
 app.add_exception_handler(EmailServiceException, email_service_exception_handler)
 app.add_exception_handler(DatabaseException, database_exception_handler)
 app.add_exception_handler(AppException, app_exception_handler)
@@ -270,13 +307,31 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# 4. Tracing (LAST - outermost, so its span covers the whole chain)
+from backend.app.middleware.tracing import TracingMiddleware
+app.add_middleware(TracingMiddleware)
+
 # === Include Routers ===
 app.include_router(health.router, tags=["System"])
 app.include_router(metrics.router, tags=["Monitoring"])
+app.include_router(jwks.router, tags=["System"])
+app.include_router(docs.router)
+if settings.docs_available:
+    app.include_router(docs.docs_router)
 app.include_router(users.router, prefix="/api", tags=["Users"])
 app.include_router(admins.router, prefix="/api", tags=["Admins"])
+app.include_router(auth.router, prefix="/api", tags=["Auth"])
+app.include_router(profiler.router, prefix="/api")
 app.include_router(password_reset.router, prefix="/api/password", tags=["Password Reset"])
-app.include_router(test_email.router, prefix="/api", tags=["Testing"])
+
+# Debug and email-test routes are not even imported in production
+if settings.environment != "production":
+    from backend.app.api.endpoints import test_email
+    from backend.app.routers import debug
+
+    app.include_router(password_reset.test_router, prefix="/api/password", tags=["Testing"])
+    app.include_router(test_email.router, prefix="/api", tags=["Testing"])
+    app.include_router(debug.router)
 
 # === System Endpoints ===
 
@@ -289,43 +344,10 @@ async def root():
     return {
         "message": f"Welcome to {settings.project_name} API!",
         "version": settings.version,
-        "docs": "/docs",
-        "redoc": "/redoc",
+        "docs": "/docs" if settings.docs_available else None,
+        "redoc": "/redoc" if settings.docs_available else None,
         "health": "/health",
+        "ready": "/ready",
+        "livez": "/livez",
         "metrics": "/metrics",
     }
-
-
-@app.get("/debug/request-id", tags=["Debug"])
-async def debug_request_id(request: Request):
-    """
-    Debug endpoint to verify request ID tracking is working.
-    """
-    from backend.app.core.logging.config import get_request_id
-    
-    request_id_from_state = getattr(request.state, 'request_id', 'NOT FOUND')
-    request_id_from_context = get_request_id()
-    
-    logger.info("Debug endpoint called - both IDs should be in the log above this message")
-    
-    return {
-        "debug": "Request ID Tracking Status",
-        "request_id_from_state": request_id_from_state,
-        "request_id_from_context": request_id_from_context,
-        "middleware_working": request_id_from_state != "NOT FOUND",
-        "logging_context_working": request_id_from_context is not None,
-    }
-
-
-@app.get("/debug/routes", tags=["Debug"])
-async def debug_routes():
-    """Debug endpoint to see all registered routes"""
-    routes = []
-    for route in app.routes:
-        if hasattr(route, 'path') and hasattr(route, 'methods'):
-            routes.append({
-                "path": route.path,
-                "methods": list(route.methods) if route.methods else [],
-                "name": route.name
-            })
-    return {"routes": routes}
\ No newline at end of file
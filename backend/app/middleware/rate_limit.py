@@ -5,6 +5,9 @@ from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 import logging
 
+from backend.app.core.config import settings
+from backend.app.core.login_throttle import client_ip
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,17 +22,16 @@ def get_identifier(request: Request) -> str:
     except Exception:
         pass
     
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0]
-    return get_remote_address(request)
+    return client_ip(request) or get_remote_address(request)
 
 
 limiter = Limiter(
     key_func=get_identifier,
     default_limits=["200/hour"],
-    storage_uri="memory://",
+    storage_uri=settings.rate_limit_storage_uri,
     headers_enabled=True,
+    # Fail open if the shared store is down, like the login throttle
+    swallow_errors=True,
 )
 
 
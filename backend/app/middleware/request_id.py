@@ -1,54 +1,123 @@
 """
 Request ID Middleware
-Generates a unique ID for each request to enable request tracing
+Assigns each request an ID (reusing a valid inbound one) to enable request tracing
 """
-import uuid
+import itertools
+import os
+import re
+import secrets
+import time
+from typing import Optional
+
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
-import logging
 
+from backend.app.core.config import settings
 from backend.app.core.logging.config import set_request_id, get_logger
 
 logger = get_logger(__name__)
 
+# Crockford base32, as used by ULID (sortable, no I/L/O/U)
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Every 10-bit value as two characters, so encoding is a few table lookups
+_PAIRS = [a + b for a in _CROCKFORD for b in _CROCKFORD]
+
+# What we accept from nginx / upstream callers: UUIDs, ULIDs, nginx $request_id, ...
+_VALID_INBOUND_ID = re.compile(r"[A-Za-z0-9._:\-]{8,128}")
+
+
+def _encode40(value: int) -> str:
+    """Encode a 40-bit integer as 8 base32 characters."""
+    return (
+        _PAIRS[(value >> 30) & 0x3FF]
+        + _PAIRS[(value >> 20) & 0x3FF]
+        + _PAIRS[(value >> 10) & 0x3FF]
+        + _PAIRS[value & 0x3FF]
+    )
+
+
+class RequestIDGenerator:
+    """
+    ULID-style request IDs without a urandom call per request.
+
+    26 characters of Crockford base32: a 48-bit millisecond timestamp, a
+    40-bit random prefix drawn once per process, and a 40-bit counter. IDs
+    sort by time, are unique within a process by the counter, and across
+    processes by the prefix (re-drawn after fork, so pre-forked workers
+    do not share one).
+    """
+
+    def __init__(self):
+        self._reseed()
+        os.register_at_fork(after_in_child=self._reseed)
+
+    def _reseed(self) -> None:
+        self._prefix = _encode40(secrets.randbits(40))
+        self._counter = itertools.count(secrets.randbits(39))
+        self._ms = -1
+        self._time_part = ""
+
+    def __call__(self) -> str:
+        ms = time.time_ns() // 1_000_000
+        if ms != self._ms:
+            # Same millisecond, same 10 characters: encode them once
+            self._time_part = _PAIRS[(ms >> 40) & 0x3FF] + _encode40(ms & 0xFF_FFFF_FFFF)
+            self._ms = ms
+        return self._time_part + self._prefix + _encode40(next(self._counter))
+
+
+generate_request_id = RequestIDGenerator()
+
+
+def inbound_request_id(value: Optional[str]) -> Optional[str]:
+    """Return the inbound X-Request-ID if it is safe to reuse, else None."""
+    if value and _VALID_INBOUND_ID.fullmatch(value):
+        return value
+    return None
+
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
     """
     Middleware that adds a unique request ID to each request.
-    
+
     The request ID:
-    - Is generated as a UUID4
+    - Is taken from an inbound X-Request-ID when trusted and well-formed,
+      so the ID correlates across nginx and upstream callers
+    - Is otherwise generated by `generate_request_id` (ULID-style)
     - Is stored in request.state.request_id
-    - Is stored in logging context via ContextVar
+    - Is stored in logging context via ContextVar, once; logs, error
+      responses and background jobs (emails) read it from there
     - Is added to response headers as X-Request-ID
-    - Is included in all log messages automatically
     """
-    
+
     async def dispatch(self, request: Request, call_next):
-        # Generate a unique request ID
-        request_id = str(uuid.uuid4())
-        
+        request_id = None
+        if settings.request_id_trust_inbound:
+            request_id = inbound_request_id(request.headers.get("X-Request-ID"))
+        if request_id is None:
+            request_id = generate_request_id()
+
         # Store in request state (accessible throughout request lifecycle)
         request.state.request_id = request_id
-        
+
         # Store in logging context (automatically added to all logs)
         set_request_id(request_id)
-        
+
         # Log incoming request
         logger.info(
             f"Incoming request: {request.method} {request.url.path}"
         )
-        
+
         # Process the request
         try:
             response: Response = await call_next(request)
-            
+
             # Log successful completion
             logger.info(
                 f"Request completed: {request.method} {request.url.path} - Status: {response.status_code}"
             )
-            
+
         except Exception as e:
             # Log error with full traceback
             logger.error(
@@ -56,8 +125,8 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
                 exc_info=True
             )
             raise
-        
+
         # Add request ID to response headers
         response.headers["X-Request-ID"] = request_id
-        
-        return response
\ No newline at end of file
+
+        return response
@@ -0,0 +1,59 @@
+"""
+Tracing Middleware
+Opens the SERVER span that every other span of a request hangs off
+"""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.core import tracing
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware that wraps the rest of the middleware chain in a span.
+
+    Registered last so it is outermost and its span covers CORS, request ID,
+    security headers, metrics and the route itself. The span:
+    - Continues an inbound W3C `traceparent` (head-based sampling)
+    - Is renamed to "<METHOD> <route template>" once routing has happened
+    - Records the response status and the X-Request-ID as `request.id`
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracing.tracing_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        attributes = {
+            "http.request.method": method,
+            "url.path": scope["path"],
+            "url.scheme": scope.get("scheme", "http"),
+        }
+
+        with tracing.server_span(f"{method} {scope['path']}", headers, attributes) as span:
+            if not span.is_recording():
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    for key, value in message.get("headers", ()):
+                        if key.lower() == b"x-request-id":
+                            span.set_attribute("request.id", value.decode("latin-1"))
+                            break
+                    if message["status"] >= 500:
+                        span.set_status(tracing.Status(tracing.StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.set_attribute("http.route", route.path)
+                    span.update_name(f"{method} {route.path}")
@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel, Field, Column, String
-from sqlalchemy import Boolean, DateTime
+from sqlalchemy import Boolean, DateTime, Integer
 from typing import Optional
 from datetime import datetime, timezone
 
@@ -52,6 +52,19 @@ class Admin(SQLModel, table=True):
         description="Indicates full access privileges"
     )
     
+    # ---------- Login Activity ----------
+    # Written by core/login_activity.py, not by the login request itself
+    last_login_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+        description="Last successful login (written in batches, may lag a few seconds)"
+    )
+    login_count: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default="0"),
+        description="Successful logins"
+    )
+    
     # ---------- Timestamps ----------
     # IMPORTANT: timezone=True tells SQLAlchemy to convert timezone-aware datetimes
     # to naive (remove timezone) when storing in TIMESTAMP WITHOUT TIME ZONE columns
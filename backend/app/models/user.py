@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel, Field, Column, String
-from sqlalchemy import Boolean, DateTime
+from sqlalchemy import Boolean, DateTime, Integer
 from typing import Optional
 from datetime import datetime, timezone
 
@@ -16,6 +16,8 @@ class User(SQLModel, table=True):
         - full_name: Optional display name
         - is_active: Whether user account is active
         - is_superuser: Whether user has superuser privileges
+        - last_login_at: Last successful login (timezone-aware)
+        - login_count: Number of successful logins
         - created_at: Account creation timestamp (timezone-aware)
         - updated_at: Last update timestamp (timezone-aware)
     """
@@ -58,6 +60,19 @@ class User(SQLModel, table=True):
         description="Whether user has superuser privileges"
     )
     
+    # ---------- Login Activity ----------
+    # Written by core/login_activity.py, not by the login request itself
+    last_login_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+        description="Last successful login (written in batches, may lag a few seconds)"
+    )
+    login_count: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default="0"),
+        description="Successful logins"
+    )
+    
     # ---------- Timestamps ----------
     # Using timezone-aware datetimes for proper timezone handling
     # SQLAlchemy converts timezone-aware to naive when storing in TIMESTAMP WITHOUT TIME ZONE
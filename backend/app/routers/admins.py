@@ -1,20 +1,31 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, Response, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 from sqlmodel import select
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 
-from backend.app.db.session import get_session
+from backend.app.db.queries import (
+    ADMIN_BY_EMAIL, ADMIN_BY_USERNAME, ADMIN_BY_USERNAME_OR_EMAIL, user_count,
+    users_by_ids_or_usernames,
+)
+from backend.app.db.session import get_read_session, get_session, release_connection
 from backend.app.models.admin import Admin
 from backend.app.models.user import User
 from backend.app.schemas.admin import (
     AdminCreate, AdminRead, AdminLogin, Token, TokenRefresh, RefreshTokenRequest
 )
-from backend.app.schemas.user import UserRead
-from backend.app.core.security import hash_password, verify_password, create_access_token
-from backend.app.core.deps import get_current_admin
-from backend.app.core.pagination import PaginationParams, PaginatedResponse
+from backend.app.schemas.user import UserBatchItem, UserBatchRequest, UserBatchResponse, UserRead
+from backend.app.core.security import (
+    hash_password, verify_password_and_policy, dummy_verify_password, create_access_token
+)
+from backend.app.core.login_activity import record_login
+from backend.app.core.login_throttle import login_throttle, client_ip
+from backend.app.core.metrics import logins_total
+from backend.app.core.conditional import ConditionalGet, record_etag, weak_etag
+from backend.app.core.deps import get_current_admin_read
+from backend.app.core.pagination import CursorPage, PaginationParams, PaginatedResponse
 from backend.app.core.exceptions import (
     AuthenticationException,
     DuplicateRecordException,
@@ -22,7 +33,8 @@ from backend.app.core.exceptions import (
     UsernameAlreadyExistsException,
 )
 from backend.app.core.logging.config import get_logger
-from sqlalchemy import func
+from backend.app.services.passwords import rehash_password
+from backend.app.services.user_search import search_users
 
 logger = get_logger(__name__)
 
@@ -55,10 +67,9 @@ async def register_admin(
     logger.info(f"Registering new admin: {admin_in.username}")
 
     # Check if username or email already exists
-    query = select(Admin).where(
-        (Admin.username == admin_in.username) | (Admin.email == admin_in.email)
-    )
-    existing_admin = (await session.execute(query)).scalar_one_or_none()
+    existing_admin = (await session.execute(
+        ADMIN_BY_USERNAME_OR_EMAIL, {"username": admin_in.username, "email": admin_in.email}
+    )).scalar_one_or_none()
 
     if existing_admin:
         if existing_admin.username == admin_in.username:
@@ -68,11 +79,12 @@ async def register_admin(
             logger.warning(f"Admin registration failed: Email '{admin_in.email}' already exists")
             raise EmailAlreadyExistsException(admin_in.email)
 
-    # Create new admin
+    # Create new admin (hashing without holding a connection)
+    await release_connection(session)
     new_admin = Admin(
         username=admin_in.username,
         email=admin_in.email,
-        hashed_password=hash_password(admin_in.password),
+        hashed_password=await run_in_threadpool(hash_password, admin_in.password),
         is_superadmin=admin_in.is_superadmin,
     )
 
@@ -96,14 +108,20 @@ async def register_admin(
 @router.post("/login", response_model=Token)
 async def login_admin(
     admin_in: AdminLogin,
+    request: Request,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session)
 ) -> dict[str, Any]:
     """
     Authenticate admin and return JWT access + refresh tokens.
     Can login with either username or email.
+    Throttled per username/email and IP; locked-out attempts are rejected before any hash is checked.
+    Hashes below the current hashing policy are upgraded after the response is sent.
     
     Args:
         admin_in: AdminLogin schema with username/email and password
+        request: Incoming request (client IP for throttling)
+        background_tasks: Used to schedule the password rehash
         session: Database session
     
     Returns:
@@ -112,14 +130,15 @@ async def login_admin(
     Raises:
         HTTPException 400: If neither username nor email provided
         AuthenticationException: If credentials invalid or admin inactive
+        LoginThrottledException: If too many recent failures
     """
     logger.info(f"Admin login attempt - username: {admin_in.username}, email: {admin_in.email}")
 
     # Build query based on provided credentials
     if admin_in.email:
-        query = select(Admin).where(Admin.email == admin_in.email)
+        query, params = ADMIN_BY_EMAIL, {"email": admin_in.email}
     elif admin_in.username:
-        query = select(Admin).where(Admin.username == admin_in.username)
+        query, params = ADMIN_BY_USERNAME, {"username": admin_in.username}
     else:
         logger.warning("Admin login failed: Neither username nor email provided")
         raise HTTPException(
@@ -127,13 +146,36 @@ async def login_admin(
             detail="Either username or email must be provided"
         )
 
-    result = await session.execute(query)
+    login_name = admin_in.email or admin_in.username
+    ip = client_ip(request)
+    await login_throttle.check("admin", login_name, ip)
+
+    result = await session.execute(query, params)
     admin = result.scalar_one_or_none()
+    # Don't hold a pooled connection while the password hash is checked
+    await release_connection(session)
+
+    if admin and admin.is_active:
+        valid, stale_hash = await run_in_threadpool(
+            verify_password_and_policy, admin_in.password, admin.hashed_password
+        )
+    else:
+        await run_in_threadpool(dummy_verify_password, admin_in.password)
+        valid, stale_hash = False, False
 
-    if not admin or not admin.is_active or not verify_password(admin_in.password, admin.hashed_password):
+    if not valid:
+        logins_total.labels(principal="admin", result="failure").inc()
+        await login_throttle.record_failure("admin", login_name, ip)
         logger.warning(f"Admin login failed - username: {admin_in.username}, email: {admin_in.email}")
         raise AuthenticationException("Invalid username or password")
 
+    logins_total.labels(principal="admin", result="success").inc()
+    record_login("admin", admin.id)
+    await login_throttle.record_success("admin", login_name)
+
+    if stale_hash:
+        background_tasks.add_task(rehash_password, Admin, admin.id, admin.hashed_password, admin_in.password)
+
     # Generate JWT tokens
     token_data = {"id": admin.id, "role": "superadmin" if admin.is_superadmin else "admin"}
     access_token = create_access_token(
@@ -187,17 +229,22 @@ async def refresh_token(token_request: RefreshTokenRequest) -> dict[str, Any]:
 
 @router.get("/me", response_model=AdminRead)
 async def get_current_admin_profile(
-    current_admin: Admin = Depends(get_current_admin)
-) -> Admin:
+    current_admin: Admin = Depends(get_current_admin_read),
+    conditional: ConditionalGet = Depends(),
+) -> Admin | Response:
     """
     Get current authenticated admin's profile.
     
+    Supports If-None-Match: answers 304 when the profile is unchanged.
+    
     Returns:
         Admin: Current admin object with all profile information
     
     Requires:
         Valid JWT token in Authorization header
     """
+    if (not_modified := conditional.not_modified(record_etag(current_admin))):
+        return not_modified
     logger.info(f"Fetching profile for admin: {current_admin.username}")
     return current_admin
 
@@ -207,14 +254,19 @@ async def list_users(
     page: int = 1,
     page_size: int = 10,
     is_active: bool | None = None,
-    current_admin: Admin = Depends(get_current_admin),
-    session: AsyncSession = Depends(get_session)
-) -> PaginatedResponse[UserRead]:
+    current_admin: Admin = Depends(get_current_admin_read),
+    session: AsyncSession = Depends(get_read_session),
+    conditional: ConditionalGet = Depends(),
+) -> PaginatedResponse[UserRead] | Response:
     """
     List all users with pagination and optional filtering.
     
     **Admin only endpoint.**
     
+    Supports If-None-Match: the ETag covers the count and latest
+    `updated_at` of the filtered users, so an unchanged list answers 304
+    after one aggregate query, without loading the page.
+    
     Args:
         page: Page number (starts at 1, default: 1)
         page_size: Items per page (1-100, default: 10)
@@ -243,13 +295,13 @@ async def list_users(
     # Order by created_at descending (newest first)
     query = query.order_by(User.created_at.desc())
 
-    # Get total count
-    count_query = select(func.count()).select_from(User)
-    if is_active is not None:
-        count_query = count_query.where(User.is_active == is_active)
+    # Get total count, and the latest change for the ETag, in one query
+    count_query = user_count(is_active, with_last_update=True)
+    total, last_updated = (await session.execute(count_query, {"is_active": is_active})).one()
 
-    total_result = await session.execute(count_query)
-    total = total_result.scalar_one()
+    etag = weak_etag("users", is_active, pagination.page, pagination.page_size, total, last_updated)
+    if (not_modified := conditional.not_modified(etag)):
+        return not_modified
 
     # Apply pagination
     query = query.offset(pagination.offset).limit(pagination.limit)
@@ -266,4 +318,83 @@ async def list_users(
         total=total,
         page=pagination.page,
         page_size=pagination.page_size
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/users/search", response_model=CursorPage[UserRead])
+async def search_users_endpoint(
+    q: str = Query(..., min_length=1, max_length=100, description="Text to find in username, email or full name"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    is_active: bool | None = None,
+    current_admin: Admin = Depends(get_current_admin_read),
+    session: AsyncSession = Depends(get_read_session)
+) -> CursorPage[UserRead]:
+    """
+    Search users by partial username, email or full name.
+    
+    **Admin only endpoint.**
+    
+    Best matches come first (exact, then prefix, then similar). Queries of
+    three or more characters match anywhere in the fields; shorter ones
+    match the start of username or email.
+    
+    Args:
+        q: Search text (case-insensitive)
+        limit: Items per page (1-100, default: 20)
+        cursor: Opaque cursor from the previous page's `next_cursor`
+        is_active: Filter by active status (optional)
+        current_admin: Current authenticated admin
+        session: Database session
+    
+    Returns:
+        CursorPage[UserRead]: Matching users and the cursor for the next page
+    
+    Raises:
+        InvalidInputException: If the cursor is malformed
+        QueryTimeoutException: If the search exceeds the statement timeout (503)
+    """
+    users, next_cursor = await search_users(session, q, limit=limit, cursor=cursor, is_active=is_active)
+    logger.info(f"✅ Admin user search {q!r} returned {len(users)} users")
+    return CursorPage(items=users, limit=limit, next_cursor=next_cursor)
+
+
+@router.post("/users/batch", response_model=UserBatchResponse)
+async def batch_get_users(
+    batch: UserBatchRequest,
+    current_admin: Admin = Depends(get_current_admin_read),
+    session: AsyncSession = Depends(get_read_session)
+) -> UserBatchResponse:
+    """
+    Resolve many user IDs and/or usernames in one call.
+    
+    **Admin only endpoint.**
+    
+    Runs a single query however many keys are sent. Items come back in the
+    order of `keys`, one per key (duplicates included); keys that match no
+    user have `found: false` and `user: null`.
+    
+    Args:
+        batch: UserBatchRequest with up to 100 IDs (numbers) or usernames (strings)
+        current_admin: Current authenticated admin
+        session: Database session
+    
+    Returns:
+        UserBatchResponse: One item per requested key, in request order
+    """
+    ids = list({key for key in batch.keys if isinstance(key, int)})
+    usernames = list({key for key in batch.keys if isinstance(key, str)})
+
+    # Same statement text whatever the batch size (one array per list on PostgreSQL)
+    query = users_by_ids_or_usernames(session.bind.dialect.name)
+    result = await session.execute(query, {"ids": ids, "usernames": usernames})
+    users = result.scalars().all()
+    by_key = {user.id: user for user in users}
+    by_key.update({user.username: user for user in users})
+
+    items = [
+        UserBatchItem(key=key, found=key in by_key, user=by_key.get(key))
+        for key in batch.keys
+    ]
+    logger.info(f"✅ Admin batch lookup: {len(users)} of {len(batch.keys)} keys resolved")
+    return UserBatchResponse(items=items)
@@ -0,0 +1,122 @@
+"""
+Auth Router
+
+Token introspection (RFC 7662) for internal services; see
+core/introspection.py for the caching rules.
+"""
+import base64
+import binascii
+import hmac
+import json
+from typing import Any, Dict, List
+from urllib.parse import parse_qs
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.core.config import settings
+from backend.app.core.exceptions import AuthenticationException, InvalidInputException
+from backend.app.core.introspection import introspect_tokens
+from backend.app.core.logging.config import get_logger
+from backend.app.db.session import get_read_session
+from backend.app.schemas.auth import (
+    BatchIntrospectionRequest,
+    BatchIntrospectionResponse,
+    IntrospectionResponse,
+)
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/auth", tags=["Auth"])
+
+
+def require_introspection_client(request: Request) -> str:
+    """
+    Authenticate the calling service with HTTP Basic client credentials.
+
+    Returns:
+        str: The client ID
+
+    Raises:
+        AuthenticationException: If credentials are missing or wrong
+    """
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, encoded = authorization.partition(" ")
+    if scheme.lower() != "basic" or not encoded:
+        raise AuthenticationException("Client authentication required")
+    try:
+        client_id, _, secret = base64.b64decode(encoded, validate=True).decode().partition(":")
+    except (binascii.Error, UnicodeDecodeError):
+        raise AuthenticationException("Client authentication required")
+
+    expected = settings.introspection_client_secrets.get(client_id)
+    # Compare against a dummy for unknown clients so timing does not reveal them
+    matches = hmac.compare_digest(secret.encode(), (expected or "\0").encode())
+    if expected is None or not matches:
+        logger.warning(f"⚠️  Introspection client authentication failed for {client_id!r}")
+        raise AuthenticationException("Invalid client credentials")
+    return client_id
+
+
+def _cache_headers(response: Response, max_age: int) -> None:
+    if max_age > 0:
+        response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    else:
+        response.headers["Cache-Control"] = "no-store"
+
+
+async def _read_token(request: Request) -> str:
+    """Read `token` from a form-encoded (RFC 7662) or JSON body."""
+    body = await request.body()
+    if request.headers.get("Content-Type", "").startswith("application/json"):
+        try:
+            token = json.loads(body or b"{}").get("token")
+        except (ValueError, AttributeError):
+            token = None
+    else:
+        token = parse_qs(body.decode("latin-1")).get("token", [None])[0]
+    if not token or not isinstance(token, str):
+        raise InvalidInputException("token", "a token is required")
+    return token
+
+
+@router.post("/introspect", response_model=IntrospectionResponse, response_model_exclude_none=True)
+async def introspect(
+    request: Request,
+    response: Response,
+    client_id: str = Depends(require_introspection_client),
+    session: AsyncSession = Depends(get_read_session),
+) -> Dict[str, Any]:
+    """
+    Introspect one access token (RFC 7662).
+
+    The body is `token=<jwt>` (form-encoded, `token_type_hint` is ignored)
+    or `{"token": "<jwt>"}`. Inactive, expired, malformed and unknown
+    tokens all answer `{"active": false}` with status 200.
+    """
+    token = await _read_token(request)
+    results, max_age = await introspect_tokens(session, [token])
+    _cache_headers(response, max_age)
+    return results[0]
+
+
+@router.post("/introspect/batch", response_model=BatchIntrospectionResponse, response_model_exclude_none=True)
+async def introspect_batch(
+    batch: BatchIntrospectionRequest,
+    response: Response,
+    client_id: str = Depends(require_introspection_client),
+    session: AsyncSession = Depends(get_read_session),
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Introspect up to INTROSPECTION_BATCH_MAX tokens in one call.
+
+    Results are returned in request order. The response may be cached for
+    as long as every result in it may be.
+    """
+    if len(batch.tokens) > settings.introspection_batch_max:
+        raise InvalidInputException(
+            "tokens", f"at most {settings.introspection_batch_max} tokens per request"
+        )
+    results, max_age = await introspect_tokens(session, batch.tokens)
+    _cache_headers(response, max_age)
+    return {"results": results}
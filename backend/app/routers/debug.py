@@ -0,0 +1,43 @@
+"""
+Debug endpoints for local development. Not mounted in production (see main.py).
+"""
+from fastapi import APIRouter, Request
+
+from backend.app.core.logging.config import get_logger, get_request_id
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/request-id")
+async def debug_request_id(request: Request):
+    """
+    Debug endpoint to verify request ID tracking is working.
+    """
+    request_id_from_state = getattr(request.state, 'request_id', 'NOT FOUND')
+    request_id_from_context = get_request_id()
+    
+    logger.info("Debug endpoint called - both IDs should be in the log above this message")
+    
+    return {
+        "debug": "Request ID Tracking Status",
+        "request_id_from_state": request_id_from_state,
+        "request_id_from_context": request_id_from_context,
+        "middleware_working": request_id_from_state != "NOT FOUND",
+        "logging_context_working": request_id_from_context is not None,
+    }
+
+
+@router.get("/routes")
+async def debug_routes(request: Request):
+    """Debug endpoint to see all registered routes"""
+    routes = []
+    for route in request.app.routes:
+        if hasattr(route, 'path') and hasattr(route, 'methods'):
+            routes.append({
+                "path": route.path,
+                "methods": list(route.methods) if route.methods else [],
+                "name": route.name
+            })
+    return {"routes": routes}
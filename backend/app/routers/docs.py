@@ -0,0 +1,77 @@
+"""
+OpenAPI schema and interactive docs.
+
+/openapi.json is served from the document pre-serialized at startup, with an
+ETag and a gzip variant. /docs and /redoc are only mounted when
+`settings.docs_enabled` (off by default in production).
+"""
+from fastapi import APIRouter, Request, Response, status
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import HTMLResponse
+
+from backend.app.core.conditional import etag_matches
+from backend.app.core.openapi import accepts_gzip, openapi_document
+
+OPENAPI_URL = "/openapi.json"
+OAUTH2_REDIRECT_URL = "/docs/oauth2-redirect"
+
+router = APIRouter(include_in_schema=False)
+docs_router = APIRouter(include_in_schema=False)
+
+
+@router.get(OPENAPI_URL)
+async def openapi_schema(request: Request) -> Response:
+    """
+    OpenAPI document, served from memory.
+
+    Clients revalidate with If-None-Match (304 when unchanged); gzip is
+    served when the client accepts it. The two variants have different
+    ETags, and either one revalidates: the document is the same.
+    """
+    document = openapi_document.get(request.app)
+    use_gzip = accepts_gzip(request.headers.get("Accept-Encoding"))
+    headers = {
+        "ETag": document.gzip_etag if use_gzip else document.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("If-None-Match")
+    if etag_matches(if_none_match, document.etag) or etag_matches(if_none_match, document.gzip_etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=document.gzip_body, media_type="application/json", headers=headers)
+
+    return Response(content=document.body, media_type="application/json", headers=headers)
+
+
+@docs_router.get("/docs")
+async def swagger_ui(request: Request) -> HTMLResponse:
+    """Swagger UI."""
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    return get_swagger_ui_html(
+        openapi_url=root_path + OPENAPI_URL,
+        title=f"{request.app.title} - Swagger UI",
+        oauth2_redirect_url=root_path + OAUTH2_REDIRECT_URL,
+    )
+
+
+@docs_router.get(OAUTH2_REDIRECT_URL)
+async def swagger_ui_redirect() -> HTMLResponse:
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@docs_router.get("/redoc")
+async def redoc(request: Request) -> HTMLResponse:
+    """ReDoc."""
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    return get_redoc_html(
+        openapi_url=root_path + OPENAPI_URL,
+        title=f"{request.app.title} - ReDoc",
+    )
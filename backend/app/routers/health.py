@@ -1,60 +1,66 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from datetime import datetime, timezone
+from fastapi import APIRouter, Response, status
 
-from backend.app.db.session import get_session
-from backend.app.core.config import settings
+from backend.app.core.health import health_monitor
 from backend.app.core.logging.config import get_logger
+from backend.app.core.startup_checks import readiness
 
 logger = get_logger(__name__)
 
 router = APIRouter(tags=["Health"])
 
 
+@router.get("/livez", status_code=status.HTTP_200_OK)
+async def liveness_check() -> dict:
+    """
+    Liveness probe: the process is up and the event loop is responsive.
+
+    Touches no dependencies, so a database outage never gets the worker
+    restarted. Use /ready for traffic gating and /health for dependency status.
+    """
+    return {"status": "alive"}
+
+
 @router.get("/health", status_code=status.HTTP_200_OK)
-async def health_check(session: AsyncSession = Depends(get_session)) -> dict:
+async def health_check() -> dict:
     """
-    Health check endpoint that verifies system status.
+    Health check endpoint that reports dependency status.
+
+    Served from a snapshot refreshed in the background every
+    `health_cache_seconds`; concurrent probes against a stale snapshot share
+    one refresh.
     
     Returns:
         dict: System health information including:
             - status: "healthy" or "degraded"
-            - timestamp: Current UTC timestamp
+            - timestamp: UTC time the snapshot was taken
             - version: Application version
             - environment: Current environment (dev/prod)
             - project: Project name
-            - database: Database connectivity info
+            - database: Connectivity, error and probe latency (ms)
+            - read_replica: Whether a replica is configured, its last lag and whether it serves reads
             - email_configured: Whether email service is available
+            - cache_age_seconds: Age of the snapshot
     """
-    logger.info("Health check requested")
-    
-    # Check database connection
-    db_connected = False
-    db_error = None
-    try:
-        await session.execute(text("SELECT 1"))
-        db_connected = True
-        logger.info("✅ Database connection healthy")
-    except Exception as e:
-        db_error = str(e)
-        logger.error(f"❌ Database connection failed: {db_error}")
-    
-    # Check email configuration
-    email_configured = bool(settings.smtp_server and settings.smtp_port)
-    
-    health_data = {
-        "status": "healthy" if db_connected else "degraded",
-        "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
-        "version": "1.0.2",
-        "environment": settings.environment,
-        "project": "ADL Production",
-        "database": {
-            "connected": db_connected,
-            "error": db_error
+    snapshot = await health_monitor.get()
+    logger.debug(f"Health check served - status: {snapshot['status']}")
+    return {**snapshot, "cache_age_seconds": round(health_monitor.age, 3)}
+
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def readiness_check(response: Response) -> dict:
+    """
+    Readiness probe for load balancers and orchestrators.
+
+    Returns 200 once every required startup check has passed and 503 until
+    then. Served from the state kept by core/startup_checks, so it does no I/O.
+    """
+    if not readiness.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return {
+        "ready": readiness.ready,
+        "checks": {
+            name: {"passed": passed, "message": message}
+            for name, (passed, message) in readiness.results.items()
         },
-        "email_configured": email_configured
     }
-    
-    logger.info(f"Health check completed - status: {health_data['status']}")
-    return health_data
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+JWKS Router
+
+Publishes the public signing keys so other services can verify our tokens
+locally instead of calling back into this API.
+"""
+from fastapi import APIRouter, Request, Response, status
+
+from backend.app.core.config import settings
+from backend.app.core.keys import key_ring
+
+router = APIRouter(tags=["System"])
+
+
+@router.get("/.well-known/jwks.json")
+async def jwks(request: Request) -> Response:
+    """
+    JSON Web Key Set (RFC 7517) with every key currently accepted for verification.
+
+    The body is serialized once per key reload and served with an ETag and
+    Cache-Control so verifiers can cache it between rotations. Empty when
+    tokens are signed with the shared HS256 secret.
+    """
+    body, etag = key_ring.jwks()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.jwks_cache_max_age}",
+        "ETag": etag,
+    }
+
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/jwk-set+json", headers=headers)
@@ -1,70 +1,62 @@
 """
 Prometheus Metrics Router
 
-Provides /metrics endpoint for Prometheus scraping.
-"""
-from fastapi import APIRouter, Response
-from prometheus_client import Counter, Histogram, Gauge, Info, generate_latest, CONTENT_TYPE_LATEST, REGISTRY
+Provides /metrics endpoint for Prometheus scraping. The metrics are
+defined in core/metrics.py and re-exported here.
 
-from backend.app.core.config import settings
-
-router = APIRouter()
-
-# ============= PROMETHEUS METRICS =============
-
-# Application Info
-app_info = Info('adl_application', 'Application information', registry=REGISTRY)
-app_info.info({
-    'version': settings.version,
-    'environment': settings.environment,
-    'name': settings.project_name
-})
+Under several workers (backend/app/server.py), PROMETHEUS_MULTIPROC_DIR is
+set and each worker writes its samples to files there; /metrics merges them,
+so any worker answers for all of them. Gauges say how to merge with
+`multiprocess_mode` (core/metrics.py).
+"""
+import os
 
-# HTTP Metrics
-http_requests_total = Counter(
-    'http_requests_total',
-    'Total HTTP requests',
-    ['method', 'endpoint', 'status'],
-    registry=REGISTRY
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
 )
 
-http_request_duration_seconds = Histogram(
-    'http_request_duration_seconds',
-    'HTTP request latency in seconds',
-    ['method', 'endpoint'],
-    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
-    registry=REGISTRY
+# Re-exported: metrics used to live in this module
+from backend.app.core.metrics import (  # noqa: F401
+    app_info,
+    http_requests_total,
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    event_loop_lag_seconds,
+    event_loop_blocked_total,
+    active_users_gauge,
+    registered_users_gauge,
+    logins_total,
+    password_hash_duration_seconds,
+    login_lockouts_total,
+    login_attempts_rejected_total,
+    login_activity_buffer_size,
+    login_activity_flush_seconds,
+    db_connection_hold_seconds,
+    db_read_sessions_total,
+    db_replica_lag_seconds,
+    http_errors_total,
 )
 
-http_requests_in_progress = Gauge(
-    'http_requests_in_progress',
-    'Number of HTTP requests in progress',
-    ['method', 'endpoint'],
-    registry=REGISTRY
-)
+router = APIRouter()
 
-# Application Metrics
-active_users_gauge = Gauge(
-    'active_users_total',
-    'Total number of active users',
-    registry=REGISTRY
-)
 
-registered_users_gauge = Gauge(
-    'registered_users_total',
-    'Total number of registered users',
-    registry=REGISTRY
-)
+def _scrape_registry() -> CollectorRegistry:
+    """The registry /metrics serves: this process's, or all workers' merged."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    # Info has no multiprocess form; it is the same in every worker
+    registry.register(app_info)
+    return registry
 
-# Error Metrics
-http_errors_total = Counter(
-    'http_errors_total',
-    'Total HTTP errors',
-    ['method', 'endpoint', 'error_type'],
-    registry=REGISTRY
-)
 
-# ============================================
+SCRAPE_REGISTRY = _scrape_registry()
 
 
 @router.get("/metrics", include_in_schema=False)
@@ -78,13 +70,17 @@ async def metrics():
     Metrics include:
     - HTTP request count, duration, and errors
     - Active users count
-    - Registered users count
+    - Registered users count (refreshed in the background)
+    - Login results and password hashing latency
     - In-progress requests
+    - Event loop lag and blocking stalls
+    - Login lockouts and throttled attempts
+    - Buffered login activity and its flush latency
     
     Returns:
         Response: Prometheus-formatted metrics
     """
     return Response(
-        content=generate_latest(REGISTRY),
+        content=generate_latest(SCRAPE_REGISTRY),
         media_type=CONTENT_TYPE_LATEST
     )
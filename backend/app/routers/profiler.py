@@ -0,0 +1,78 @@
+"""
+Profiler Router
+
+Superadmin-only sampling profiler for the worker that serves the request.
+Disabled (404) unless PROFILER_ENABLED is set.
+"""
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.core.config import settings
+from backend.app.core.deps import get_current_superadmin
+from backend.app.core.logging.config import get_logger
+from backend.app.core.profiler import sampling_profiler
+from backend.app.db.session import get_session, release_connection
+from backend.app.models.admin import Admin
+
+logger = get_logger(__name__)
+
+
+async def require_profiler_enabled() -> None:
+    """Hide the endpoint entirely while the profiler is disabled."""
+    if not settings.profiler_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+router = APIRouter(
+    prefix="/admins",
+    tags=["Admins"],
+    dependencies=[Depends(require_profiler_enabled)],
+    include_in_schema=settings.profiler_enabled,
+)
+
+
+@router.get("/profile")
+async def profile_worker(
+    seconds: float = Query(10.0, gt=0, description="How long to sample"),
+    interval_ms: float = Query(None, ge=1, le=100, description="Sampling interval in milliseconds"),
+    format: Literal["collapsed", "speedscope"] = Query("speedscope"),
+    current_admin: Admin = Depends(get_current_superadmin),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """
+    Sample every thread of this worker for `seconds` and return a flame graph.
+
+    **Superadmin only.** Only one profile runs per worker at a time.
+
+    Args:
+        seconds: Profile duration (capped at PROFILER_MAX_SECONDS)
+        interval_ms: Sampling interval (default PROFILER_DEFAULT_INTERVAL_MS)
+        format: "collapsed" (flamegraph.pl text) or "speedscope" (JSON file)
+        current_admin: Current authenticated superadmin
+        session: Database session (the one the superadmin was loaded with)
+
+    Returns:
+        Collapsed stacks as text/plain, or a speedscope JSON document
+
+    Raises:
+        ProfilerBusyException: If a profile is already running on this worker
+    """
+    seconds = min(seconds, settings.profiler_max_seconds)
+    interval = (interval_ms or settings.profiler_default_interval_ms) / 1000
+
+    logger.warning(f"Profiler requested by superadmin '{current_admin.username}' for {seconds:.1f}s")
+    # Don't hold a pooled connection while sampling
+    await release_connection(session)
+    profile = await sampling_profiler.run(seconds, interval)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    return JSONResponse(
+        profile.speedscope(name=f"worker profile {stamp}"),
+        headers={"Content-Disposition": f'attachment; filename="profile-{stamp}.speedscope.json"'},
+    )
@@ -4,22 +4,32 @@ FILE: backend/app/routers/users.py - UPDATED WITH FIXES
 - Ensured full_name is handled in all responses
 """
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, BackgroundTasks, Request, Response, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from sqlalchemy.exc import IntegrityError
 from datetime import timedelta, datetime, timezone
 from typing import Any, Optional
-from sqlalchemy import func
+from starlette.concurrency import run_in_threadpool
 
-from backend.app.db.session import get_session
+from backend.app.db.queries import USER_BY_EMAIL, USER_BY_USERNAME, USER_BY_USERNAME_OR_EMAIL, user_count
+from backend.app.db.session import get_read_session, get_session, release_connection
 from backend.app.models.user import User
 from backend.app.schemas.user import (
     UserCreate, UserRead, UserLogin, RefreshTokenRequest,
     UserProfileUpdate, ChangePasswordRequest, UserListResponse
 )
-from backend.app.core.security import hash_password, verify_password, create_access_token
-from backend.app.core.deps import get_current_user, get_current_admin
+from backend.app.core.security import (
+    hash_password, verify_password, verify_password_and_policy, dummy_verify_password,
+    create_access_token,
+)
+from backend.app.core.login_activity import record_login
+from backend.app.core.login_throttle import login_throttle, client_ip
+from backend.app.core.user_stats import user_registered
+from backend.app.core.metrics import logins_total
+from backend.app.core.conditional import ConditionalGet, record_etag
+from backend.app.core.deps import get_current_user, get_current_user_read, get_current_admin_read
+from backend.app.core.introspection import invalidate_principal
 from backend.app.models.admin import Admin
 from backend.app.schemas.admin import Token, TokenRefresh
 from backend.app.core.exceptions import (
@@ -30,6 +40,7 @@ from backend.app.core.exceptions import (
     BusinessLogicException,
 )
 from backend.app.core.logging.config import get_logger
+from backend.app.services.passwords import rehash_password
 
 logger = get_logger(__name__)
 
@@ -51,10 +62,9 @@ async def register_user(
     logger.info(f"Registering new user: {user_in.username}")
 
     # Check if username or email already exists
-    query = select(User).where(
-        (User.username == user_in.username) | (User.email == user_in.email)
-    )
-    existing_user = (await session.execute(query)).scalar_one_or_none()
+    existing_user = (await session.execute(
+        USER_BY_USERNAME_OR_EMAIL, {"username": user_in.username, "email": user_in.email}
+    )).scalar_one_or_none()
 
     if existing_user:
         if existing_user.username == user_in.username:
@@ -64,12 +74,13 @@ async def register_user(
             logger.warning(f"Registration failed: Email '{user_in.email}' already exists")
             raise EmailAlreadyExistsException(user_in.email)
 
-    # Hash password and create new user
+    # Hash password and create new user (without holding a connection)
+    await release_connection(session)
     new_user = User(
         username=user_in.username,
         email=user_in.email,
         full_name=user_in.full_name,
-        hashed_password=hash_password(user_in.password),
+        hashed_password=await run_in_threadpool(hash_password, user_in.password),
     )
 
     try:
@@ -77,6 +88,7 @@ async def register_user(
         await session.commit()
         await session.refresh(new_user)
         logger.info(f"✅ User '{user_in.username}' registered successfully (ID: {new_user.id})")
+        user_registered(new_user.is_active)
     except IntegrityError:
         await session.rollback()
         logger.error(f"Database integrity error during user registration: {user_in.username}")
@@ -92,20 +104,46 @@ async def register_user(
 @router.post("/login", response_model=Token)
 async def login_user(
     user_in: UserLogin,
+    request: Request,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session)
 ) -> dict[str, Any]:
-    """Authenticate user and return JWT access + refresh tokens."""
+    """
+    Authenticate user and return JWT access + refresh tokens.
+    Throttled per username and IP; locked-out attempts are rejected before any hash is checked.
+    Hashes below the current hashing policy are upgraded after the response is sent.
+    """
     logger.info(f"Login attempt for user: {user_in.username}")
 
-    result = await session.execute(
-        select(User).where(User.username == user_in.username)
-    )
+    ip = client_ip(request)
+    await login_throttle.check("user", user_in.username, ip)
+
+    result = await session.execute(USER_BY_USERNAME, {"username": user_in.username})
     user = result.scalar_one_or_none()
+    # Don't hold a pooled connection while the password hash is checked
+    await release_connection(session)
+
+    if user and user.is_active:
+        valid, stale_hash = await run_in_threadpool(
+            verify_password_and_policy, user_in.password, user.hashed_password
+        )
+    else:
+        await run_in_threadpool(dummy_verify_password, user_in.password)
+        valid, stale_hash = False, False
 
-    if not user or not user.is_active or not verify_password(user_in.password, user.hashed_password):
+    if not valid:
+        logins_total.labels(principal="user", result="failure").inc()
+        await login_throttle.record_failure("user", user_in.username, ip)
         logger.warning(f"Login failed for user: {user_in.username}")
         raise AuthenticationException("Invalid username or password")
 
+    logins_total.labels(principal="user", result="success").inc()
+    record_login("user", user.id)
+    await login_throttle.record_success("user", user_in.username)
+
+    if stale_hash:
+        background_tasks.add_task(rehash_password, User, user.id, user.hashed_password, user_in.password)
+
     # Generate JWT tokens
     token_data = {"id": user.id, "role": "superuser" if user.is_superuser else "user"}
     access_token = create_access_token(
@@ -148,9 +186,12 @@ async def refresh_token(token_request: RefreshTokenRequest) -> dict[str, Any]:
 
 @router.get("/me", response_model=UserRead)
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """Get current authenticated user's profile."""
+    current_user: User = Depends(get_current_user_read),
+    conditional: ConditionalGet = Depends(),
+) -> User | Response:
+    """Get current authenticated user's profile (304 if unchanged since the If-None-Match ETag)."""
+    if (not_modified := conditional.not_modified(record_etag(current_user))):
+        return not_modified
     logger.info(f"Fetching profile for user: {current_user.username}")
     return current_user
 
@@ -166,9 +207,7 @@ async def update_user_profile(
 
     # Check if username is being updated
     if user_update.username and user_update.username != current_user.username:
-        result = await session.execute(
-            select(User).where(User.username == user_update.username)
-        )
+        result = await session.execute(USER_BY_USERNAME, {"username": user_update.username})
         existing_user = result.scalar_one_or_none()
         if existing_user:
             logger.warning(f"Profile update failed: Username '{user_update.username}' already exists")
@@ -178,9 +217,7 @@ async def update_user_profile(
 
     # Check if email is being updated
     if user_update.email and user_update.email != current_user.email:
-        result = await session.execute(
-            select(User).where(User.email == user_update.email)
-        )
+        result = await session.execute(USER_BY_EMAIL, {"email": user_update.email})
         existing_user = result.scalar_one_or_none()
         if existing_user:
             logger.warning(f"Profile update failed: Email '{user_update.email}' already exists")
@@ -200,6 +237,7 @@ async def update_user_profile(
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
+    invalidate_principal("user", current_user.id)
 
     logger.info(f"✅ Profile updated for user: {current_user.username}")
     return current_user
@@ -213,9 +251,10 @@ async def change_password(
 ) -> dict:
     """Change current authenticated user's password."""
     logger.info(f"Password change requested for user: {current_user.username}")
+    await release_connection(session)
 
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await run_in_threadpool(verify_password, password_data.current_password, current_user.hashed_password):
         logger.warning(f"Password change failed: Incorrect current password for {current_user.username}")
         raise AuthenticationException("Current password is incorrect")
 
@@ -227,12 +266,13 @@ async def change_password(
         )
 
     # Hash and update password
-    current_user.hashed_password = hash_password(password_data.new_password)
+    current_user.hashed_password = await run_in_threadpool(hash_password, password_data.new_password)
     current_user.updated_at = datetime.now(timezone.utc)
 
     # Save changes
     session.add(current_user)
     await session.commit()
+    invalidate_principal("user", current_user.id)
 
     logger.info(f"✅ Password changed successfully for user: {current_user.username}")
     return {"message": "Password changed successfully"}
@@ -243,8 +283,8 @@ async def list_users(
     page: int = 1,
     page_size: int = 10,
     is_active: Optional[bool] = None,
-    current_admin: Admin = Depends(get_current_admin),
-    session: AsyncSession = Depends(get_session)
+    current_admin: Admin = Depends(get_current_admin_read),
+    session: AsyncSession = Depends(get_read_session)
 ) -> dict:
     """List all users with pagination and optional filtering (Admin only)."""
     logger.info(f"Admin listing users - page: {page}, page_size: {page_size}, is_active: {is_active}")
@@ -265,10 +305,7 @@ async def list_users(
         query = query.where(User.is_active == is_active)
 
     # Get total count
-    count_query = select(func.count()).select_from(User)
-    if is_active is not None:
-        count_query = count_query.where(User.is_active == is_active)
-    result = await session.execute(count_query)
+    result = await session.execute(user_count(is_active), {"is_active": is_active})
     total = result.scalar_one()
 
     # Apply pagination
@@ -10,3 +10,22 @@ class TokenData(BaseModel):
 class LoginRequest(BaseModel):
     username: str
     password: str
+
+
+# === Token introspection (RFC 7662) ===
+class IntrospectionResponse(BaseModel):
+    active: bool
+    sub: str | None = None
+    username: str | None = None
+    role: str | None = None
+    principal_type: str | None = None
+    token_type: str | None = None
+    exp: int | None = None
+
+
+class BatchIntrospectionRequest(BaseModel):
+    tokens: list[str]
+
+
+class BatchIntrospectionResponse(BaseModel):
+    results: list[IntrospectionResponse]
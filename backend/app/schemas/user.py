@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, StringConstraints, ConfigDict, Field
-from typing import Annotated, Optional
+from typing import Annotated, List, Optional, Union
 from datetime import datetime
 
 
@@ -63,6 +63,31 @@ class ChangePasswordRequest(BaseModel):
     new_password: Annotated[str, StringConstraints(min_length=8)]
 
 
+# ---------- Batch Lookup ----------
+MAX_BATCH_LOOKUP = 100
+
+
+class UserBatchRequest(BaseModel):
+    """Schema for looking up many users in one call"""
+    keys: List[Union[int, str]] = Field(
+        min_length=1,
+        max_length=MAX_BATCH_LOOKUP,
+        description="User IDs (numbers) and/or usernames (strings)",
+    )
+
+
+class UserBatchItem(BaseModel):
+    """One requested key and the user it resolved to, if any"""
+    key: Union[int, str]
+    found: bool
+    user: Optional[UserRead] = None
+
+
+class UserBatchResponse(BaseModel):
+    """Schema for batch lookup response; items follow the order of the request keys"""
+    items: List[UserBatchItem]
+
+
 # ---------- User List (Paginated) ----------
 class UserListResponse(BaseModel):
     """Schema for paginated user list response"""
@@ -0,0 +1,41 @@
+"""
+Pick password hashing cost for the current hardware.
+
+Run on the deployment hardware (e.g. as a one-off container) and copy the
+printed settings into the environment:
+
+    python -m backend.app.scripts.calibrate_password_hash [--target-ms 250] [--scheme bcrypt]
+
+Existing hashes are upgraded automatically on the next successful login.
+"""
+import argparse
+
+from backend.app.core.config import settings
+from backend.app.core.security import calibrate_argon2_time_cost, calibrate_bcrypt_rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibrate password hash cost")
+    parser.add_argument("--target-ms", type=float, default=settings.password_hash_target_ms,
+                        help="Target verify latency in milliseconds")
+    parser.add_argument("--scheme", default=settings.password_hash_scheme, choices=["bcrypt", "argon2id"])
+    args = parser.parse_args()
+
+    if args.scheme == "argon2id":
+        time_cost, elapsed = calibrate_argon2_time_cost(
+            args.target_ms,
+            memory_cost=settings.argon2_memory_cost,
+            parallelism=settings.argon2_parallelism,
+        )
+        print(f"✅ argon2id time_cost={time_cost} verifies in {elapsed:.1f} ms (target {args.target_ms:.0f} ms)")
+        print("PASSWORD_HASH_SCHEME=argon2id")
+        print(f"ARGON2_TIME_COST={time_cost}")
+    else:
+        rounds, elapsed = calibrate_bcrypt_rounds(args.target_ms)
+        print(f"✅ bcrypt rounds={rounds} verifies in {elapsed:.1f} ms (target {args.target_ms:.0f} ms)")
+        print("PASSWORD_HASH_SCHEME=bcrypt")
+        print(f"BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Generate a new JWT signing key for rotation.
+
+Usage:
+    python -m backend.app.scripts.generate_jwt_key --dir keys/jwt [--algorithm RS256] [--kid 2025-10]
+
+The new key becomes the signer on the next key ring reload (unless
+JWT_ACTIVE_KID pins another one). Remove the old file once every token it
+signed has expired.
+"""
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+CURVES = {"ES256": ec.SECP256R1(), "ES384": ec.SECP384R1(), "ES512": ec.SECP521R1()}
+
+
+def generate_private_key(algorithm: str):
+    """Create a private key suitable for `algorithm`."""
+    algorithm = algorithm.upper()
+    if algorithm.startswith("RS"):
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm in CURVES:
+        return ec.generate_private_key(CURVES[algorithm])
+    if algorithm == "EDDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported algorithm: {algorithm}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a JWT signing key")
+    parser.add_argument("--dir", required=True, help="Key directory (JWT_KEYS_DIR)")
+    parser.add_argument("--algorithm", default="RS256", help="RS256/RS384/RS512/ES256/ES384/ES512/EdDSA")
+    parser.add_argument("--kid", default=None, help="Key ID (defaults to a UTC timestamp)")
+    args = parser.parse_args()
+
+    kid = args.kid or datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    key_dir = Path(args.dir)
+    key_dir.mkdir(parents=True, exist_ok=True)
+    path = key_dir / f"{kid}.pem"
+    if path.exists():
+        raise SystemExit(f"❌ {path} already exists")
+
+    pem = generate_private_key(args.algorithm).private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    path.write_bytes(pem)
+    path.chmod(0o600)
+    print(f"✅ Wrote {args.algorithm} key '{kid}' to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Production server launcher.
+
+    python -m backend.app.server            # gunicorn master + uvicorn workers
+    python -m backend.app.server --reload   # single auto-reloading process for development
+
+The master forks one uvicorn worker per CPU of the container's quota
+(WEB_CONCURRENCY overrides it), each on uvloop and httptools when they are
+installed. The rate limiter and login throttle count in process memory
+unless given a shared store (RATE_LIMIT_STORAGE_URI,
+LOGIN_THROTTLE_STORAGE_URI); until then a single worker runs, since each
+worker would otherwise enforce its own limits. Workers are replaced after SERVER_MAX_REQUESTS requests, plus a
+random jitter so they do not all restart at once; this bounds slow memory
+growth without a cold start for every worker together.
+
+Worker processes each keep their own Prometheus values, so the master sets
+PROMETHEUS_MULTIPROC_DIR before forking: workers write their samples there
+and /metrics (routers/metrics.py) merges them across the live workers.
+"""
+import argparse
+import importlib.util
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from gunicorn import util
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+
+from backend.app.core.config import settings
+from backend.app.core.logging.config import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+APP = "backend.app.main:app"
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Explicit rather than uvicorn's "auto", so the choice is logged at startup
+LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+HTTP = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def _cgroup_quota(root: Path) -> Optional[float]:
+    """CPU limit from cgroup v2 `cpu.max`, else v1 CFS quota; None when unlimited."""
+    cpu_max = _read(root / "cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+
+    for controller in ("cpu", "cpu,cpuacct"):
+        quota = _read(root / controller / "cpu.cfs_quota_us")
+        period = _read(root / controller / "cpu.cfs_period_us")
+        if quota and period and int(quota) > 0:
+            return int(quota) / int(period)
+    return None
+
+
+def cpu_quota(cgroup_root: Path = CGROUP_ROOT) -> float:
+    """
+    CPUs this process may use: the cgroup quota (`docker run --cpus`),
+    capped by the CPUs it may be scheduled on.
+
+    `os.cpu_count()` reports the host's CPUs, which inside a container is
+    usually far more than the container may use.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        available = float(len(os.sched_getaffinity(0)))
+    else:
+        available = float(os.cpu_count() or 1)
+    try:
+        quota = _cgroup_quota(cgroup_root)
+    except ValueError:
+        quota = None
+    return min(quota, available) if quota else available
+
+
+def memory_limiters() -> List[str]:
+    """Limiters whose counters live in process memory, so each worker keeps its own."""
+    storage = {
+        "rate limiter": settings.rate_limit_storage_uri,
+        "login throttle": settings.login_throttle_storage_uri,
+    }
+    return [name for name, uri in storage.items() if uri.startswith(("memory://", "async+memory://"))]
+
+
+def worker_count(
+    configured: Optional[int] = None,
+    quota: Optional[float] = None,
+    per_worker_limits: bool = False,
+) -> int:
+    """
+    Worker processes to run: `configured` (WEB_CONCURRENCY) if set, else one
+    per CPU of the quota, rounding a fractional quota up.
+
+    Async workers spend their waits on the event loop rather than a thread,
+    so one per CPU keeps every CPU busy; more only adds memory and
+    database connections.
+
+    Args:
+        configured: WEB_CONCURRENCY
+        quota: CPUs available (default: the cgroup quota)
+        per_worker_limits: A limiter counts in process memory; without
+            `configured`, run one worker so its limits stay as configured
+    """
+    if configured:
+        return max(1, configured)
+    if per_worker_limits:
+        return 1
+    return max(1, math.ceil(cpu_quota() if quota is None else quota))
+
+
+def prepare_multiprocess_dir(path: Optional[str] = None) -> str:
+    """
+    Point prometheus_client at a per-run directory and clear samples
+    left there by a previous run.
+
+    Must run in the master before anything imports prometheus_client,
+    which reads PROMETHEUS_MULTIPROC_DIR once at import.
+    """
+    directory = Path(path or Path(tempfile.gettempdir()) / "adl-prometheus")
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.db"):
+        stale.unlink()
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(directory)
+    return str(directory)
+
+
+class Worker(UvicornWorker):
+    """Uvicorn worker on the fastest installed loop and HTTP parser."""
+
+    CONFIG_KWARGS = {
+        "loop": LOOP,
+        "http": HTTP,
+        # On SIGTERM uvicorn closes its sockets, then waits this long for
+        # open requests (cancelling the rest) before lifespan shutdown runs
+        "timeout_graceful_shutdown": math.ceil(settings.shutdown_drain_seconds),
+    }
+
+
+def child_exit(server, worker) -> None:
+    """Drop a dead worker's live gauges from the merged metrics."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+class Server(BaseApplication):
+    """Gunicorn master for the app, configured from settings rather than a config file."""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Runs in each worker after the fork (no preload), so every worker
+        # gets its own engines and event loop
+        return util.import_app(APP)
+
+
+def gunicorn_options(workers: int) -> dict:
+    """Gunicorn settings for `workers` uvicorn workers."""
+    return {
+        "bind": f"{settings.host or '0.0.0.0'}:{settings.backend_port or 8000}",
+        "workers": workers,
+        "worker_class": Worker,
+        "keepalive": settings.server_keepalive_seconds,
+        "backlog": settings.server_backlog,
+        "max_requests": settings.server_max_requests,
+        "max_requests_jitter": settings.server_max_requests_jitter,
+        # Uvicorn's wait plus lifespan shutdown (flush, dispose pools) must fit
+        "graceful_timeout": math.ceil(settings.shutdown_drain_seconds) + 5,
+        "timeout": settings.server_worker_timeout,
+        "child_exit": child_exit,
+        # Only nginx may set the client address through X-Forwarded-For
+        "forwarded_allow_ips": settings.forwarded_allow_ips,
+        "accesslog": None,
+        "loglevel": settings.log_level.lower(),
+    }
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the ADL backend")
+    parser.add_argument("--reload", action="store_true", help="single auto-reloading process (development)")
+    args = parser.parse_args(argv)
+
+    if args.reload:
+        import uvicorn
+
+        uvicorn.run(
+            APP,
+            host=settings.host or "127.0.0.1",
+            port=settings.backend_port or 8000,
+            reload=True,
+            timeout_graceful_shutdown=math.ceil(settings.shutdown_drain_seconds),
+            forwarded_allow_ips=settings.forwarded_allow_ips,
+            loop=LOOP,
+            http=HTTP,
+        )
+        return
+
+    # Console only: the workers own the log files
+    setup_logging(log_level=settings.log_level, log_dir=None, enable_json=settings.enable_json_logs)
+    in_memory = memory_limiters()
+    workers = worker_count(settings.web_concurrency, per_worker_limits=bool(in_memory))
+    if in_memory and workers > 1:
+        logger.warning(
+            f"⚠️  {workers} workers with the {' and '.join(in_memory)} in memory: each worker enforces "
+            f"its own limits, so clients get up to {workers}x the configured allowance"
+        )
+    elif in_memory and not settings.web_concurrency:
+        logger.warning(
+            f"⚠️  Running 1 worker because the {' and '.join(in_memory)} count in memory; "
+            f"set RATE_LIMIT_STORAGE_URI and LOGIN_THROTTLE_STORAGE_URI to a shared store (redis://) to use every CPU"
+        )
+    prepare_multiprocess_dir(settings.prometheus_multiproc_dir)
+    logger.info(
+        f"🚀 Starting {workers} worker(s) ({LOOP}, {HTTP}), each recycled after "
+        f"{settings.server_max_requests}-{settings.server_max_requests + settings.server_max_requests_jitter} requests"
+    )
+    Server(gunicorn_options(workers)).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,11 @@
-import aiosmtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 import logging
 
+from backend.app.core import tracing
 from backend.app.core.config import settings
+from backend.app.core.logging.config import get_request_id
 
 logger = logging.getLogger(__name__)
 
@@ -25,14 +24,21 @@ class EmailService:
         self.use_tls = settings.smtp_use_tls
         self.use_ssl = settings.smtp_use_ssl
         
-        # Setup Jinja2 template environment
-        template_dir = Path(__file__).parent.parent / "templates" / "emails"
-        template_dir.mkdir(parents=True, exist_ok=True)
-        
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(str(template_dir)),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
+        self._jinja_env = None
+
+    @property
+    def jinja_env(self):
+        """Jinja2 template environment, created on first render (keeps Jinja2 off the import path)."""
+        if self._jinja_env is None:
+            from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+            template_dir = Path(__file__).parent.parent / "templates" / "emails"
+            template_dir.mkdir(parents=True, exist_ok=True)
+            self._jinja_env = Environment(
+                loader=FileSystemLoader(str(template_dir)),
+                autoescape=select_autoescape(['html', 'xml'])
+            )
+        return self._jinja_env
     
     def _is_configured(self) -> bool:
         """Check if email service is properly configured."""
@@ -72,11 +78,19 @@ class EmailService:
             return False
         
         try:
+            import aiosmtplib
+            from email.mime.multipart import MIMEMultipart
+            from email.mime.text import MIMEText
+
             # Create message
             message = MIMEMultipart("alternative")
             message["Subject"] = subject
             message["From"] = f"{self.from_name} <{self.from_email}>"
             message["To"] = to_email
+            # Ties the message (and any bounce) to the request that sent it
+            request_id = get_request_id()
+            if request_id:
+                message["X-Request-ID"] = request_id
             
             if cc:
                 message["Cc"] = ", ".join(cc)
@@ -93,26 +107,27 @@ class EmailService:
             message.attach(html_part)
             
             # Send email via SMTP
-            if self.use_ssl:
-                await aiosmtplib.send(
-                    message,
-                    hostname=self.smtp_host,
-                    port=self.smtp_port,
-                    username=self.smtp_user,
-                    password=self.smtp_password,
-                    use_tls=False,
-                    start_tls=False
-                )
-            else:
-                await aiosmtplib.send(
-                    message,
-                    hostname=self.smtp_host,
-                    port=self.smtp_port,
-                    username=self.smtp_user,
-                    password=self.smtp_password,
-                    use_tls=self.use_tls,
-                    start_tls=self.use_tls
-                )
+            with tracing.span("smtp.send", {"smtp.host": self.smtp_host or "", "smtp.port": self.smtp_port}):
+                if self.use_ssl:
+                    await aiosmtplib.send(
+                        message,
+                        hostname=self.smtp_host,
+                        port=self.smtp_port,
+                        username=self.smtp_user,
+                        password=self.smtp_password,
+                        use_tls=False,
+                        start_tls=False
+                    )
+                else:
+                    await aiosmtplib.send(
+                        message,
+                        hostname=self.smtp_host,
+                        port=self.smtp_port,
+                        username=self.smtp_user,
+                        password=self.smtp_password,
+                        use_tls=self.use_tls,
+                        start_tls=self.use_tls
+                    )
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -281,5 +296,14 @@ class EmailService:
         )
 
 
-# Global email service instance
-email_service = EmailService()
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_email_service() -> EmailService:
+    """Shared email service instance, created on first use."""
+    return EmailService()
+
+
+def __getattr__(name: str):
+    # `from backend.app.services.email import email_service` keeps working
+    if name == "email_service":
+        return get_email_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,10 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
 from typing import Optional
 import logging
 
+from backend.app.core import tracing
 from backend.app.core.config import settings
+from backend.app.core.logging.config import get_request_id
 
 
 logger = logging.getLogger(__name__)
@@ -47,11 +47,19 @@ class EmailService:
                 logger.warning("Email service not configured. Skipping email send.")
                 return False
             
+            import smtplib
+            from email.mime.text import MIMEText
+            from email.mime.multipart import MIMEMultipart
+
             # Create message
             message = MIMEMultipart("alternative")
             message["Subject"] = subject
             message["From"] = f"{self.from_name} <{self.from_email}>"
             message["To"] = to_email
+            # Ties the message (and any bounce) to the request that sent it
+            request_id = get_request_id()
+            if request_id:
+                message["X-Request-ID"] = request_id
             
             # Add text part (fallback)
             if text_content:
@@ -63,7 +71,8 @@ class EmailService:
             message.attach(part2)
             
             # Connect and send
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            with tracing.span("smtp.send", {"smtp.host": self.smtp_server or "", "smtp.port": self.smtp_port}), \
+                    smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
                 if self.use_tls:
                     server.starttls()
                 
@@ -246,5 +255,14 @@ class EmailService:
         return self.send_email(to_email, subject, html_content, text_content)
 
 
-# Singleton instance
-email_service = EmailService()
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_email_service() -> EmailService:
+    """Shared email service instance, created on first use."""
+    return EmailService()
+
+
+def __getattr__(name: str):
+    # `from backend.app.services.email_service import email_service` keeps working
+    if name == "email_service":
+        return get_email_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
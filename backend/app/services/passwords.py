@@ -0,0 +1,46 @@
+"""
+Password maintenance tasks that run outside the request/response path.
+"""
+from typing import Type, Union
+
+from sqlalchemy import update
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.core.logging.config import get_logger
+from backend.app.core.security import hash_password
+from backend.app.db.session import async_session_maker
+from backend.app.models.admin import Admin
+from backend.app.models.user import User
+
+logger = get_logger(__name__)
+
+
+async def rehash_password(
+    model: Type[Union[User, Admin]],
+    principal_id: int,
+    old_hash: str,
+    password: str,
+) -> None:
+    """
+    Upgrade a stored password hash to the current hashing policy.
+
+    Scheduled as a background task after a successful login, so the caller
+    never waits for the (deliberately slow) hash. The UPDATE only applies if
+    the stored hash is still `old_hash`, so a password change that lands in
+    between is never overwritten. `updated_at` is left untouched because the
+    profile itself did not change.
+    """
+    try:
+        new_hash = await run_in_threadpool(hash_password, password)
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(model)
+                .where(model.id == principal_id, model.hashed_password == old_hash)
+                .values(hashed_password=new_hash, updated_at=model.updated_at)
+            )
+            await session.commit()
+
+        if result.rowcount:
+            logger.info(f"Upgraded password hash for {model.__name__} ID {principal_id}")
+    except Exception as e:
+        logger.error(f"Password rehash failed for {model.__name__} ID {principal_id}: {str(e)}")
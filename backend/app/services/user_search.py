@@ -0,0 +1,153 @@
+"""
+Admin user search over username, email and full name.
+
+On PostgreSQL, migration 002 indexes `lower(column)` with pg_trgm GIN
+indexes (substring matches) and text_pattern_ops B-trees (prefix matches):
+
+- Queries of TRIGRAM_MIN_LENGTH or more characters match a substring of any
+  of the three columns.
+- Shorter queries have no trigrams to look up, so they match username and
+  email prefixes instead.
+
+Matches are ranked: exact username/email first, then prefixes, then by
+trigram similarity. Pages are keyset-paginated on (rank, id), so page 100
+costs the same as page 1. Each search runs under a `statement_timeout`.
+
+SQLite (local tests) has no pg_trgm: the same LIKE filters are used and the
+rank comes from the exact/prefix boosts alone.
+"""
+import base64
+import binascii
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, case, cast, func, or_
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from backend.app.core.config import settings
+from backend.app.core.exceptions import InvalidInputException, QueryTimeoutException
+from backend.app.core.logging.config import get_logger
+from backend.app.models.user import User
+
+logger = get_logger(__name__)
+
+TRIGRAM_MIN_LENGTH = 3
+QUERY_CANCELED = "57014"  # PostgreSQL SQLSTATE raised by statement_timeout
+
+# Rank boosts; similarity (0-1) is scaled to 0-1000 so ranks stay integers
+# and compare exactly in the keyset condition
+EXACT_BOOST = 2000
+PREFIX_BOOST = 1000
+
+
+def encode_cursor(rank: int, user_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{rank}:{user_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Raises:
+        InvalidInputException: If the cursor was not produced by `encode_cursor`
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        rank, user_id = raw.split(":")
+        return int(rank), int(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidInputException("cursor", "not a cursor returned by this endpoint")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def search_users(
+    session: AsyncSession,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+) -> Tuple[List[User], Optional[str]]:
+    """
+    Find users whose username, email or full name matches `q`.
+
+    Args:
+        session: Database session
+        q: Search text (case-insensitive)
+        limit: Page size
+        cursor: `next_cursor` from the previous page
+        is_active: Only return users with this status (optional)
+
+    Returns:
+        Tuple of (users on this page, cursor for the next page or None)
+
+    Raises:
+        InvalidInputException: If the cursor is malformed
+        QueryTimeoutException: If the search exceeds USER_SEARCH_TIMEOUT_MS
+    """
+    term = q.strip().lower()
+    if not term:
+        return [], None
+    escaped = _escape_like(term)
+    postgres = session.bind.dialect.name == "postgresql"
+
+    username = func.lower(User.username)
+    email = func.lower(User.email)
+    full_name = func.lower(func.coalesce(User.full_name, ""))
+    prefix = f"{escaped}%"
+
+    if len(term) >= TRIGRAM_MIN_LENGTH:
+        contains = f"%{escaped}%"
+        match = or_(
+            username.like(contains, escape="\\"),
+            email.like(contains, escape="\\"),
+            full_name.like(contains, escape="\\"),
+        )
+    else:
+        match = or_(username.like(prefix, escape="\\"), email.like(prefix, escape="\\"))
+
+    rank = case(
+        (or_(username == term, email == term), EXACT_BOOST),
+        (or_(username.like(prefix, escape="\\"), email.like(prefix, escape="\\")), PREFIX_BOOST),
+        else_=0,
+    )
+    if postgres:
+        similarity = func.greatest(
+            func.similarity(username, term),
+            func.similarity(email, term),
+            func.similarity(full_name, term),
+        )
+        rank = rank + cast(similarity * 1000, Integer)
+
+    ranked = rank.label("rank")
+    query = select(User, ranked).where(match)
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
+    if cursor:
+        last_rank, last_id = decode_cursor(cursor)
+        query = query.where(or_(rank < last_rank, and_(rank == last_rank, User.id < last_id)))
+    # One extra row tells us whether there is a next page
+    query = query.order_by(ranked.desc(), User.id.desc()).limit(limit + 1)
+
+    try:
+        if postgres:
+            # SET LOCAL: only this transaction; is_local=true in set_config
+            await session.execute(
+                select(func.set_config("statement_timeout", f"{settings.user_search_timeout_ms}ms", True))
+            )
+        rows = (await session.execute(query)).all()
+    except DBAPIError as e:
+        sqlstate = getattr(e.orig, "sqlstate", None) or getattr(e.orig, "pgcode", None)
+        if sqlstate != QUERY_CANCELED:
+            raise
+        await session.rollback()
+        logger.warning(f"⚠️  User search for {q!r} hit the {settings.user_search_timeout_ms}ms statement timeout")
+        raise QueryTimeoutException("The search took too long; try a more specific query")
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_user, last_rank = rows[-1]
+        next_cursor = encode_cursor(last_rank, last_user.id)
+    return [user for user, _ in rows], next_cursor
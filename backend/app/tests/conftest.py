@@ -19,6 +19,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+# Settings are read when the app is imported below, so the test environment
+# has to be in place first (the fixture at the bottom runs too late for that)
+os.environ["ENVIRONMENT"] = "test"
+
 import asyncio
 import pytest
 from typing import AsyncGenerator
@@ -30,7 +34,12 @@ from sqlalchemy.pool import NullPool
 
 # Import your app
 from backend.app.main import app
-from backend.app.db.session import get_session
+from backend.app.db.session import get_read_session, get_session
+from backend.app.core.health import health_monitor
+from backend.app.core.loop_monitor import EventLoopMonitor
+from backend.app.core import tracing
+from backend.app.core.config import settings
+from backend.app.core.introspection import introspection_cache
 from sqlmodel import SQLModel
 from backend.app.models.user import User
 from backend.app.models.admin import Admin
@@ -218,12 +227,68 @@ async def async_client(db_session: AsyncSession) -> AsyncGenerator:
         yield db_session
     
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
+    # /health probes the test database, and not from a snapshot of the real one
+    real_health_sessions = health_monitor.session_maker
+    health_monitor.session_maker = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    health_monitor.invalidate()
     
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     
     # Clean up override after test
     app.dependency_overrides.clear()
+    health_monitor.session_maker = real_health_sessions
+    health_monitor.invalidate()
+
+
+# ==================== EVENT LOOP FIXTURES ====================
+@pytest.fixture
+async def no_loop_blocking() -> AsyncGenerator:
+    """
+    Fail the test if anything blocks the event loop for longer than
+    LOOP_BLOCK_TEST_THRESHOLD_MS (default 100ms) while it runs.
+    Request it after the fixtures that set up data, so only the test body is watched.
+    """
+    threshold_ms = float(os.getenv("LOOP_BLOCK_TEST_THRESHOLD_MS", "100"))
+    monitor = EventLoopMonitor(interval=0.01, threshold=threshold_ms / 1000)
+    monitor.start()
+    yield monitor
+    await monitor.stop()
+    monitor.raise_for_blocking()
+
+
+# ==================== TRACING FIXTURES ====================
+@pytest.fixture
+def span_exporter(test_engine):
+    """
+    Enable tracing with every trace sampled, collecting spans in memory.
+    Spans are batched; call tracing.shutdown_tracing() to flush them before asserting.
+    """
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    tracing.configure_tracing(exporter=exporter, sample_ratio=1.0)
+    # Tests run their SQL on the test engine, not the app's
+    tracing.instrument_engine(test_engine.sync_engine)
+    yield exporter
+    tracing.shutdown_tracing()
+
+
+@pytest.fixture
+def introspection_client(monkeypatch):
+    """
+    Register an introspection client and return its Basic auth headers.
+    The result cache is per process, so it is emptied around each test.
+    """
+    import base64
+    from pydantic import SecretStr
+
+    monkeypatch.setattr(settings, "introspection_clients", SecretStr("gateway:s3cret"))
+    introspection_cache.clear()
+    yield {"Authorization": "Basic " + base64.b64encode(b"gateway:s3cret").decode()}
+    introspection_cache.clear()
 
 
 # ==================== JWT TOKEN FIXTURES ====================
@@ -7,6 +7,7 @@ from httpx import AsyncClient
 from fastapi import status
 from datetime import timedelta
 
+from backend.app.core import tracing
 from backend.app.core.security import create_access_token
 
 
@@ -540,4 +541,407 @@ async def test_health_check_endpoint(async_client: AsyncClient):
     assert "database" in health_data
     
     # Database should be connected
-    assert health_data["database"]["connected"] is True
\ No newline at end of file
+    assert health_data["database"]["connected"] is True
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_user_gauges_refresh_and_track_registrations(async_client: AsyncClient, db_session):
+    """Test that user gauges are recounted by the collector and nudged by registrations"""
+    from backend.app.core.user_stats import UserStatsCollector
+    from backend.app.routers.metrics import active_users_gauge, registered_users_gauge
+
+    assert await UserStatsCollector().refresh(db_session) == (0, 0, False)
+
+    response = await async_client.post("/api/users/register", json={
+        "username": "gaugeuser",
+        "email": "gauge@example.com",
+        "password": "GaugePass123!",
+        "full_name": "Gauge User"
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    assert registered_users_gauge._value.get() == 1
+    assert active_users_gauge._value.get() == 1
+
+    # Drift, e.g. a user deactivated directly in the database
+    active_users_gauge.set(0)
+
+    # The next refresh corrects any drift from the database
+    await UserStatsCollector().refresh(db_session)
+    assert active_users_gauge._value.get() == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_register_and_login_do_not_block_event_loop(async_client: AsyncClient, no_loop_blocking):
+    """Test that password hashing runs off the event loop"""
+    user_data = {
+        "username": "loopuser",
+        "email": "loop@example.com",
+        "password": "LoopPass123!",
+        "full_name": "Loop User"
+    }
+    response = await async_client.post("/api/users/register", json=user_data)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await async_client.post("/api/users/login", json={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_login_is_traced_with_request_id(async_client: AsyncClient, span_exporter):
+    """Test that a sampled login records server, SQL and hashing spans"""
+    user_data = {
+        "username": "traceuser",
+        "email": "trace@example.com",
+        "password": "TracePass123!",
+        "full_name": "Trace User"
+    }
+    response = await async_client.post("/api/users/register", json=user_data)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await async_client.post("/api/users/login", json={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+    assert response.status_code == status.HTTP_200_OK
+    tracing.shutdown_tracing()
+
+    spans = span_exporter.get_finished_spans()
+    server = next(span for span in spans if span.name == "POST /api/users/login")
+    assert server.attributes["request.id"] == response.headers["X-Request-ID"]
+    assert server.attributes["http.response.status_code"] == 200
+    assert server.attributes["http.route"] == "/api/users/login"
+
+    children = [span for span in spans if span.context.trace_id == server.context.trace_id and span is not server]
+    names = {span.name for span in children}
+    assert {"db.query", "password.verify"} <= names
+    query = next(span for span in children if span.name == "db.query")
+    assert "SELECT" in query.attributes["db.statement"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_unsampled_requests_record_no_spans(async_client: AsyncClient, span_exporter):
+    """Test head-based sampling: dropped traces record nothing, sampled parents are honoured"""
+    # Same in-memory setup as span_exporter, but with head sampling off
+    tracing.shutdown_tracing()
+    span_exporter = type(span_exporter)()
+    tracing.configure_tracing(exporter=span_exporter, sample_ratio=0.0)
+
+    response = await async_client.get("/api/users/me")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    response = await async_client.get("/livez", headers={
+        "traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"
+    })
+    assert response.status_code == status.HTTP_200_OK
+    tracing.shutdown_tracing()
+
+    spans = span_exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["GET /livez"]
+    assert format(spans[0].context.trace_id, "032x") == trace_id
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_admin_user_search_ranks_and_pages(async_client: AsyncClient, db_session, test_admin):
+    """Test admin search over username, email and full name with keyset pages"""
+    from backend.app.models.user import User
+
+    db_session.add_all([
+        User(username="alice", email="alice@example.com", full_name="Alice Smith", hashed_password="x"),
+        User(username="alicia", email="alicia@example.com", full_name="Alicia Jones", hashed_password="x"),
+        User(username="bob", email="bob@example.com", full_name="Bob Alison", hashed_password="x"),
+        User(username="malice", email="malice@example.com", full_name=None, hashed_password="x"),
+        User(username="carol", email="carol@example.com", full_name="Carol King", hashed_password="x"),
+    ])
+    await db_session.commit()
+    token = create_access_token({"id": test_admin.id, "role": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Substring match on any field, exact username first, then prefixes
+    response = await async_client.get("/api/admins/users/search?q=ALI", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    usernames = [user["username"] for user in data["items"]]
+    assert set(usernames) == {"alice", "alicia", "bob", "malice"}
+    assert set(usernames[:2]) == {"alice", "alicia"}
+    assert data["next_cursor"] is None
+
+    response = await async_client.get("/api/admins/users/search?q=alice", headers=headers)
+    assert response.json()["items"][0]["username"] == "alice"
+
+    # Short queries match username/email prefixes only
+    response = await async_client.get("/api/admins/users/search?q=ca", headers=headers)
+    assert [user["username"] for user in response.json()["items"]] == ["carol"]
+
+    # Keyset pages cover every match exactly once
+    seen, cursor = [], None
+    while True:
+        params = {"q": "example", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await async_client.get("/api/admins/users/search", params=params, headers=headers)
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen += [user["username"] for user in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == ["alice", "alicia", "bob", "carol", "malice"]
+
+    response = await async_client.get("/api/admins/users/search?q=ali&cursor=%%%", headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await async_client.get("/api/admins/users/search?q=ali")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_admin_batch_user_lookup(async_client: AsyncClient, db_session, test_admin):
+    """Test resolving IDs and usernames in one call, in request order"""
+    from backend.app.models.user import User
+
+    alice = User(username="alice", email="alice@example.com", hashed_password="x")
+    bob = User(username="bob", email="bob@example.com", hashed_password="x")
+    db_session.add_all([alice, bob])
+    await db_session.commit()
+    token = create_access_token({"id": test_admin.id, "role": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    keys = [bob.id, "alice", 999999, "nobody", alice.id, bob.id]
+    response = await async_client.post("/api/admins/users/batch", json={"keys": keys}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    items = response.json()["items"]
+    assert [item["key"] for item in items] == keys
+    assert [item["found"] for item in items] == [True, True, False, False, True, True]
+    assert [item["user"] and item["user"]["username"] for item in items] == [
+        "bob", "alice", None, None, "alice", "bob"
+    ]
+    assert "hashed_password" not in items[0]["user"]
+
+    response = await async_client.post(
+        "/api/admins/users/batch", json={"keys": list(range(101))}, headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await async_client.post("/api/admins/users/batch", json={"keys": [alice.id]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_profiler_releases_connection_while_sampling(
+    async_client: AsyncClient, db_session, test_admin, monkeypatch
+):
+    """Test the profiler endpoint holds no transaction (pooled connection) while it samples"""
+    from backend.app.core.config import settings
+    from backend.app.routers import profiler
+
+    test_admin.is_superadmin = True
+    db_session.add(test_admin)
+    await db_session.commit()
+    monkeypatch.setattr(settings, "profiler_enabled", True)
+
+    in_transaction = []
+
+    class Profile:
+        def collapsed(self):
+            return ""
+
+    class RecordingProfiler:
+        async def run(self, seconds, interval):
+            in_transaction.append(db_session.in_transaction())
+            return Profile()
+
+    monkeypatch.setattr(profiler, "sampling_profiler", RecordingProfiler())
+
+    token = create_access_token({"id": test_admin.id, "role": "admin"})
+    response = await async_client.get(
+        "/api/admins/profile?seconds=0.1&format=collapsed", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert in_transaction == [False]
+
+
+# ==================== TOKEN INTROSPECTION ====================
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_token_introspection(async_client: AsyncClient, db_session, test_admin, introspection_client):
+    """Test RFC 7662 introspection: active, inactive, batch order, client auth and caching"""
+    from backend.app.models.user import User
+
+    alice = User(username="alice", email="alice@example.com", hashed_password="x")
+    dormant = User(username="dormant", email="dormant@example.com", hashed_password="x", is_active=False)
+    db_session.add_all([alice, dormant])
+    await db_session.commit()
+    alice_token = create_access_token({"id": alice.id, "role": "user"})
+    dormant_token = create_access_token({"id": dormant.id, "role": "user"})
+    admin_token = create_access_token({"id": test_admin.id, "role": "admin"})
+    expired_token = create_access_token({"id": alice.id, "role": "user"}, timedelta(seconds=-1))
+
+    response = await async_client.post(
+        "/api/auth/introspect",
+        content=f"token={alice_token}&token_type_hint=access_token",
+        headers={**introspection_client, "Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["active"] is True
+    assert body["sub"] == str(alice.id)
+    assert body["username"] == "alice"
+    assert body["role"] == "user"
+    assert body["exp"] > 0
+    assert response.headers["Cache-Control"].startswith("private, max-age=")
+
+    for token in [dormant_token, expired_token, "not-a-jwt"]:
+        response = await async_client.post(
+            "/api/auth/introspect", json={"token": token}, headers=introspection_client
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"active": False}
+        assert response.headers["Cache-Control"] == "no-store"
+
+    tokens = [admin_token, "not-a-jwt", alice_token, dormant_token]
+    response = await async_client.post(
+        "/api/auth/introspect/batch", json={"tokens": tokens}, headers=introspection_client
+    )
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [result["active"] for result in results] == [True, False, True, False]
+    assert results[0]["principal_type"] == "admin"
+    assert results[2]["username"] == "alice"
+
+    # A profile change drops the cached answer for that user's tokens
+    user_headers = {"Authorization": f"Bearer {alice_token}"}
+    await async_client.put("/api/users/me", json={"username": "alice2"}, headers=user_headers)
+    response = await async_client.post(
+        "/api/auth/introspect", json={"token": alice_token}, headers=introspection_client
+    )
+    assert response.json()["username"] == "alice2"
+
+    response = await async_client.post(
+        "/api/auth/introspect/batch", json={"tokens": ["x"] * 101}, headers=introspection_client
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await async_client.post("/api/auth/introspect", json={"token": alice_token})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = await async_client.post(
+        "/api/auth/introspect",
+        json={"token": alice_token},
+        headers={"Authorization": f"Bearer {alice_token}"},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+# ==================== CONDITIONAL GET ====================
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_conditional_get_on_profile_and_user_list(async_client: AsyncClient, db_session, test_user, test_admin):
+    """Test ETag / If-None-Match on /me and the admin user list"""
+    from backend.app.models.user import User
+
+    user_headers = {"Authorization": f"Bearer {create_access_token({'id': test_user.id, 'role': 'user'})}"}
+    response = await async_client.get("/api/users/me", headers=user_headers)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = await async_client.get("/api/users/me", headers={**user_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    await async_client.put("/api/users/me", json={"full_name": "Renamed"}, headers=user_headers)
+    response = await async_client.get("/api/users/me", headers={**user_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+    admin_headers = {"Authorization": f"Bearer {create_access_token({'id': test_admin.id, 'role': 'admin'})}"}
+    response = await async_client.get("/api/admins/me", headers=admin_headers)
+    response = await async_client.get(
+        "/api/admins/me", headers={**admin_headers, "If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = await async_client.get("/api/admins/users", headers=admin_headers)
+    list_etag = response.headers["ETag"]
+    response = await async_client.get(
+        "/api/admins/users", headers={**admin_headers, "If-None-Match": f'"other", {list_etag}'}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    response = await async_client.get(
+        "/api/admins/users?page_size=5", headers={**admin_headers, "If-None-Match": list_etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    db_session.add(User(username="newcomer", email="newcomer@example.com", hashed_password="x"))
+    await db_session.commit()
+    response = await async_client.get("/api/admins/users", headers={**admin_headers, "If-None-Match": list_etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert "newcomer" in [user["username"] for user in response.json()["items"]]
+
+
+# ==================== LOGIN ACTIVITY ====================
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_login_activity_is_written_behind_in_batches(async_client: AsyncClient, db_session, monkeypatch):
+    """Test that logins are buffered per principal and flushed in one batch without touching updated_at"""
+    from datetime import datetime, timezone
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from backend.app.core import login_activity as login_activity_module
+    from backend.app.core.login_activity import LoginActivityBuffer
+    from backend.app.models.user import User
+
+    buffer = LoginActivityBuffer(session_maker=async_sessionmaker(db_session.bind, expire_on_commit=False))
+    monkeypatch.setattr(login_activity_module, "login_activity", buffer)
+
+    credentials = {"username": "frequent", "password": "FrequentPass123!"}
+    response = await async_client.post(
+        "/api/users/register", json={**credentials, "email": "frequent@example.com"}
+    )
+    user_id = response.json()["id"]
+    for _ in range(3):
+        response = await async_client.post("/api/users/login", json=credentials)
+        assert response.status_code == status.HTTP_200_OK
+    await async_client.post("/api/users/login", json={**credentials, "password": "WrongPass123!"})
+
+    user = await db_session.get(User, user_id)
+    updated_at = user.updated_at
+    assert user.login_count == 0  # nothing written during the requests
+    assert buffer.pending == 1
+
+    assert await buffer.flush() == 1
+    assert buffer.pending == 0
+    await db_session.refresh(user)
+    assert user.login_count == 3
+    assert user.last_login_at is not None
+    assert user.updated_at == updated_at
+
+    # A late flush from another worker never moves last_login_at backwards
+    last_login_at = user.last_login_at
+    buffer.record("user", user_id, at=datetime.now(timezone.utc) - timedelta(hours=1))
+    await buffer.flush()
+    await db_session.refresh(user)
+    assert user.login_count == 4
+    assert user.last_login_at == last_login_at
+
+    # A failed write keeps the batch for the next flush
+    def unavailable():
+        raise ConnectionError("database down")
+    buffer.session_maker = unavailable
+    buffer.record("user", user_id)
+    with pytest.raises(ConnectionError):
+        await buffer.flush()
+    assert buffer.pending == 1
@@ -445,4 +445,209 @@ async def test_user_email_case_sensitivity(db_session: AsyncSession):
     users = result.scalars().all()
     emails = [u.email for u in users]
     assert "Test@Example.com" in emails
-    assert "test@example.com" in emails
\ No newline at end of file
+    assert "test@example.com" in emails
+
+# ==================== READ REPLICA ROUTING TESTS ====================
+
+@pytest.fixture
+async def sqlite_pair(tmp_path):
+    """A primary and a 'replica' SQLite database that never replicates."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlmodel import SQLModel
+
+    engines, makers = [], []
+    for name in ("primary", "replica"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        engines.append(engine)
+        makers.append(sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    yield makers
+    for engine in engines:
+        await engine.dispose()
+
+
+def _bearer_request(token: str):
+    from starlette.requests import Request
+
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+@pytest.mark.asyncio
+async def test_replica_router_falls_back_to_primary(sqlite_pair):
+    """Test reads go to the replica only when it is reachable and caught up"""
+    from backend.app.db.replica import ReplicaRouter
+
+    primary, replica = sqlite_pair
+    router = ReplicaRouter(primary, replica, max_lag_seconds=5, lag_check_seconds=0)
+
+    assert await router.session_maker_for() is replica
+    assert router.status() == {"configured": True, "lag_seconds": 0.0, "serving_reads": True}
+
+    async def lagging():
+        return 30.0
+    router.measure_lag = lagging
+    assert await router.session_maker_for() is primary
+
+    async def unreachable():
+        raise ConnectionError("replica down")
+    router.measure_lag = unreachable
+    assert await router.session_maker_for() is primary
+    assert router.status()["serving_reads"] is False
+
+    assert await ReplicaRouter(primary).session_maker_for() is primary
+
+
+@pytest.mark.asyncio
+async def test_forged_token_claims_do_not_break_routing(sqlite_pair):
+    """Test an unsigned token with non-scalar claims routes like an anonymous read"""
+    import base64
+    import json
+    from backend.app.db.replica import ReplicaRouter, request_principal
+
+    def unsigned(claims: dict) -> str:
+        def part(data: dict) -> str:
+            return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+        return f"{part({'alg': 'none', 'typ': 'JWT'})}.{part(claims)}."
+
+    primary, replica = sqlite_pair
+    router = ReplicaRouter(primary, replica, lag_check_seconds=0)
+    for claims in ({"role": ["x"], "id": 1}, {"role": "user", "id": {"a": 1}}, {"role": {"a": 1}, "id": [1]}):
+        request = _bearer_request(unsigned(claims))
+        assert request_principal(request) is None
+        assert await router.session_maker_for(request_principal(request)) is replica
+
+    assert request_principal(_bearer_request(unsigned({"role": "user", "id": 7}))) == ("user", 7)
+
+
+@pytest.mark.asyncio
+async def test_writes_pin_principal_to_primary(sqlite_pair, monkeypatch):
+    """Test a principal who wrote through get_session reads its write back"""
+    from backend.app.core.security import create_access_token
+    from backend.app.db import session as db_session_module
+    from backend.app.db.replica import ReplicaRouter
+
+    primary, replica = sqlite_pair
+    router = ReplicaRouter(primary, replica, pin_seconds=60)
+    monkeypatch.setattr(db_session_module, "async_session_maker", primary)
+    monkeypatch.setattr(db_session_module, "replica_router", router)
+    alice = _bearer_request(create_access_token({"id": 1, "role": "user"}))
+    bob = _bearer_request(create_access_token({"id": 2, "role": "user"}))
+
+    # A read-only request through get_session does not pin
+    sessions = db_session_module.get_session(bob)
+    session = await anext(sessions)
+    await session.execute(select(User))
+    await sessions.aclose()
+    assert not router.is_pinned(("user", 2))
+
+    sessions = db_session_module.get_session(alice)
+    session = await anext(sessions)
+    session.add(User(id=1, username="alice", email="alice@example.com", hashed_password="x"))
+    await session.commit()
+    with pytest.raises(StopAsyncIteration):
+        await anext(sessions)
+
+    async def read_alice(request):
+        reads = db_session_module.get_read_session(request)
+        session = await anext(reads)
+        try:
+            return (await session.execute(select(User).where(User.id == 1))).scalar_one_or_none()
+        finally:
+            await reads.aclose()
+
+    assert (await read_alice(alice)).username == "alice"  # pinned: primary
+    assert await read_alice(bob) is None  # replica, which never got the row
+
+
+@pytest.mark.asyncio
+async def test_release_connection_ends_read_transactions_only(sqlite_pair):
+    """Test connections go back to the pool before slow work, and hold time is recorded per route"""
+    from backend.app.db.session import release_connection
+    from backend.app.routers.metrics import db_connection_hold_seconds
+
+    primary, _ = sqlite_pair
+    held = db_connection_hold_seconds.labels(route="/test/hold")
+
+    async with primary(info={"route": "/test/hold"}) as session:
+        assert not session.in_transaction()  # no connection until the first statement
+        session.add(User(username="alice", email="alice@example.com", hashed_password="x"))
+        await session.commit()
+        before = held._sum.get()
+
+        alice = (await session.execute(select(User))).scalar_one()
+        assert session.in_transaction()
+        await release_connection(session)
+        assert not session.in_transaction()
+        assert alice.username == "alice"  # still loaded after the release
+        assert held._sum.get() > before
+
+        await session.execute(select(User))
+        alice.full_name = "Alice"
+        await session.flush()
+        await release_connection(session)
+        assert session.in_transaction()  # a flushed but uncommitted write keeps it open
+        await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_principals_by_ids_sql_independent_of_batch_size(db_session: AsyncSession, test_user: User):
+    """Test PostgreSQL gets one array parameter whatever the ID count, and other databases still expand"""
+    from sqlalchemy.dialects import postgresql
+    from backend.app.core.deps import load_active_principals
+    from backend.app.db.queries import principals_by_ids
+
+    def postgres_sql(ids):
+        compiled = principals_by_ids(User, "postgresql").compile(dialect=postgresql.asyncpg.dialect())
+        return compiled.construct_params({"ids": ids}), str(compiled)
+
+    (one_params, one_sql), (many_params, many_sql) = postgres_sql([1]), postgres_sql(list(range(50)))
+    assert one_sql == many_sql
+    assert "= ANY (" in one_sql
+    assert many_params["ids"] == list(range(50))
+    assert principals_by_ids(Admin, "postgresql") is not principals_by_ids(User, "postgresql")
+
+    loaded = await load_active_principals(db_session, User, [test_user.id, test_user.id + 1000])
+    assert list(loaded) == [test_user.id]
+
+
+@pytest.mark.asyncio
+async def test_reads_routed_to_replica_are_traced(sqlite_pair, monkeypatch):
+    """Test configure_tracing instruments the replica engine, so routed reads record db.query spans"""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from backend.app.core import tracing
+    from backend.app.db import session as session_module
+    from backend.app.db.replica import ReplicaRouter
+
+    primary, replica = sqlite_pair
+    monkeypatch.setattr(session_module, "read_engine", replica.kw["bind"])
+    exporter = InMemorySpanExporter()
+    tracing.configure_tracing(exporter=exporter, sample_ratio=1.0)
+    try:
+        session_maker = await ReplicaRouter(primary, replica, lag_check_seconds=0).session_maker_for()
+        assert session_maker is replica
+        with tracing.server_span("GET /api/users/me", {}, {}):
+            async with session_maker() as session:
+                await session.execute(select(User).where(User.id == 1))
+    finally:
+        tracing.shutdown_tracing()
+
+    statements = [span.attributes["db.statement"] for span in exporter.get_finished_spans() if span.name == "db.query"]
+    assert any("FROM users" in statement for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_users_by_ids_or_usernames_handles_either_list_empty(db_session: AsyncSession, test_user: User):
+    """Test the batch lookup statement matches on either list, with the other one empty"""
+    from sqlalchemy.dialects import postgresql
+    from backend.app.db.queries import users_by_ids_or_usernames
+
+    query = users_by_ids_or_usernames(db_session.bind.dialect.name)
+    for params in ({"ids": [test_user.id], "usernames": []}, {"ids": [], "usernames": [test_user.username]}):
+        assert [user.id for user in (await db_session.execute(query, params)).scalars()] == [test_user.id]
+    assert (await db_session.execute(query, {"ids": [], "usernames": []})).first() is None
+
+    sql = str(users_by_ids_or_usernames("postgresql").compile(dialect=postgresql.asyncpg.dialect()))
+    assert sql.count("= ANY (") == 2
@@ -0,0 +1,126 @@
+"""
+Unit tests for the diagnostics tooling: sampling profiler and event-loop monitor.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.exceptions import ProfilerBusyException
+from backend.app.core.profiler import SamplingProfiler
+
+
+def _busy_loop_for_profiler(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.mark.unit
+class TestSamplingProfiler:
+    """Test suite for the stack-sampling profiler."""
+
+    async def test_samples_other_threads(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop_for_profiler, args=(stop,), name="busy-worker")
+        worker.start()
+        try:
+            profile = await SamplingProfiler().run(duration=0.2, interval=0.005)
+        finally:
+            stop.set()
+            worker.join()
+
+        assert profile.sample_count > 0
+        collapsed = profile.collapsed()
+        assert any(
+            line.startswith("busy-worker;") and "_busy_loop_for_profiler" in line
+            for line in collapsed.splitlines()
+        )
+
+        speedscope = profile.speedscope()
+        names = {frame["name"] for frame in speedscope["shared"]["frames"]}
+        assert "_busy_loop_for_profiler" in names
+        for entry in speedscope["profiles"]:
+            assert len(entry["samples"]) == len(entry["weights"])
+
+    async def test_only_one_profile_at_a_time(self):
+        profiler = SamplingProfiler()
+        first = asyncio.create_task(profiler.run(duration=0.2, interval=0.01))
+        await asyncio.sleep(0.05)
+        assert profiler.busy
+
+        with pytest.raises(ProfilerBusyException):
+            await profiler.run(duration=0.1, interval=0.01)
+
+        await first
+        assert not profiler.busy
+
+
+@pytest.mark.unit
+class TestProfilerEndpoint:
+    """Test suite for /api/admins/profile."""
+
+    def test_disabled_by_default(self, client: TestClient):
+        response = client.get("/api/admins/profile")
+        assert response.status_code == 404
+
+    def test_returns_collapsed_stacks_for_superadmin(self, client: TestClient, monkeypatch):
+        from backend.app.core.config import settings
+        from backend.app.core.deps import get_current_superadmin
+        from backend.app.main import app
+        from backend.app.models.admin import Admin
+
+        monkeypatch.setattr(settings, "profiler_enabled", True)
+        app.dependency_overrides[get_current_superadmin] = lambda: Admin(
+            id=1, username="root", email="root@example.com", hashed_password="x", is_superadmin=True
+        )
+        try:
+            response = client.get("/api/admins/profile", params={"seconds": 0.1, "format": "collapsed"})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text.strip()
+
+    def test_requires_authentication_when_enabled(self, client: TestClient, monkeypatch):
+        from backend.app.core.config import settings
+
+        monkeypatch.setattr(settings, "profiler_enabled", True)
+        response = client.get("/api/admins/profile", params={"seconds": 0.1})
+        assert response.status_code == 401
+
+
+@pytest.mark.unit
+class TestEventLoopMonitor:
+    """Test suite for the event-loop blocking detector."""
+
+    async def test_reports_blocking_stack(self):
+        import time
+
+        from backend.app.core.loop_monitor import EventLoopBlockedError, EventLoopMonitor
+
+        def blocking_call_for_monitor():
+            time.sleep(0.2)
+
+        monitor = EventLoopMonitor(interval=0.01, threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        blocking_call_for_monitor()
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+
+        assert len(monitor.events) == 1
+        assert "blocking_call_for_monitor" in monitor.events[0].stack
+        with pytest.raises(EventLoopBlockedError):
+            monitor.raise_for_blocking()
+
+    async def test_quiet_loop_has_no_events(self):
+        from backend.app.core.loop_monitor import EventLoopMonitor
+
+        monitor = EventLoopMonitor(interval=0.01, threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.2)
+        await monitor.stop()
+        monitor.raise_for_blocking()
@@ -3,9 +3,13 @@ Unit tests for health check and root endpoints.
 Tests basic functionality without database dependencies.
 """
 
+import re
+
 import pytest
 from fastapi.testclient import TestClient
 
+from backend.app.middleware.request_id import generate_request_id
+
 
 @pytest.mark.unit
 class TestHealthCheck:
@@ -32,6 +36,12 @@ class TestHealthCheck:
         assert "version" in data
         assert "environment" in data
         assert data["status"] in ["healthy", "degraded"]  # Database may not be available in test env
+
+    def test_livez_needs_no_dependencies(self, client: TestClient):
+        """Test that the liveness probe answers without touching the database."""
+        response = client.get("/livez")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
     # Root endpoint tests
     def test_root_endpoint_returns_200(self, client: TestClient):
         """Test that root endpoint returns 200 status."""
@@ -98,5 +108,249 @@ class TestHealthCheck:
         
         # Request ID should be in error responses
         assert "request_id" in error_data
-        assert len(error_data["request_id"]) == 36  # UUID format
-        assert error_data["request_id"].count("-") == 4  # UUID has 4 hyphens
+        assert len(error_data["request_id"]) == 26  # ULID-style
+        assert error_data["request_id"] == error_response.headers["X-Request-ID"]
+
+
+@pytest.mark.unit
+class TestRequestID:
+    """Test suite for request ID generation and inbound reuse."""
+
+    def test_generated_ids_are_unique_and_sortable(self):
+        """Test that generated IDs are 26 Crockford base32 chars in time order."""
+        ids = [generate_request_id() for _ in range(1000)]
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids)
+        assert all(re.fullmatch(r"[0-9A-HJKMNP-TV-Z]{26}", request_id) for request_id in ids)
+
+    def test_inbound_request_id_is_reused(self, client: TestClient):
+        """Test that a well-formed X-Request-ID from the proxy is kept."""
+        inbound = "0f8fad5b-d9cb-469f-a165-70867728950e"
+        response = client.get("/nonexistent", headers={"X-Request-ID": inbound})
+        assert response.headers["X-Request-ID"] == inbound
+        assert response.json()["request_id"] == inbound
+
+    @pytest.mark.parametrize("inbound", ["short", "a" * 129, "bad id with spaces", "<script>alert(1)</script>"])
+    def test_malformed_inbound_request_id_is_replaced(self, client: TestClient, inbound: str):
+        """Test that unusable inbound IDs are replaced by a generated one."""
+        response = client.get("/livez", headers={"X-Request-ID": inbound})
+        assert response.headers["X-Request-ID"] != inbound
+        assert len(response.headers["X-Request-ID"]) == 26
+
+
+@pytest.mark.unit
+class TestReadiness:
+    """Test suite for startup checks and the /ready gate."""
+
+    async def test_checks_run_concurrently_with_timeouts(self, monkeypatch):
+        import asyncio
+        from backend.app.core import startup_checks
+
+        async def slow():
+            await asyncio.sleep(0.3)
+            return True, "slow ok"
+
+        async def hangs():
+            await asyncio.sleep(10)
+            return True, "never"
+
+        monkeypatch.setattr(startup_checks, "readiness", startup_checks.ReadinessState())
+        monkeypatch.setattr(startup_checks, "STARTUP_CHECKS", [
+            startup_checks.StartupCheck("a", slow),
+            startup_checks.StartupCheck("b", slow),
+        ])
+        started = asyncio.get_running_loop().time()
+        results = await startup_checks.perform_startup_checks()
+        assert asyncio.get_running_loop().time() - started < 0.55
+        assert all(success for success, _ in results.values())
+        assert startup_checks.readiness.ready
+
+        result = await startup_checks.run_check(startup_checks.StartupCheck("c", hangs), timeout=0.05)
+        assert result[0] is False
+        assert "Timed out" in result[1]
+        assert not startup_checks.readiness.ready
+
+    async def test_config_checks_do_not_gate_readiness(self, monkeypatch):
+        """Test that a short SECRET_KEY warns without holding /ready, and is not flagged for RS256."""
+        from backend.app.core import startup_checks
+
+        monkeypatch.setattr(startup_checks.settings, "secret_key", "CHANGE_ME")
+        monkeypatch.setattr(startup_checks.settings, "algorithm", "HS256")
+        success, message = await startup_checks.check_security_configuration()
+        assert success is False
+        assert "SECRET_KEY" in message
+
+        monkeypatch.setattr(startup_checks.settings, "algorithm", "RS256")
+        assert (await startup_checks.check_security_configuration())[0] is True
+
+        config_checks = {"Environment Variables", "Security Configuration"}
+        assert not any(check.required for check in startup_checks.STARTUP_CHECKS if check.name in config_checks)
+
+    def test_ready_endpoint_reflects_state(self, client: TestClient, monkeypatch):
+        from backend.app.core.startup_checks import ReadinessState
+        from backend.app.routers import health
+
+        state = ReadinessState()
+        monkeypatch.setattr(health, "readiness", state)
+        assert client.get("/ready").status_code == 503
+
+        state.ready = True
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+
+@pytest.mark.unit
+class TestHealthCache:
+    """Test suite for the cached /health snapshot."""
+
+    class _CountingSession:
+        def __init__(self):
+            self.calls = 0
+            self.opened = 0
+            self.open = 0
+
+        def __call__(self):
+            # Stands in for the session maker too
+            self.opened += 1
+            return self
+
+        async def __aenter__(self):
+            self.open += 1
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.open -= 1
+
+        async def execute(self, statement):
+            import asyncio
+
+            self.calls += 1
+            await asyncio.sleep(0.05)
+
+    async def test_concurrent_probes_share_one_refresh(self):
+        import asyncio
+        from backend.app.core.health import HealthMonitor
+
+        session = self._CountingSession()
+        monitor = HealthMonitor(interval=60, session_maker=session)
+        snapshots = await asyncio.gather(*(monitor.get() for _ in range(20)))
+
+        assert session.calls == 1
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+        assert snapshots[0]["database"]["connected"] is True
+        assert snapshots[0]["database"]["latency_ms"] >= 0
+
+        # Fresh snapshot is served from cache
+        await monitor.get()
+        assert session.calls == 1
+
+        monitor.invalidate()
+        await monitor.get()
+        assert session.calls == 2
+
+    async def test_refresh_outlives_cancelled_caller(self):
+        """Test that the shared refresh uses its own session, so cancelling the first caller does not break it."""
+        import asyncio
+        from backend.app.core.health import HealthMonitor
+
+        session = self._CountingSession()
+        monitor = HealthMonitor(interval=60, session_maker=session)
+        first = asyncio.create_task(monitor.get())
+        await asyncio.sleep(0.01)
+        joined = asyncio.create_task(monitor.get())
+        first.cancel()
+
+        snapshot = await joined
+        assert snapshot["database"]["connected"] is True
+        assert session.opened == 1
+        assert session.open == 0
+
+    async def test_failed_probe_reports_degraded(self):
+        from contextlib import asynccontextmanager
+        from backend.app.core.health import HealthMonitor
+
+        class BrokenSession:
+            async def execute(self, statement):
+                raise ConnectionRefusedError("connection refused")
+
+        @asynccontextmanager
+        async def broken_session():
+            yield BrokenSession()
+
+        snapshot = await HealthMonitor(interval=60, session_maker=broken_session).get()
+        assert snapshot["status"] == "degraded"
+        assert snapshot["database"]["connected"] is False
+        assert "refused" in snapshot["database"]["error"]
+
+
+@pytest.mark.unit
+class TestOpenAPIDocument:
+    """Test suite for the pre-serialized OpenAPI schema."""
+
+    def test_openapi_served_with_etag(self, client: TestClient):
+        response = client.get("/openapi.json")
+        assert response.status_code == 200
+        assert response.json()["info"]["title"]
+        etag = response.headers["etag"]
+
+        cached = client.get("/openapi.json", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    def test_openapi_gzip_variant(self, client: TestClient):
+        import gzip
+        import json
+
+        from backend.app.core.openapi import openapi_document
+        from backend.app.main import app
+
+        document = openapi_document.get(app)
+        assert json.loads(gzip.decompress(document.gzip_body)) == json.loads(document.body)
+
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == document.gzip_etag != document.etag
+
+    @pytest.mark.parametrize("accept_encoding, expected", [
+        ("gzip", True),
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.5", True),
+        ("*", True),
+        ("GZIP ; Q=0.1", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0.0, *", False),
+        ("*;q=0", False),
+        ("br, identity", False),
+        ("gzip;q=bogus", False),
+        ("", False),
+    ])
+    def test_gzip_negotiation_honours_q_values(self, client: TestClient, accept_encoding, expected):
+        from backend.app.core.openapi import accepts_gzip
+
+        assert accepts_gzip(accept_encoding) is expected
+        response = client.get("/openapi.json", headers={"Accept-Encoding": accept_encoding})
+        assert response.status_code == 200
+        assert (response.headers.get("content-encoding") == "gzip") is expected
+
+    def test_openapi_etags_revalidate_either_variant(self, client: TestClient):
+        from backend.app.core.openapi import openapi_document
+        from backend.app.main import app
+
+        document = openapi_document.get(app)
+        for if_none_match in (document.etag, f"W/{document.gzip_etag}", f'"stale", {document.gzip_etag}'):
+            cached = client.get(
+                "/openapi.json", headers={"If-None-Match": if_none_match, "Accept-Encoding": "identity"}
+            )
+            assert cached.status_code == 304
+            assert cached.headers["etag"] == document.etag
+
+        assert client.get("/openapi.json", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    def test_docs_disabled_in_production_by_default(self):
+        from backend.app.core.config import Settings
+
+        assert Settings(environment="production").docs_available is False
+        assert Settings(environment="production", docs_enabled=True).docs_available is True
+        assert Settings(environment="development").docs_available is True
@@ -0,0 +1,312 @@
+"""
+Unit tests for JWT signing keys and token helpers.
+Runs without a database.
+"""
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.jwt_codec import (
+    ExpiredSignatureError,
+    HMACCodec,
+    JWTError,
+    PyJWTCodec,
+    get_codec,
+)
+from backend.app.core.keys import KeyRing
+from backend.app.core.login_throttle import LoginThrottle, client_ip
+from backend.app.core.exceptions import LoginThrottledException
+from backend.app.core.security import PasswordHashPolicy, create_access_token, decode_access_token
+from backend.app.core.exceptions import InvalidTokenException
+from backend.app.scripts.generate_jwt_key import generate_private_key
+from cryptography.hazmat.primitives import serialization
+
+
+def _write_key(directory, kid: str, algorithm: str = "RS256", mtime: float = None) -> None:
+    pem = generate_private_key(algorithm).private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    path = directory / f"{kid}.pem"
+    path.write_bytes(pem)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def _sign(ring: KeyRing, claims: dict) -> str:
+    key = ring.signing_key()
+    return get_codec(key.algorithm).encode(claims, key.signing_key, key.algorithm, {"kid": key.kid})
+
+
+@pytest.mark.unit
+class TestKeyRing:
+    """Test suite for asymmetric key loading and rotation."""
+
+    def test_symmetric_mode_has_empty_jwks(self):
+        ring = KeyRing(algorithm="HS256", secret_key="x" * 32)
+        body, etag = ring.jwks()
+        assert body == b'{"keys":[]}'
+        assert etag.startswith('"')
+
+    def test_asymmetric_requires_key_dir(self):
+        with pytest.raises(ValueError):
+            KeyRing(algorithm="RS256", secret_key="unused")
+
+    def test_newest_key_signs_and_old_key_still_verifies(self, tmp_path):
+        now = time.time()
+        _write_key(tmp_path, "old", mtime=now - 100)
+        ring = KeyRing(algorithm="RS256", secret_key="unused", keys_dir=str(tmp_path), reload_seconds=0)
+        old_token = _sign(ring, {"id": 1})
+
+        _write_key(tmp_path, "new", mtime=now)
+        assert ring.signing_key().kid == "new"
+
+        old_key = ring.verification_key("old")
+        assert get_codec("RS256").decode(old_token, old_key.verifying_key, ["RS256"])["id"] == 1
+        assert {k["kid"] for k in json.loads(ring.jwks()[0])["keys"]} == {"old", "new"}
+
+    def test_active_kid_pins_signer(self, tmp_path):
+        now = time.time()
+        _write_key(tmp_path, "pinned", "ES256", mtime=now - 100)
+        _write_key(tmp_path, "newer", "ES256", mtime=now)
+        ring = KeyRing(algorithm="ES256", secret_key="unused", keys_dir=str(tmp_path), active_kid="pinned")
+        assert ring.signing_key().kid == "pinned"
+
+    def test_eddsa_keys(self, tmp_path):
+        _write_key(tmp_path, "ed", "EdDSA")
+        ring = KeyRing(algorithm="EdDSA", secret_key="unused", keys_dir=str(tmp_path))
+        token = _sign(ring, {"id": 3})
+        key = ring.verification_key("ed")
+        assert get_codec("EdDSA").decode(token, key.verifying_key, ["EdDSA"])["id"] == 3
+        assert json.loads(ring.jwks()[0])["keys"][0]["kty"] == "OKP"
+
+    def test_unknown_kid_rejected(self, tmp_path):
+        _write_key(tmp_path, "only")
+        ring = KeyRing(algorithm="RS256", secret_key="unused", keys_dir=str(tmp_path))
+        with pytest.raises(InvalidTokenException):
+            ring.verification_key("missing")
+
+    def test_public_jwks_has_no_private_material(self, tmp_path):
+        _write_key(tmp_path, "k1")
+        ring = KeyRing(algorithm="RS256", secret_key="unused", keys_dir=str(tmp_path))
+        jwk = json.loads(ring.jwks()[0])["keys"][0]
+        assert jwk["kid"] == "k1"
+        assert jwk["use"] == "sig"
+        assert "d" not in jwk
+
+
+@pytest.mark.unit
+class TestHMACCodec:
+    """Test suite for the hand-rolled HS256 codec."""
+
+    KEY = b"k" * 32
+
+    def test_interoperates_with_pyjwt(self):
+        claims = {"id": 1, "role": "admin", "exp": int(time.time()) + 60}
+        token = HMACCodec().encode(claims, self.KEY, "HS256")
+        assert PyJWTCodec().decode(token, self.KEY, ["HS256"]) == claims
+
+        token = PyJWTCodec().encode(claims, self.KEY, "HS256")
+        assert HMACCodec().decode(token, self.KEY, ["HS256"]) == claims
+
+    def test_expired(self):
+        token = HMACCodec().encode({"id": 1, "exp": int(time.time()) - 1}, self.KEY, "HS256")
+        with pytest.raises(ExpiredSignatureError):
+            HMACCodec().decode(token, self.KEY, ["HS256"])
+
+    def test_wrong_key_and_alg_none(self):
+        codec = HMACCodec()
+        token = codec.encode({"id": 1}, self.KEY, "HS256")
+        with pytest.raises(JWTError):
+            codec.decode(token, b"other", ["HS256"])
+        with pytest.raises(JWTError):
+            codec.decode(token, self.KEY, ["HS512"])
+        with pytest.raises(JWTError):
+            codec.decode("not-a-token", self.KEY, ["HS256"])
+
+
+@pytest.mark.unit
+class TestTokenHelpers:
+    """Test suite for create/decode helpers in core.security."""
+
+    def test_round_trip(self):
+        token = create_access_token({"id": 7, "role": "user"})
+        payload = decode_access_token(token)
+        assert payload["id"] == 7
+        assert payload["role"] == "user"
+
+    def test_tampered_token_rejected(self):
+        token = create_access_token({"id": 7, "role": "user"})
+        with pytest.raises(InvalidTokenException):
+            decode_access_token(token[:-2] + ("AA" if token[-2:] != "AA" else "BB"))
+
+    def test_jwks_endpoint_cache_headers(self, client: TestClient):
+        response = client.get("/.well-known/jwks.json")
+        assert response.status_code == 200
+        assert "max-age" in response.headers["cache-control"]
+        assert "keys" in response.json()
+
+        cached = client.get("/.well-known/jwks.json", headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+
+
+@pytest.mark.unit
+class TestPasswordHashPolicy:
+    """Test suite for configurable hashing cost and rehash detection."""
+
+    def test_lower_cost_needs_rehash(self):
+        old = PasswordHashPolicy(bcrypt_rounds=4)
+        current = PasswordHashPolicy(bcrypt_rounds=5)
+        hashed = old.hash("Secret123!")
+        assert current.verify("Secret123!", hashed)
+        assert current.needs_rehash(hashed)
+        assert not current.needs_rehash(current.hash("Secret123!"))
+
+    def test_higher_cost_is_not_downgraded(self):
+        hashed = PasswordHashPolicy(bcrypt_rounds=5).hash("Secret123!")
+        assert not PasswordHashPolicy(bcrypt_rounds=4).needs_rehash(hashed)
+
+    def test_argon2id_migrates_bcrypt_hashes(self):
+        pytest.importorskip("argon2")
+        policy = PasswordHashPolicy(scheme="argon2id", argon2_time_cost=1, argon2_memory_cost=1024, argon2_parallelism=1)
+        bcrypt_hash = PasswordHashPolicy(bcrypt_rounds=4).hash("Secret123!")
+        assert policy.verify("Secret123!", bcrypt_hash)
+        assert policy.needs_rehash(bcrypt_hash)
+
+        argon_hash = policy.hash("Secret123!")
+        assert argon_hash.startswith("$argon2id$")
+        assert policy.verify("Secret123!", argon_hash)
+        assert not policy.verify("wrong", argon_hash)
+        assert not policy.needs_rehash(argon_hash)
+
+
+@pytest.mark.unit
+class TestLoginThrottle:
+    """Test suite for failed-login back-off and lockout."""
+
+    @staticmethod
+    def _throttle(**overrides) -> LoginThrottle:
+        options = dict(max_failures=3, max_failures_per_ip=5, lockout_seconds=60,
+                       backoff_free_attempts=1, backoff_base_seconds=30, backoff_max_seconds=60)
+        options.update(overrides)
+        return LoginThrottle(**options)
+
+    def test_backoff_grows_and_caps(self):
+        throttle = self._throttle(backoff_base_seconds=1, backoff_max_seconds=4)
+        assert [throttle.backoff_delay(n) for n in range(1, 6)] == [0, 1, 2, 4, 4]
+
+    async def test_backoff_then_lockout(self):
+        throttle = self._throttle(backoff_free_attempts=5)
+        for _ in range(3):
+            await throttle.check("user", "alice", "10.0.0.1")
+            await throttle.record_failure("user", "alice", "10.0.0.1")
+
+        with pytest.raises(LoginThrottledException) as exc_info:
+            await throttle.check("user", "ALICE", "10.0.0.2")
+        assert exc_info.value.retry_after > 0
+        # Other usernames are unaffected
+        await throttle.check("user", "bob", "10.0.0.1")
+
+    async def test_backoff_rejects_fast_retry(self):
+        throttle = self._throttle()
+        await throttle.record_failure("user", "alice", None)
+        await throttle.check("user", "alice", None)
+        await throttle.record_failure("user", "alice", None)
+        with pytest.raises(LoginThrottledException):
+            await throttle.check("user", "alice", None)
+
+    async def test_success_resets_username(self):
+        throttle = self._throttle()
+        await throttle.record_failure("admin", "root", "10.0.0.1")
+        await throttle.record_failure("admin", "root", "10.0.0.1")
+        await throttle.record_success("admin", "root")
+        await throttle.check("admin", "root", "10.0.0.1")
+
+    async def test_ip_lockout_across_usernames(self):
+        throttle = self._throttle()
+        for n in range(5):
+            await throttle.record_failure("user", f"user{n}", "10.0.0.9")
+        with pytest.raises(LoginThrottledException):
+            await throttle.check("user", "fresh", "10.0.0.9")
+
+    async def test_storage_writes_are_independent(self):
+        """Back-off expiries are whole seconds, and a failed write does not skip the IP count."""
+        throttle = self._throttle(backoff_base_seconds=0.5)
+        memory = throttle.storage
+        expiries = []
+
+        class RedisLikeStorage:
+            """Rejects fractional expiries the way Redis EXPIRE does, and fails back-off keys on demand."""
+            fail_backoff = False
+
+            async def incr(self, key, expiry):
+                if not isinstance(expiry, int) or (self.fail_backoff and ":backoff:" in key):
+                    raise ValueError("value is not an integer or out of range")
+                expiries.append(expiry)
+                return await memory.incr(key, expiry)
+
+            def __getattr__(self, name):
+                return getattr(memory, name)
+
+        throttle._storage = RedisLikeStorage()
+        await throttle.record_failure("user", "alice", "10.0.0.1")
+        await throttle.record_failure("user", "alice", "10.0.0.1")
+        assert expiries == [60, 60, 60, 1, 60]  # 0.5s back-off rounded up
+
+        throttle._storage.fail_backoff = True
+        for _ in range(3):
+            await throttle.record_failure("user", "alice", "10.0.0.1")
+        with pytest.raises(LoginThrottledException):
+            await throttle.check("user", "fresh", "10.0.0.1")
+
+    @staticmethod
+    async def _proxied_client_ip(peer: str, headers: list) -> str:
+        """client_ip() for a request from `peer`, after uvicorn's proxy-headers handling with nginx trusted."""
+        from starlette.requests import Request
+        from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(client_ip(Request(scope)))
+
+        scope = {"type": "http", "headers": headers, "client": (peer, 40000)}
+        await ProxyHeadersMiddleware(app, trusted_hosts="172.28.0.10")(scope, None, None)
+        return seen[0]
+
+    async def test_spoofed_forwarded_for_keeps_ip_key(self):
+        """A client-chosen X-Forwarded-For prefix must not reset its IP failure count."""
+        def headers(spoofed: str) -> list:
+            return [
+                (b"x-forwarded-for", f"{spoofed}, 203.0.113.7".encode()),
+                (b"x-real-ip", b"203.0.113.7"),
+            ]
+
+        throttle = self._throttle()
+        for n in range(5):
+            ip = await self._proxied_client_ip("172.28.0.10", headers(f"198.51.100.{n}"))
+            assert ip == "203.0.113.7"
+            await throttle.record_failure("user", f"user{n}", ip)
+        with pytest.raises(LoginThrottledException):
+            await throttle.check("user", "fresh", await self._proxied_client_ip("172.28.0.10", headers("198.51.100.99")))
+
+    async def test_untrusted_peer_cannot_spoof_real_ip(self):
+        """A peer other than nginx cannot pick its IP key with X-Real-IP or X-Forwarded-For."""
+        from starlette.requests import Request
+        from backend.app.middleware.rate_limit import get_identifier
+
+        throttle = self._throttle()
+        for n in range(5):
+            spoofed = [(b"x-real-ip", f"198.51.100.{n}".encode()), (b"x-forwarded-for", f"192.0.2.{n}".encode())]
+            ip = await self._proxied_client_ip("203.0.113.9", spoofed)
+            assert ip == "203.0.113.9"
+            await throttle.record_failure("user", f"user{n}", ip)
+        with pytest.raises(LoginThrottledException):
+            await throttle.check("user", "fresh", "203.0.113.9")
+
+        request = Request({"type": "http", "headers": [(b"x-real-ip", b"198.51.100.1")], "client": ("203.0.113.9", 1)})
+        assert get_identifier(request) == "203.0.113.9"
@@ -0,0 +1,185 @@
+"""
+Unit tests for worker boot cost and lifecycle.
+Imports the app in a fresh interpreter with `-X importtime` and checks what
+gets loaded and how long it takes; checks pool prewarming and the graceful shutdown timeout.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[4]
+
+# Cold import of backend.app.main is ~1s on a laptop; leave headroom for CI
+STARTUP_IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "3.0"))
+
+# Only needed once an email is actually sent or a debug route is mounted
+LAZY_MODULES = {
+    "jinja2",
+    "smtplib",
+    "aiosmtplib",
+    "backend.app.api.endpoints.test_email",
+    "backend.app.routers.debug",
+}
+
+
+def _import_profile(environment: str) -> dict:
+    """Return {module: cumulative_microseconds} for importing the app."""
+    env = {**os.environ, "ENVIRONMENT": environment, "ENABLE_CONSOLE_LOGS": "false"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.app.main"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.mark.unit
+class TestStartupImports:
+    """Test suite for import-time startup cost."""
+
+    def test_production_boot_skips_lazy_modules(self):
+        """Test that email/template machinery and debug routes are not imported in production."""
+        profile = _import_profile("production")
+        assert "backend.app.main" in profile
+        assert not LAZY_MODULES & profile.keys()
+
+    def test_debug_routes_mounted_outside_production(self):
+        """Test that debug routes are still available in development."""
+        profile = _import_profile("development")
+        assert "backend.app.routers.debug" in profile
+
+    def test_import_within_budget(self):
+        """Test that importing the app stays within the startup-time budget."""
+        profile = _import_profile("production")
+        seconds = profile["backend.app.main"] / 1e6
+        slowest = sorted(
+            ((us, name) for name, us in profile.items() if name.count(".") == 0 or name.startswith("backend.")),
+            reverse=True,
+        )[:10]
+        assert seconds < STARTUP_IMPORT_BUDGET_SECONDS, (
+            f"Importing backend.app.main took {seconds:.2f}s "
+            f"(budget {STARTUP_IMPORT_BUDGET_SECONDS:.1f}s). Slowest: "
+            + ", ".join(f"{name} {us / 1e3:.0f}ms" for us, name in slowest)
+        )
+
+
+@pytest.mark.unit
+class TestLifecycle:
+    """Test suite for pool prewarming at startup and graceful shutdown."""
+
+    async def test_prewarm_opens_pool_size_connections(self, tmp_path):
+        """Test that prewarming leaves pool_size distinct, primed connections idle in the pool."""
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+        from sqlmodel import SQLModel
+        from backend.app.db.session import prewarm_engine
+
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}", poolclass=AsyncAdaptedQueuePool, pool_size=3
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        await engine.dispose()
+
+        assert await prewarm_engine(engine) == 3
+        assert engine.pool.checkedin() == 3
+        assert engine.pool.checkedout() == 0
+        await engine.dispose()
+
+    def test_graceful_shutdown_fits_worker_stop(self):
+        """Test that uvicorn's wait for in-flight requests leaves gunicorn time for lifespan shutdown."""
+        from backend.app.server import Worker, gunicorn_options, settings
+
+        wait = Worker.CONFIG_KWARGS["timeout_graceful_shutdown"]
+        assert wait >= settings.shutdown_drain_seconds
+        assert gunicorn_options(1)["graceful_timeout"] > wait
+
+
+@pytest.mark.unit
+class TestServerLauncher:
+    """Test suite for the production launcher's worker sizing and multiprocess metrics."""
+
+    def test_cgroup_v2_quota(self, tmp_path):
+        """Test that cpu.max sets the quota, capped by the CPUs available."""
+        from backend.app.server import cpu_quota
+
+        (tmp_path / "cpu.max").write_text("150000 100000\n")
+        assert cpu_quota(tmp_path) == min(1.5, len(os.sched_getaffinity(0)))
+
+        (tmp_path / "cpu.max").write_text("max 100000\n")
+        assert cpu_quota(tmp_path) == len(os.sched_getaffinity(0))
+
+    def test_cgroup_v1_quota(self, tmp_path):
+        """Test that the v1 CFS quota is used when there is no cpu.max, and -1 means unlimited."""
+        from backend.app.server import cpu_quota
+
+        controller = tmp_path / "cpu,cpuacct"
+        controller.mkdir()
+        (controller / "cpu.cfs_period_us").write_text("100000")
+        (controller / "cpu.cfs_quota_us").write_text("100000")
+        assert cpu_quota(tmp_path) == 1.0
+
+        (controller / "cpu.cfs_quota_us").write_text("-1")
+        assert cpu_quota(tmp_path) == len(os.sched_getaffinity(0))
+
+    def test_worker_count(self):
+        """Test that WEB_CONCURRENCY wins and a fractional quota rounds up."""
+        from backend.app.server import worker_count
+
+        assert worker_count(configured=3, quota=8) == 3
+        assert worker_count(quota=1.5) == 2
+        assert worker_count(quota=0.25) == 1
+
+    def test_in_memory_limits_keep_one_worker(self, monkeypatch):
+        """Test that per-process limiter storage means one worker unless WEB_CONCURRENCY says otherwise."""
+        from backend.app.server import memory_limiters, settings, worker_count
+
+        monkeypatch.setattr(settings, "rate_limit_storage_uri", "redis://redis:6379/2")
+        monkeypatch.setattr(settings, "login_throttle_storage_uri", "memory://")
+        assert memory_limiters() == ["login throttle"]
+        assert worker_count(quota=8, per_worker_limits=True) == 1
+        assert worker_count(configured=4, quota=8, per_worker_limits=True) == 4
+
+        monkeypatch.setattr(settings, "login_throttle_storage_uri", "redis://redis:6379/1")
+        assert memory_limiters() == []
+
+    def test_forwarded_headers_trusted_from_proxy_only(self):
+        """Test that gunicorn trusts X-Forwarded-* from the configured proxy, not everyone."""
+        from backend.app.server import gunicorn_options, settings
+
+        assert gunicorn_options(2)["forwarded_allow_ips"] == settings.forwarded_allow_ips
+        assert settings.forwarded_allow_ips != "*"
+
+    def test_multiprocess_metrics_merge_workers(self, tmp_path):
+        """Test that /metrics serves samples from the multiprocess dir, plus app info."""
+        code = (
+            "from prometheus_client import generate_latest\n"
+            "from backend.app.routers import metrics\n"
+            "metrics.http_requests_total.labels('GET', '/x', '200').inc()\n"
+            "print(generate_latest(metrics.SCRAPE_REGISTRY).decode())\n"
+        )
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "ENABLE_CONSOLE_LOGS": "false"}
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=60
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        assert 'http_requests_total{endpoint="/x",method="GET",status="200"} 1.0' in result.stdout
+        assert "adl_application_info" in result.stdout
+        assert list(tmp_path.glob("counter_*.db"))
@@ -0,0 +1,57 @@
+"""user search indexes
+
+Trigram (pg_trgm GIN) and prefix (text_pattern_ops) indexes on the lowered
+username, email and full_name columns, used by /api/admins/users/search.
+
+Indexes are built CONCURRENTLY so a large users table stays writable while
+the migration runs. Non-PostgreSQL databases are left untouched.
+
+Revision ID: 002_user_search_indexes
+Revises: 001_initial_schema
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_user_search_indexes'
+down_revision: Union[str, None] = '001_initial_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = {
+    'ix_users_username_trgm': 'lower(username) gin_trgm_ops',
+    'ix_users_email_trgm': 'lower(email) gin_trgm_ops',
+    'ix_users_full_name_trgm': "lower(coalesce(full_name, '')) gin_trgm_ops",
+}
+PREFIX_INDEXES = {
+    'ix_users_username_prefix': 'lower(username) text_pattern_ops',
+    'ix_users_email_prefix': 'lower(email) text_pattern_ops',
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, expression in TRIGRAM_INDEXES.items():
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON users USING gin ({expression})')
+        for name, expression in PREFIX_INDEXES.items():
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON users ({expression})')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for name in [*PREFIX_INDEXES, *TRIGRAM_INDEXES]:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+    # pg_trgm is left installed; other objects may depend on it
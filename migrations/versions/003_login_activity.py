@@ -0,0 +1,59 @@
+"""login activity
+
+last_login_at and login_count on users and admins, written in batches by
+backend/app/core/login_activity.py.
+
+On PostgreSQL 11+ adding a column with a constant default only changes the
+catalog, so the tables are not rewritten.
+
+Revision ID: 003_login_activity
+Revises: 002_user_search_indexes
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_login_activity'
+down_revision: Union[str, None] = '002_user_search_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('users', 'admins')
+COLUMNS = ('last_login_at', 'login_count')
+
+
+def _existing_columns() -> dict:
+    """{table: column names} for the tables that exist.
+
+    `admins` is created by SQLModel.metadata.create_all (scripts/init_db.py,
+    scripts/create_admin.py) rather than by 001, so it may be missing, or
+    already have the columns if it was created from the current models.
+    """
+    inspector = sa.inspect(op.get_bind())
+    return {
+        table: {column['name'] for column in inspector.get_columns(table)}
+        for table in TABLES
+        if inspector.has_table(table)
+    }
+
+
+def upgrade() -> None:
+    for table, columns in _existing_columns().items():
+        if 'last_login_at' not in columns:
+            op.add_column(table, sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True))
+        if 'login_count' not in columns:
+            op.add_column(table, sa.Column('login_count', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    for table, columns in _existing_columns().items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in COLUMNS:
+                if column in columns:
+                    batch_op.drop_column(column)
@@ -0,0 +1,5 @@
+#!/bin/sh
+# Let the replica stream WAL from the primary (docker-compose.replica.yml).
+# Runs once, when the primary's data volume is first initialised.
+set -e
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"